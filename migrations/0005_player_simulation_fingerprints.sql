@@ -0,0 +1,2 @@
+ALTER TABLE player_simulations ADD COLUMN IF NOT EXISTS input_hash TEXT;
+ALTER TABLE player_simulations ADD COLUMN IF NOT EXISTS distribution JSONB;
@@ -0,0 +1,57 @@
+"""Spawn the Node app server for benchmark runs.
+
+Benchmarks that swap upstream services for local stand-ins need the app to
+start with matching environment variables, so the harness launches it itself
+rather than relying on an already-running ``npm run dev``.
+"""
+
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def wait_for_health(base_url, timeout=90.0, process=None):
+    deadline = time.time() + timeout
+    health_url = f"{base_url.rstrip('/')}/api/health"
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"App server exited with code {process.returncode} before becoming healthy")
+        try:
+            if requests.get(health_url, timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"App server at {base_url} not healthy after {timeout:.0f}s")
+
+
+@contextmanager
+def app_server(port=5000, env=None, log_path=None, startup_timeout=90.0):
+    """Run ``tsx server/index.ts`` with ``env`` overrides; yields the server root URL."""
+    child_env = {**os.environ, "NODE_ENV": "development", "PORT": str(port), **(env or {})}
+    log_file = open(log_path, "w", encoding="utf-8") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        ["npx", "tsx", "server/index.ts"],
+        cwd=REPO_ROOT,
+        env=child_env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_health(base_url, startup_timeout, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        if log_path:
+            log_file.close()
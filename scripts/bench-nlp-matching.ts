@@ -0,0 +1,191 @@
+#!/usr/bin/env tsx
+/**
+ * Queries per second of NaturalLanguageProcessor's matching steps against the
+ * per-query scans they replaced:
+ *  - intent keywords: the compiled IntentMatcher against each keyword regex
+ *    once (which understates the old cost, since the rules ran several of them
+ *    two or three times);
+ *  - player names: NameIndex against the linear dictionary walk (two regexes
+ *    per name plus a Levenshtein matrix per multi-word name part), over a
+ *    synthetic dictionary the size of the FPL one.
+ *
+ * Usage: tsx scripts/bench-nlp-matching.ts [queries.txt]   (one query per line)
+ */
+import process from "node:process";
+import { readFileSync } from "node:fs";
+import { performance } from "node:perf_hooks";
+import { IntentMatcher } from "../server/services/intentMatcher";
+import { NameIndex } from "../server/services/nameIndex";
+
+const SAMPLE_QUERIES = [
+  "Analyze my squad with emphasis on bench depth ahead of Gameweek 9.",
+  "Help me sell Watkins and buy Isak for chasing Newcastle's fixtures.",
+  "Should I play my Bench Boost in GW 12 or save it for the double?",
+  "When is the best time to use my triple captain chip?",
+  "Compare Salah vs Palmer for the next three gameweeks.",
+  "What should I do with Trent? He keeps blanking.",
+  "Is Haaland worth keeping in my team at his price?",
+  "Which defenders under 5.0 have the best upcoming fixtures?",
+  "I have a budget of 8.5 for a midfielder, who should I bring in?",
+  "Thoughts on Saka for captaincy this week?",
+  "What's the FDR looking like for Arsenal from gameweek 20?",
+  "Is it worth a hit to replace my injured forward?",
+  "Give me a differential punt with low ownership and good xG.",
+  "How do you feel about Mbeumo in my squad?",
+  "Wildcard now or wait until after the international break?",
+  "Who are the nailed-on budget goalkeepers?"
+];
+
+// The per-query work the rules did before IntentMatcher: every keyword regex plus a substring test per term
+const KEYWORD_REGEXES = [
+  /(\bvs\b|\bversus\b|\bcompare\b|\bpick\b|\bchoose\b|\bbetween\b)/i,
+  /(?:transfer|buy|sell|bring\s+in|bring\s+out|replace|swap|change|worth\s+a?\s+hit)\b/i,
+  /(fixtures?|fdr|difficulty|upcoming|schedule|gameweek|gw(?:\s+\d+)?)\b/i,
+  /(?:analyze|analysis|review|check|evaluate)\s*(?:my|squad|team)\b/i,
+  /(?:squad|team)\s*(?:analyze|analysis|review|check|evaluate)\b/i,
+  /(?:what|how)\s+(?:do\s+you\s+)?(?:think|feel)\s+about\s+.+?\s+in\s+my\s+(team|squad)/i,
+  /(?:is|should)\s+.+?\s+(?:good|worth|worthwhile|worth\s+keeping)\s+(?:in|for)\s+my\s+(team|squad)/i,
+  /(?:my\s+team|my\s+squad).*\w+/i,
+  /(?:what|should|do|about|worth|advice|opinion|thoughts?|recommendation)\b/i,
+  /(?:keeping|holding|selling|starting|benching|captaining|transferring|dropping)\b/i,
+  /(?:what\s+(?:should\s+)?(?:i|do)\s+(?:do\s+)?(?:with|about))\b/i,
+  /(?:should\s+i\s+(?:keep|sell|start|bench|captain|transfer|drop))\b/i,
+  /(?:is\s+.+?\s+worth\s+(?:keeping|holding|starting))\b/i,
+  /(?:advice\s+(?:on|about|for))\b/i,
+  /(?:thoughts?\s+(?:on|about))\b/i,
+  /(?:blanking|performing|disappointing|underperforming)\b/i,
+  /(?:wildcard|bench boost|triple captain|free hit|chip)\b/i
+];
+const ENTITY_REGEXES = [
+  /(?:wildcard|bench boost|triple captain|free hit|wc|bb|tc|fh|chip)/gi,
+  /(?:goalkeeper|defender|midfielder|forward|gk|def|mid|fwd)/gi,
+  /(?:£|budget|money|cost)\s*(\d+(?:\.\d+)?)/gi,
+  /(?:gameweek|gw)\s*(\d+)/gi
+];
+const TERMS = ['fpl', 'gw', 'fdr', 'wc', 'bb', 'tc', 'fh', 'xg', 'xa', 'bps', 'ownership', 'captaincy',
+  'differential', 'template', 'haul', 'blank', 'rotation', 'nailed', 'punt', 'fodder'];
+const PATTERN_KEYWORDS = [
+  ['analyze', 'squad', 'team', 'analysis', 'review', 'check', 'evaluate'],
+  ['chip', 'wildcard', 'bench boost', 'triple captain', 'free hit', 'when', 'use'],
+  ['transfer', 'buy', 'sell', 'in', 'out', 'replace', 'swap', 'change'],
+  ['compare', 'vs', 'versus', 'better', 'choose', 'pick', 'between'],
+  ['fixture', 'gameweek', 'difficulty', 'upcoming', 'schedule', 'gw'],
+  ['help', 'advice', 'suggest', 'recommend', 'what', 'how', 'should']
+].map(keywords => ({ keywords }));
+
+function regexScan(query: string): number {
+  let found = 0;
+  for (const regex of KEYWORD_REGEXES) if (regex.test(query)) found++;
+  for (const regex of ENTITY_REGEXES) found += query.match(regex)?.length ?? 0;
+  for (const term of TERMS) if (query.includes(term)) found++;
+  return found;
+}
+
+// ~700 players with the four name variants loadDictionaries stores (web, first, second and full name)
+function syntheticDictionary(): Map<string, { web_name: string }> {
+  const syllables = ['sa', 'lah', 'pal', 'mer', 'son', 'ha', 'land', 'ka', 'is', 'ak', 'wat', 'kins', 'bru', 'no', 'ro', 'dri', 'go', 'mez'];
+  let seed = 20240914;
+  const next = () => (seed = (seed * 1103515245 + 12345) % 2147483648) / 2147483648;
+  const name = () => Array.from({ length: 2 + Math.floor(next() * 2) }, () => syllables[Math.floor(next() * syllables.length)]).join('');
+  const dictionary = new Map<string, { web_name: string }>();
+  for (let i = 0; i < 700; i++) {
+    const first = name();
+    const second = name();
+    const player = { web_name: second };
+    for (const variant of [second, first, second, `${first} ${second}`]) {
+      if (variant.length > 1) dictionary.set(variant, player);
+    }
+  }
+  return dictionary;
+}
+
+function editDistance(a: string, b: string): number {
+  const rows: number[][] = Array.from({ length: a.length + 1 }, (_, i) => [i]);
+  for (let j = 0; j <= b.length; j++) rows[0][j] = j;
+  for (let i = 1; i <= a.length; i++) {
+    for (let j = 1; j <= b.length; j++) {
+      rows[i][j] = Math.min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1));
+    }
+  }
+  return rows[a.length][b.length];
+}
+
+// The dictionary walk extractEntities did for every query
+function linearLookup(dictionary: Map<string, { web_name: string }>, query: string, words: string[]): string[] {
+  const escape = (text: string) => text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  const stripped = query.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+  const players: string[] = [];
+  dictionary.forEach((player, name) => {
+    const parts = name.split(' ');
+    if (new RegExp(`\\b${escape(name)}\\b`, 'i').test(query) ||
+        new RegExp(`\\b${escape(name.normalize('NFD').replace(/[\u0300-\u036f]/g, ''))}\\b`, 'i').test(stripped)) {
+      players.push(player.web_name);
+    } else if (parts.length > 1) {
+      const near = parts.filter(part => part.length >= 4 && words.some(word =>
+        word.length >= 4 && Math.abs(word.length - part.length) <= 1 && editDistance(word, part) <= 1));
+      if (near.length >= 2) players.push(player.web_name);
+    }
+  });
+  return players;
+}
+
+// Same normalization as NaturalLanguageProcessor.normalizeQuery
+function normalize(query: string): string {
+  return query.toLowerCase().replace(/[^\w\s]/g, ' ').replace(/\s+/g, ' ').trim();
+}
+
+// Best of a few repeats, after one warm-up so the JIT has compiled both paths
+function queriesPerSecond(queries: string[], run: (query: string) => unknown, rounds: number, repeats = 5): number {
+  const pass = () => {
+    for (let round = 0; round < rounds; round++) {
+      for (const query of queries) run(query);
+    }
+  };
+  pass();
+  let best = Infinity;
+  for (let i = 0; i < repeats; i++) {
+    const started = performance.now();
+    pass();
+    best = Math.min(best, (performance.now() - started) / 1000);
+  }
+  return (queries.length * rounds) / best;
+}
+
+function main() {
+  const file = process.argv[2];
+  const queries = (file ? readFileSync(file, 'utf-8').split('\n').filter(line => line.trim()) : SAMPLE_QUERIES).map(normalize);
+  const rounds = Math.max(1, Math.ceil(20_000 / queries.length));
+
+  const compileStarted = performance.now();
+  const matcher = new IntentMatcher(PATTERN_KEYWORDS, TERMS);
+  const compileMs = performance.now() - compileStarted;
+
+  const regex = queriesPerSecond(queries, regexScan, rounds);
+  const compiled = queriesPerSecond(queries, query => matcher.match(query), rounds);
+
+  console.log(`${queries.length} queries x ${rounds} rounds; ${matcher.phraseCount} phrases compiled in ${compileMs.toFixed(1)} ms`);
+  console.log(`regex scan        ${Math.round(regex).toLocaleString()} queries/s`);
+  console.log(`IntentMatcher     ${Math.round(compiled).toLocaleString()} queries/s (${(compiled / regex).toFixed(2)}x)`);
+
+  const dictionary = syntheticDictionary();
+  const indexStarted = performance.now();
+  const index = new NameIndex(dictionary, { accentInsensitive: true, fuzzyParts: true });
+  const indexMs = performance.now() - indexStarted;
+  // Sample queries with a few dictionary names dropped in, one of them misspelt
+  const names = Array.from(dictionary.keys());
+  const lookups = queries.map((query, i) => {
+    const full = names[(i * 7919) % names.length];
+    return `${query} ${names[(i * 104729) % names.length]} ${full.replace(/[aeiou](?=[^aeiou]*$)/, '')}`;
+  });
+  const words = new Map(lookups.map(query => [query, query.split(' ').filter(word => word.length >= 3)]));
+  const lookupRounds = Math.max(1, Math.ceil(200 / lookups.length));
+
+  const linear = queriesPerSecond(lookups, query => linearLookup(dictionary, query, words.get(query)!), lookupRounds, 3);
+  const indexed = queriesPerSecond(lookups, query => index.match(query, words.get(query)), lookupRounds * 20);
+
+  console.log(`\n${dictionary.size} dictionary names; NameIndex built in ${indexMs.toFixed(1)} ms`);
+  console.log(`linear lookup     ${Math.round(linear).toLocaleString()} queries/s`);
+  console.log(`NameIndex         ${Math.round(indexed).toLocaleString()} queries/s (${(indexed / linear).toFixed(1)}x)`);
+}
+
+main();
@@ -0,0 +1,79 @@
+#!/usr/bin/env tsx
+/**
+ * Time the Node simulation kernels on one reference case and print the
+ * inputs they derived plus their samples as JSON, for
+ * scripts/simulation_parity.py to compare against the NumPy port.
+ *
+ * Usage: tsx scripts/bench-simulation-kernels.ts < case.json
+ */
+import process from "node:process";
+import { readFileSync } from "node:fs";
+import { performance } from "node:perf_hooks";
+import type { MatchOdds, PlayerAdvanced, ProcessedPlayer } from "@shared/schema";
+import { MonteCarloEngine } from "../server/services/monteCarloEngine";
+import { SeededRandom } from "../server/services/seededRandom";
+import { SimulationEngine, type GameweekFixture, type SimulationConfig } from "../server/services/simulationEngine";
+import { matchDistribution, simulateGameweekMatrix, simulateMatches, type MatchSetup } from "../server/services/simulationKernels";
+
+interface BenchCase {
+  runs: number;
+  seed: number;
+  player: ProcessedPlayer;
+  stats?: PlayerAdvanced;
+  odds?: MatchOdds[];
+  fixtures: GameweekFixture[];
+  useOdds: boolean;
+  useAdvancedStats: boolean;
+}
+
+// Best of a few repeats, after one warm-up so the JIT has compiled the kernel
+function time<T>(run: () => T, repeats = 3): { value: T; seconds: number } {
+  let value = run();
+  let best = Infinity;
+  for (let i = 0; i < repeats; i++) {
+    const started = performance.now();
+    value = run();
+    best = Math.min(best, (performance.now() - started) / 1000);
+  }
+  return { value, seconds: best };
+}
+
+function main() {
+  const input: BenchCase = JSON.parse(readFileSync(0, 'utf-8'));
+  const { runs, seed, player } = input;
+
+  // The model builders are private; the bench reads them directly so both sides start from the same plan
+  const setup: MatchSetup = (MonteCarloEngine.getInstance() as any).setupPlayerSimulation(player, null, input.stats, input.odds);
+  const config: SimulationConfig = {
+    runs,
+    gameweeksToSimulate: Array.from(new Set(input.fixtures.map(fixture => fixture.gameweek))),
+    strategy: 'parity benchmark',
+    useOdds: input.useOdds,
+    useAdvancedStats: input.useAdvancedStats,
+    seed
+  };
+  const plan = (SimulationEngine.getInstance() as any).buildPlayerPlan(player, input.fixtures, config);
+
+  const matches = time(() => simulateMatches(setup, runs, new SeededRandom(seed)));
+  const exact = time(() => matchDistribution(setup));
+  const gameweeks = time(() => simulateGameweekMatrix(plan.expected, plan.volatility, plan.columnStart, runs, new SeededRandom(seed)));
+
+  process.stdout.write(JSON.stringify({
+    matchSetup: { minutesProbability: setup.minutesProbability, events: setup.events },
+    matches: { runs, seconds: matches.seconds, runsPerSec: runs / matches.seconds, samples: Array.from(matches.value) },
+    exact: {
+      seconds: exact.seconds,
+      points: Array.from(exact.value.points),
+      probabilities: Array.from(exact.value.probabilities)
+    },
+    gameweekPlan: {
+      gameweeks: plan.gameweeks,
+      columnStart: Array.from(plan.columnStart),
+      expected: Array.from(plan.expected),
+      volatility: Array.from(plan.volatility)
+    },
+    gameweeks: { runs, seconds: gameweeks.seconds, runsPerSec: runs / gameweeks.seconds, totals: Array.from(gameweeks.value.totals) }
+  }));
+}
+
+main();
@@ -0,0 +1,165 @@
+"""Client for the streaming chat endpoint (``POST /api/chat/stream``).
+
+The server answers with server-sent events: ``meta`` as soon as the request is
+accepted, ``token`` for each chunk of LLM output, then ``done`` carrying the
+same payload ``/api/chat`` returns (or ``error``). Besides total latency the
+client records time to first byte and time to first token, the numbers users
+actually perceive.
+
+Usage: ``python scripts/chat_stream.py "Should I wildcard this week?" --team-id 7892155``
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from http_session import PooledSession
+
+STREAM_URL = "http://localhost:5000/api/chat/stream"
+
+
+class SSEParser:
+    """Incremental server-sent events parser; feed it lines, it returns ``(event, data)`` when one completes."""
+
+    def __init__(self):
+        self._event = None
+        self._data = []
+
+    def feed(self, line):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r\n")
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            self._event = value
+        elif field == "data":
+            self._data.append(value)
+        return None
+
+    def flush(self):
+        if not self._data:
+            self._event = None
+            return None
+        event, data = self._event or "message", "\n".join(self._data)
+        self._event, self._data = None, []
+        try:
+            return event, json.loads(data)
+        except json.JSONDecodeError:
+            return event, data
+
+
+class StreamTimings:
+    """Turns the SSE events of one request into harness record fields, timed from ``started``."""
+
+    def __init__(self, started):
+        self.started = started
+        self.first_byte = None
+        self.first_token = None
+        self.tokens = 0
+        self.text = []
+        self.response_json = None
+
+    def elapsed_ms(self, instant):
+        return round((instant - self.started) * 1000, 1)
+
+    def on_bytes(self):
+        if self.first_byte is None:
+            self.first_byte = time.perf_counter()
+
+    def on_event(self, event, data):
+        if event == "token":
+            if self.first_token is None:
+                self.first_token = time.perf_counter()
+            self.tokens += 1
+            self.text.append(data.get("text", "") if isinstance(data, dict) else str(data))
+        elif event == "done":
+            self.response_json = {"success": True, "data": data}
+        elif event == "error":
+            self.response_json = {"success": False, "error": data.get("error") if isinstance(data, dict) else data}
+
+    def fields(self):
+        return {
+            "ttfb_ms": self.elapsed_ms(self.first_byte) if self.first_byte is not None else None,
+            "ttft_ms": self.elapsed_ms(self.first_token) if self.first_token is not None else None,
+            "streamed_tokens": self.tokens,
+        }
+
+
+def post_chat_stream(session, url, payload, timeout=30.0, on_token=None, started=None):
+    """POST ``payload`` and consume the event stream.
+
+    Returns ``(status_code, response_json, fields)``: ``response_json`` is shaped
+    like an ``/api/chat`` reply (``None`` if the stream ended without ``done`` or
+    ``error``) and ``fields`` holds ``latency_ms``, ``ttfb_ms``, ``ttft_ms`` and
+    ``streamed_tokens``.
+    """
+    started = time.perf_counter() if started is None else started
+    timings = StreamTimings(started)
+    parser = SSEParser()
+    with session.post(url, json=payload, timeout=timeout, stream=True) as response:
+        if response.status_code >= 400 or not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            return response.status_code, body, {"latency_ms": timings.elapsed_ms(time.perf_counter()), **timings.fields()}
+        # chunk_size=None yields each chunk as it arrives rather than waiting to fill a buffer
+        for line in response.iter_lines(chunk_size=None):
+            timings.on_bytes()
+            event = parser.feed(line)
+            if event is None:
+                continue
+            timings.on_event(*event)
+            if event[0] == "token" and on_token is not None:
+                on_token(timings.text[-1])
+        event = parser.flush()
+        if event is not None:
+            timings.on_event(*event)
+        status = response.status_code
+    return status, timings.response_json, {"latency_ms": timings.elapsed_ms(time.perf_counter()), **timings.fields()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ask the co-pilot one question over the streaming endpoint.")
+    parser.add_argument("message")
+    parser.add_argument("--url", default=STREAM_URL)
+    parser.add_argument("--team-id", default=None)
+    parser.add_argument("--session-id", default=None)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    payload = {"message": args.message}
+    if args.team_id:
+        payload["teamId"] = args.team_id
+    if args.session_id:
+        payload["sessionId"] = args.session_id
+
+    session = PooledSession(pool_size=1)
+    try:
+        status, body, fields = post_chat_stream(
+            session, args.url, payload, args.timeout, on_token=lambda text: print(text, end="", flush=True)
+        )
+    finally:
+        session.close()
+
+    print()
+    if not isinstance(body, dict) or not body.get("success"):
+        print(f"Request failed ({status}): {body}", file=sys.stderr)
+        return 1
+    if not fields["streamed_tokens"]:
+        print(body["data"].get("message", ""))
+    print(
+        f"\nttfb {fields['ttfb_ms']} ms, first token {fields['ttft_ms']} ms, "
+        f"total {fields['latency_ms']} ms, {fields['streamed_tokens']} token events"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
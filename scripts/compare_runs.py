@@ -0,0 +1,176 @@
+"""Compare two benchmark runs and gate on p95 latency regressions.
+
+Usage::
+
+    python scripts/compare_runs.py BASELINE CANDIDATE [--threshold 0.10] [--alpha 0.05]
+
+``BASELINE`` and ``CANDIDATE`` are ``run_<ts>.jsonl`` files, their
+``_summary.json`` companions or legacy ``run_<ts>.json`` files, so a stored
+baseline is just a run kept somewhere stable. Latencies are compared overall,
+per endpoint, per category and, for streamed runs, by time to first token. A
+group regresses when its p95 grows by more than ``--threshold`` *and* a
+one-sided Mann-Whitney U test says the candidate is slower at ``--alpha``; any
+regression makes the script exit with status 1.
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+from latency_report import load_records
+
+
+def resolve_records_path(path):
+    """Map a ``_summary.json`` file onto the JSONL it summarises."""
+    path = Path(path)
+    if path.name.endswith("_summary.json"):
+        records = json.loads(path.read_text(encoding="utf-8")).get("records_path")
+        if records:
+            return path.with_name(records)
+    return path
+
+
+def grouped_latencies(path):
+    groups = {("overall", "all"): []}
+    for record in load_records(resolve_records_path(path)):
+        latency = record.get("latency_ms")
+        if latency is None:
+            continue
+        groups[("overall", "all")].append(latency)
+        groups.setdefault(("endpoint", record.get("endpoint") or "chat"), []).append(latency)
+        groups.setdefault(("category", record.get("category") or "uncategorised"), []).append(latency)
+        if record.get("ttft_ms") is not None:
+            groups.setdefault(("first-token", record.get("endpoint") or "chat"), []).append(record["ttft_ms"])
+    return groups
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def mann_whitney_greater(baseline, candidate):
+    """One-sided p-value that ``candidate`` is stochastically larger (normal approximation, tie-corrected)."""
+    n1, n2 = len(baseline), len(candidate)
+    combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2.0 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 1)
+        i = j + 1
+
+    u = rank_sum - n2 * (n2 + 1) / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline_path, candidate_path, threshold=0.10, alpha=0.05, min_samples=20):
+    baseline, candidate = grouped_latencies(baseline_path), grouped_latencies(candidate_path)
+    rows = []
+    for key in sorted(set(baseline) & set(candidate), key=lambda item: (item[0] != "overall", item)):
+        base, cand = sorted(baseline[key]), sorted(candidate[key])
+        row = {"kind": key[0], "group": key[1], "baseline_n": len(base), "candidate_n": len(cand)}
+        if not base or not cand:
+            rows.append({**row, "verdict": "no data"})
+            continue
+        base_p95, cand_p95 = percentile(base, 95), percentile(cand, 95)
+        change = (cand_p95 - base_p95) / base_p95 if base_p95 else 0.0
+        p_value = mann_whitney_greater(base, cand)
+        if min(len(base), len(cand)) < min_samples:
+            verdict = "insufficient"
+        elif change > threshold and p_value < alpha:
+            verdict = "regression"
+        elif change < -threshold and mann_whitney_greater(cand, base) < alpha:
+            verdict = "improvement"
+        else:
+            verdict = "ok"
+        rows.append({
+            **row,
+            "baseline_p50_ms": percentile(base, 50),
+            "candidate_p50_ms": percentile(cand, 50),
+            "baseline_p95_ms": base_p95,
+            "candidate_p95_ms": cand_p95,
+            "p95_change": round(change, 4),
+            "p_value": round(p_value, 6),
+            "verdict": verdict,
+        })
+    only = {
+        "baseline_only": [f"{kind}:{name}" for kind, name in sorted(set(baseline) - set(candidate))],
+        "candidate_only": [f"{kind}:{name}" for kind, name in sorted(set(candidate) - set(baseline))],
+    }
+    return {
+        "baseline": str(baseline_path),
+        "candidate": str(candidate_path),
+        "threshold": threshold,
+        "alpha": alpha,
+        "min_samples": min_samples,
+        "groups": rows,
+        **only,
+        "regressions": [f"{row['kind']}:{row['group']}" for row in rows if row["verdict"] == "regression"],
+    }
+
+
+def format_comparison(result):
+    lines = [
+        f"Baseline:  {result['baseline']}",
+        f"Candidate: {result['candidate']}",
+        f"Regression = p95 +{result['threshold'] * 100:.0f}% and Mann-Whitney p < {result['alpha']}",
+        "",
+        f"{'group':<36}{'n base':>8}{'n cand':>8}{'p50 base':>10}{'p50 cand':>10}"
+        f"{'p95 base':>10}{'p95 cand':>10}{'p95 chg':>9}{'p':>9}  verdict",
+    ]
+    for row in result["groups"]:
+        name = f"{row['kind']}:{row['group']}"[:35]
+        if "p95_change" not in row:
+            lines.append(f"{name:<36}{row['baseline_n']:>8}{row['candidate_n']:>8}  {row['verdict']}")
+            continue
+        lines.append(
+            f"{name:<36}{row['baseline_n']:>8}{row['candidate_n']:>8}"
+            f"{row['baseline_p50_ms']:>10.1f}{row['candidate_p50_ms']:>10.1f}"
+            f"{row['baseline_p95_ms']:>10.1f}{row['candidate_p95_ms']:>10.1f}"
+            f"{row['p95_change'] * 100:>8.1f}%{row['p_value']:>9.4f}  {row['verdict']}"
+        )
+    for key, label in (("baseline_only", "Only in baseline"), ("candidate_only", "Only in candidate")):
+        if result[key]:
+            lines.append(f"{label}: {', '.join(result[key])}")
+    lines.append("")
+    lines.append(f"REGRESSION: {', '.join(result['regressions'])}" if result["regressions"] else "No p95 regressions.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative p95 increase (default 0.10).")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level for the Mann-Whitney test.")
+    parser.add_argument("--min-samples", type=int, default=20, help="Groups smaller than this are reported but never gate.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the comparison as JSON here.")
+    args = parser.parse_args(argv)
+
+    for path in (args.baseline, args.candidate):
+        if not path.is_file():
+            parser.error(f"run file not found: {path}")
+    result = compare(args.baseline, args.candidate, args.threshold, args.alpha, args.min_samples)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(format_comparison(result))
+    return 1 if result["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""Load generation for the AI co-pilot API.
+
+Used by ``run_ai_copilot_test.py``. ``--mode concurrent`` issues requests from a
+pool of asyncio workers sharing one keep-alive aiohttp session; an optional
+pacer caps the aggregate request rate and both the worker count and the rate
+ramp up linearly over the configured ramp-up window.
+
+``--mode open-loop`` instead fires requests on a fixed constant or Poisson
+arrival schedule regardless of how many are still outstanding. Each record
+keeps its intended start time and ``latency_ms`` is measured from that
+instant, so queueing inside the server (or the client) shows up in the
+numbers instead of silently slowing the sender down (coordinated omission).
+
+``--workload`` replays multi-turn conversations from a workload spec (see
+``workload.py``): each worker plays one session at a time, reusing its
+``sessionId`` and team across turns with think time in between.
+
+The ``chat-stream`` endpoint posts to ``/api/chat/stream`` and consumes its
+server-sent events, adding ``ttfb_ms`` (first byte) and ``ttft_ms`` (first
+token) to each record alongside the usual ``latency_ms``.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+from chat_stream import SSEParser, StreamTimings
+
+ENDPOINT_PATHS = {
+    "chat": "/api/chat",
+    "chat-stream": "/api/chat/stream",
+    "analyze": "/api/analyze",
+    "transfer-plan": "/api/transfer-plan",
+}
+
+
+def build_payload(prompt, team_id, session_id=None):
+    return {
+        "message": prompt,
+        "teamId": team_id,
+        "sessionId": session_id or f"autotest_{uuid.uuid4().hex}",
+    }
+
+
+def build_endpoint_payload(endpoint, prompt, team_id):
+    if endpoint in ("chat", "chat-stream"):
+        return build_payload(prompt, team_id)
+    if endpoint == "analyze":
+        return {"teamId": team_id}
+    if endpoint == "transfer-plan":
+        return {"teamId": team_id, "maxHits": 2, "includeRiskyMoves": False}
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def api_url(base_url, path):
+    """Resolve ``path`` against ``base_url``, which may be the server root or its chat URL."""
+    root = base_url.rstrip("/")
+    if root.endswith(ENDPOINT_PATHS["chat"]):
+        root = root[: -len(ENDPOINT_PATHS["chat"])]
+    return root + path
+
+
+def endpoint_url(base_url, endpoint):
+    return api_url(base_url, ENDPOINT_PATHS[endpoint])
+
+
+def new_record(index, category, prompt, payload, endpoint="chat"):
+    return {
+        "index": index,
+        "endpoint": endpoint,
+        "category": category,
+        "prompt": prompt,
+        "payload": payload,
+    }
+
+
+def apply_response(record, summary, status_code, data, ok):
+    """Fill in the response fields of ``record`` and update the pass/fail counters."""
+    record["status_code"] = status_code
+    record["response_json"] = data
+    if ok and isinstance(data, dict) and data.get("success"):
+        summary["success"] += 1
+    else:
+        summary["fail"] += 1
+        record["error"] = "Non-success response"
+
+
+def schedule_offset(index, rate, ramp_up=0.0):
+    """Seconds after start at which request ``index`` is due.
+
+    The rate climbs linearly from zero to ``rate`` over ``ramp_up`` seconds and
+    then stays flat, so the first ``rate * ramp_up / 2`` requests fall inside the
+    ramp.
+    """
+    if not rate:
+        return 0.0
+    if ramp_up <= 0:
+        return index / rate
+    ramp_requests = rate * ramp_up / 2.0
+    if index <= ramp_requests:
+        return math.sqrt(2.0 * ramp_up * index / rate)
+    return ramp_up + (index - ramp_requests) / rate
+
+
+def arrival_offsets(count, rate, arrival="constant", ramp_up=0.0, seed=None):
+    """Intended start offsets (seconds) for ``count`` open-loop requests.
+
+    ``constant`` spaces requests evenly following :func:`schedule_offset`;
+    ``poisson`` draws exponential inter-arrival gaps with mean ``1 / rate``;
+    during ramp-up the instantaneous rate grows linearly, floored at one
+    request per ``ramp_up`` seconds so the first gap stays finite.
+    """
+    if rate <= 0:
+        raise ValueError("Open-loop mode needs a positive --rate")
+    if arrival == "constant":
+        return [schedule_offset(index, rate, ramp_up) for index in range(count)]
+    if arrival != "poisson":
+        raise ValueError(f"Unknown arrival process: {arrival}")
+
+    rng = random.Random(seed)
+    offsets = []
+    elapsed = 0.0
+    for _ in range(count):
+        offsets.append(elapsed)
+        current_rate = rate
+        if ramp_up > 0 and elapsed < ramp_up:
+            current_rate = max(rate * elapsed / ramp_up, rate / max(1.0, rate * ramp_up))
+        elapsed += rng.expovariate(current_rate)
+    return offsets
+
+
+class RatePacer:
+    """Hands out send slots following :func:`schedule_offset`.
+
+    Late callers are released immediately rather than skipped, so a slow server
+    lowers the achieved rate instead of dropping requests.
+    """
+
+    def __init__(self, rate, ramp_up=0.0):
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self._issued = 0
+        self._start = None
+
+    async def wait(self):
+        if self._start is None:
+            self._start = time.perf_counter()
+        slot = self._start + schedule_offset(self._issued, self.rate, self.ramp_up)
+        self._issued += 1
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return slot - self._start
+
+
+async def _post_json(session, url, record, summary, timeout, started=None):
+    import aiohttp
+
+    sent = time.perf_counter()
+    started = sent if started is None else started
+    try:
+        async with session.post(url, json=record["payload"], timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            body = await response.read()
+            finished = time.perf_counter()
+            record["latency_ms"] = round((finished - started) * 1000, 1)
+            record["service_ms"] = round((finished - sent) * 1000, 1)
+            try:
+                data = json.loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                data = None
+            apply_response(record, summary, response.status, data, response.status < 400)
+    except Exception as exc:  # pylint: disable=broad-except
+        summary["fail"] += 1
+        record["error"] = str(exc) or type(exc).__name__
+
+
+async def _post_stream(session, url, record, summary, timeout, started=None):
+    import aiohttp
+
+    sent = time.perf_counter()
+    timings = StreamTimings(sent if started is None else started)
+    parser = SSEParser()
+    try:
+        async with session.post(url, json=record["payload"], timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.content_type != "text/event-stream":
+                body = await response.read()
+                try:
+                    timings.response_json = json.loads(body)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass
+            else:
+                async for line in response.content:
+                    timings.on_bytes()
+                    event = parser.feed(line)
+                    if event is not None:
+                        timings.on_event(*event)
+                event = parser.flush()
+                if event is not None:
+                    timings.on_event(*event)
+            finished = time.perf_counter()
+            record["latency_ms"] = timings.elapsed_ms(finished)
+            record["service_ms"] = round((finished - sent) * 1000, 1)
+            record.update(timings.fields())
+            apply_response(record, summary, response.status, timings.response_json, response.status < 400)
+    except Exception as exc:  # pylint: disable=broad-except
+        summary["fail"] += 1
+        record["error"] = str(exc) or type(exc).__name__
+
+
+def _send(session, url, record, summary, timeout, started=None):
+    post = _post_stream if record["endpoint"] == "chat-stream" else _post_json
+    return post(session, url, record, summary, timeout, started)
+
+
+def _require_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as exc:
+        raise SystemExit("Concurrent and open-loop modes require aiohttp (pip install aiohttp)") from exc
+    return aiohttp
+
+
+async def run_concurrent(questions, base_url, team_id, on_record, concurrency=8, rate=None, ramp_up=0.0, timeout=30.0, endpoint="chat"):
+    """Send every ``(category, prompt)`` in ``questions`` to ``endpoint`` using ``concurrency`` workers.
+
+    Each finished record is handed to ``on_record`` as soon as it completes.
+    Returns ``(summary, duration_s)``.
+    """
+    aiohttp = _require_aiohttp()
+    concurrency = max(1, int(concurrency))
+    summary = {"total": len(questions), "success": 0, "fail": 0}
+    queue = asyncio.Queue()
+    for idx, (category, prompt) in enumerate(questions, start=1):
+        queue.put_nowait((idx, category, prompt))
+
+    pacer = RatePacer(rate, ramp_up) if rate else None
+    url = endpoint_url(base_url, endpoint)
+    run_started = time.perf_counter()
+
+    async def worker(worker_id, session):
+        if ramp_up > 0 and concurrency > 1:
+            await asyncio.sleep(ramp_up * worker_id / concurrency)
+        while True:
+            try:
+                idx, category, prompt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            record = new_record(idx, category, prompt, build_payload(prompt, team_id), endpoint=endpoint)
+            record["worker"] = worker_id
+            if pacer is not None:
+                record["scheduled_offset_s"] = round(await pacer.wait(), 4)
+            record["started_offset_s"] = round(time.perf_counter() - run_started, 4)
+            await _send(session, url, record, summary, timeout)
+            on_record(record)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(worker(worker_id, session) for worker_id in range(concurrency)))
+
+    return summary, time.perf_counter() - run_started
+
+
+async def run_open_loop(
+    questions,
+    base_url,
+    team_id,
+    rate,
+    on_record,
+    endpoints=("chat",),
+    arrival="constant",
+    ramp_up=0.0,
+    seed=None,
+    max_connections=256,
+    timeout=30.0,
+):
+    """Fire one request per ``questions`` entry on a fixed arrival schedule.
+
+    Endpoints are assigned round-robin; non-chat endpoints ignore the prompt.
+    Returns ``(summary, duration_s)`` like :func:`run_concurrent`.
+    """
+    aiohttp = _require_aiohttp()
+    offsets = arrival_offsets(len(questions), rate, arrival, ramp_up, seed)
+    summary = {"total": len(questions), "success": 0, "fail": 0}
+    in_flight = 0
+    peak_in_flight = 0
+    max_send_lag = 0.0
+
+    async def fire(record, intended):
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            await _send(session, endpoint_url(base_url, record["endpoint"]), record, summary, timeout, started=intended)
+        finally:
+            in_flight -= 1
+        on_record(record)
+
+    connector = aiohttp.TCPConnector(limit=max_connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        run_started = time.perf_counter()
+        tasks = set()
+        for idx, ((category, prompt), offset) in enumerate(zip(questions, offsets), start=1):
+            endpoint = endpoints[(idx - 1) % len(endpoints)]
+            record = new_record(
+                idx,
+                category if endpoint in ("chat", "chat-stream") else endpoint,
+                prompt if endpoint in ("chat", "chat-stream") else None,
+                build_endpoint_payload(endpoint, prompt, team_id),
+                endpoint=endpoint,
+            )
+            intended = run_started + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lag = time.perf_counter() - intended
+            max_send_lag = max(max_send_lag, lag)
+            record["intended_offset_s"] = round(offset, 4)
+            record["send_lag_ms"] = round(lag * 1000, 2)
+            task = asyncio.create_task(fire(record, intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            peak_in_flight = max(peak_in_flight, in_flight + 1)
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - run_started
+
+    summary["target_rps"] = rate
+    summary["offered_rps"] = round(len(questions) / offsets[-1], 2) if len(offsets) > 1 and offsets[-1] > 0 else None
+    summary["peak_in_flight"] = peak_in_flight
+    summary["max_send_lag_ms"] = round(max_send_lag * 1000, 2)
+    return summary, duration
+
+
+async def run_sessions(sessions, base_url, on_record, concurrency=8, timeout=30.0, endpoint="chat"):
+    """Replay ``workload.generate_sessions`` output with ``concurrency`` sessions in flight.
+
+    Records are numbered in session order and passed to ``on_record`` as they finish. A
+    conversation resuming an earlier ``session_id`` is queued behind that session on the same
+    worker, so one server-side session never receives turns from two clients at once.
+    Returns ``(summary, duration_s)``.
+    """
+    aiohttp = _require_aiohttp()
+    concurrency = max(1, int(concurrency))
+    total = sum(len(session["turns"]) for session in sessions)
+    summary = {"total": total, "success": 0, "fail": 0, "sessions": len(sessions)}
+    queue = asyncio.Queue()
+    url = endpoint_url(base_url, endpoint)
+    chains = {}
+    index = 0
+    for session_no, session in enumerate(sessions):
+        chain = chains.get(session["session_id"])
+        if chain is None:
+            chain = chains[session["session_id"]] = []
+            queue.put_nowait(chain)
+        chain.append((session_no, session, index))
+        index += len(session["turns"])
+    run_started = time.perf_counter()
+
+    async def worker(worker_id, session):
+        while True:
+            try:
+                chain = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for session_no, conversation, first_index in chain:
+                await run_conversation(worker_id, session, session_no, conversation, first_index)
+
+    async def run_conversation(worker_id, session, session_no, conversation, first_index):
+        for turn_no, turn in enumerate(conversation["turns"]):
+            if turn_no:
+                await asyncio.sleep(turn["think_time_s"])
+            idx = first_index + turn_no + 1
+            payload = build_payload(turn["prompt"], conversation["team_id"], conversation["session_id"])
+            record = new_record(idx, turn["category"], turn["prompt"], payload, endpoint=endpoint)
+            record.update({
+                "worker": worker_id,
+                "session": session_no,
+                "turn": turn_no + 1,
+                "returning_session": conversation["returning"],
+                "started_offset_s": round(time.perf_counter() - run_started, 4),
+            })
+            await _send(session, url, record, summary, timeout)
+            on_record(record)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(worker(worker_id, session) for worker_id in range(concurrency)))
+
+    return summary, time.perf_counter() - run_started
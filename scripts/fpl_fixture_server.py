@@ -0,0 +1,179 @@
+"""Local stand-in for the official FPL API, replaying recorded payloads.
+
+Point the app at it with ``FPL_API_BASE_URL=http://127.0.0.1:<port>/api``.
+
+Record payloads once on a connected machine::
+
+    python scripts/fpl_fixture_server.py record --team-id 7892155 --out fixtures/fpl
+
+then serve them anywhere (optionally with injected latency)::
+
+    python scripts/fpl_fixture_server.py serve --dir fixtures/fpl --latency-ms 120 --jitter-ms 40
+
+Each upstream path is stored as ``<dir>/<path>.json``, e.g.
+``entry/7892155/event/7/picks.json``. ``run_ai_copilot_test.py --fpl-fixtures``
+starts the server in-process.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+UPSTREAM_URL = "https://fantasy.premierleague.com/api"
+DEFAULT_FIXTURES_DIR = Path("fixtures/fpl")
+
+
+def fixture_path(fixtures_dir, api_path):
+    """Map an upstream path such as ``/api/entry/1/history/`` onto its fixture file."""
+    relative = api_path.split("?", 1)[0].strip("/")
+    if relative.startswith("api/"):
+        relative = relative[len("api/"):]
+    if not relative or ".." in relative.split("/"):
+        return None
+    return Path(fixtures_dir) / f"{relative}.json"
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    server_version = "FPLFixtureServer/1.0"
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        self.server.inject_delay()
+        path = self.server.resolve(self.path)
+        if path is None:
+            self._send(404, b'{"detail": "Not found."}')
+            return
+        self._send(200, path.read_bytes())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures_dir, latency_ms=0.0, jitter_ms=0.0, seed=None, fallback_entry=None, verbose=False):
+        super().__init__(address, FixtureRequestHandler)
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fallback_entry = str(fallback_entry) if fallback_entry else None
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def inject_delay(self):
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000.0)
+
+    def resolve(self, request_path):
+        path = fixture_path(self.fixtures_dir, request_path)
+        if path is None:
+            return None
+        if path.is_file():
+            return path
+        # Serve unrecorded managers from one recorded entry so large team populations stay offline.
+        parts = path.relative_to(self.fixtures_dir).parts
+        if self.fallback_entry and len(parts) >= 2 and parts[0] == "entry":
+            fallback = self.fixtures_dir.joinpath("entry", self.fallback_entry, *parts[2:])
+            if fallback.is_file():
+                return fallback
+        return None
+
+
+def start_fixture_server(fixtures_dir, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, seed=None, fallback_entry=None):
+    """Start a :class:`FixtureServer` on a daemon thread; call ``shutdown()`` to stop it."""
+    if not Path(fixtures_dir).is_dir():
+        raise FileNotFoundError(f"FPL fixtures directory not found: {fixtures_dir}")
+    server = FixtureServer((host, port), fixtures_dir, latency_ms, jitter_ms, seed, fallback_entry)
+    threading.Thread(target=server.serve_forever, name="fpl-fixture-server", daemon=True).start()
+    return server
+
+
+def record_fixtures(out_dir, team_ids, gameweeks=None, upstream=UPSTREAM_URL):
+    import requests
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": "FPL-Chip-Strategy-Architect/1.0", "Accept": "application/json"})
+    written = []
+
+    def fetch(api_path):
+        response = session.get(f"{upstream}/{api_path}/", timeout=30)
+        response.raise_for_status()
+        target = fixture_path(out_dir, api_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(response.content)
+        written.append(target)
+        return response.json()
+
+    bootstrap = fetch("bootstrap-static")
+    fetch("fixtures")
+    current = next((event["id"] for event in bootstrap.get("events", []) if event.get("is_current")), 1)
+    for team_id in team_ids:
+        fetch(f"entry/{team_id}")
+        fetch(f"entry/{team_id}/history")
+        for gameweek in gameweeks or [current]:
+            fetch(f"entry/{team_id}/event/{gameweek}/picks")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Download payloads from the live FPL API.")
+    record.add_argument("--team-id", action="append", required=True, dest="team_ids")
+    record.add_argument("--gameweek", action="append", type=int, dest="gameweeks", help="Defaults to the current gameweek.")
+    record.add_argument("--out", type=Path, default=DEFAULT_FIXTURES_DIR)
+
+    serve = commands.add_parser("serve", help="Serve recorded payloads.")
+    serve.add_argument("--dir", type=Path, default=DEFAULT_FIXTURES_DIR)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--seed", type=int, default=None)
+    serve.add_argument("--fallback-entry", default=None, help="Recorded team ID to serve for unknown entry IDs.")
+    serve.add_argument("--verbose", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        written = record_fixtures(args.out, args.team_ids, args.gameweeks)
+        print(f"Recorded {len(written)} payloads into {args.out}")
+        return 0
+
+    if not args.dir.is_dir():
+        parser.error(f"fixtures directory not found: {args.dir}")
+    server = FixtureServer((args.host, args.port), args.dir, args.latency_ms, args.jitter_ms, args.seed, args.fallback_entry, args.verbose)
+    print(f"Serving {args.dir} at {server.base_url} (export FPL_API_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Keep-alive HTTP session for the co-pilot test scripts.
+
+``PooledSession`` reuses TCP connections across requests (bounded by
+``pool_size``) and times connection setup separately, so callers can report
+server-side latency without the TCP/TLS handshake folded in.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_connect_timings = threading.local()
+
+
+def _record_connect(elapsed):
+    _connect_timings.seconds = getattr(_connect_timings, "seconds", 0.0) + elapsed
+    _connect_timings.count = getattr(_connect_timings, "count", 0) + 1
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Adapter that annotates each response with ``connect_time`` and ``server_time`` (seconds)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _connect_timings.seconds = 0.0
+        _connect_timings.count = 0
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        total = time.perf_counter() - started
+        response.connect_time = _connect_timings.seconds
+        response.new_connections = _connect_timings.count
+        response.server_time = max(0.0, total - response.connect_time)
+        return response
+
+
+class PooledSession(requests.Session):
+    def __init__(self, pool_size=10, block=False):
+        super().__init__()
+        self.pool_size = pool_size
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=block)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
@@ -0,0 +1,216 @@
+"""HDR-style latency histograms and percentile reports for the co-pilot harness.
+
+Latencies are recorded at microsecond resolution into log-linear buckets that
+keep ``significant_digits`` of precision across the whole range, so tail
+percentiles stay accurate without storing every sample. Reports break the
+distribution down overall, per endpoint, per prompt category and per
+classified intent; streamed requests also get time-to-first-byte and
+time-to-first-token distributions.
+
+Usage: ``python scripts/latency_report.py logs/ai_copilot_tests/run_<ts>.jsonl``
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    def __init__(self, significant_digits=3):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = None
+
+    def _key(self, value_us):
+        if value_us < (1 << self._sub_bucket_bits):
+            return (0, value_us)
+        shift = value_us.bit_length() - self._sub_bucket_bits
+        return (shift, value_us >> shift)
+
+    @staticmethod
+    def _highest_equivalent(key):
+        shift, sub_bucket = key
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, latency_ms, count=1):
+        value_us = max(0, int(round(latency_ms * 1000)))
+        key = self._key(value_us)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = value_us if self.max_us is None else max(self.max_us, value_us)
+
+    def merge(self, other):
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        for attr, pick in (("min_us", min), ("max_us", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if theirs is not None:
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+
+    def value_at_percentile(self, percentile):
+        """Latency in ms at or below which ``percentile`` percent of samples fall."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(percentile / 100.0 * self.count))
+        seen = 0
+        for key in sorted(self._counts):
+            seen += self._counts[key]
+            if seen >= target:
+                return min(self._highest_equivalent(key), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    @property
+    def mean_ms(self):
+        return self.total_us / self.count / 1000.0 if self.count else None
+
+    def buckets(self):
+        """``[upper_ms, count]`` pairs for every non-empty bucket, in ascending order."""
+        return [[self._highest_equivalent(key) / 1000.0, self._counts[key]] for key in sorted(self._counts)]
+
+    def to_dict(self, include_buckets=True):
+        payload = {
+            "count": self.count,
+            "min_ms": self.min_us / 1000.0 if self.min_us is not None else None,
+            "max_ms": self.max_us / 1000.0 if self.max_us is not None else None,
+            "mean_ms": round(self.mean_ms, 3) if self.count else None,
+            "percentiles_ms": {_percentile_label(p): self.value_at_percentile(p) for p in PERCENTILES},
+        }
+        if include_buckets:
+            payload["buckets"] = self.buckets()
+        return payload
+
+
+def _percentile_label(percentile):
+    return f"p{percentile:g}"
+
+
+def intent_of(response_json):
+    if not isinstance(response_json, dict):
+        return "unknown"
+    data = response_json.get("data")
+    if not isinstance(data, dict):
+        return "unknown"
+    intent = (data.get("conversationContext") or {}).get("intent") or {}
+    return intent.get("type") or "unknown"
+
+
+class LatencyReportBuilder:
+    """Incremental form of :func:`build_latency_report` for streaming runs."""
+
+    def __init__(self, significant_digits=3):
+        self.significant_digits = significant_digits
+        self.overall = LatencyHistogram(significant_digits)
+        self.by_endpoint = {}
+        self.by_category = {}
+        self.by_intent = {}
+        self.first_byte = LatencyHistogram(significant_digits)
+        self.first_token = LatencyHistogram(significant_digits)
+
+    def add(self, record):
+        latency = record.get("latency_ms")
+        if latency is None:
+            return
+        for histogram, key in ((self.first_byte, "ttfb_ms"), (self.first_token, "ttft_ms")):
+            if record.get(key) is not None:
+                histogram.record(record[key])
+        groups = (
+            (self.by_endpoint, record.get("endpoint") or "chat"),
+            (self.by_category, record.get("category") or "uncategorised"),
+            (self.by_intent, record.get("intent") or intent_of(record.get("response_json"))),
+        )
+        self.overall.record(latency)
+        for histograms, name in groups:
+            if name not in histograms:
+                histograms[name] = LatencyHistogram(self.significant_digits)
+            histograms[name].record(latency)
+
+    def to_dict(self):
+        return {
+            "significant_digits": self.significant_digits,
+            "overall": self.overall.to_dict(),
+            "by_endpoint": {name: hist.to_dict() for name, hist in sorted(self.by_endpoint.items())},
+            "by_category": {name: hist.to_dict() for name, hist in sorted(self.by_category.items())},
+            "by_intent": {name: hist.to_dict() for name, hist in sorted(self.by_intent.items())},
+            "first_byte": self.first_byte.to_dict(),
+            "first_token": self.first_token.to_dict(),
+        }
+
+
+def build_latency_report(records, significant_digits=3):
+    """Aggregate ``latency_ms`` from harness records overall and by endpoint, category and intent."""
+    builder = LatencyReportBuilder(significant_digits)
+    for record in records:
+        builder.add(record)
+    return builder.to_dict()
+
+
+def load_records(path):
+    """Yield harness records from a streamed ``.jsonl`` run or a legacy single-file ``run_*.json``."""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        return  # truncated final line from an interrupted run
+        return
+    yield from json.loads(path.read_text(encoding="utf-8")).get("results", [])
+
+
+def format_latency_report(report):
+    labels = [_percentile_label(p) for p in PERCENTILES]
+    header = f"{'group':<32}{'n':>6}{'mean':>10}" + "".join(f"{label:>10}" for label in labels) + f"{'max':>10}"
+
+    def row(name, stats):
+        def cell(value):
+            return f"{value:>10.1f}" if value is not None else f"{'-':>10}"
+
+        percentiles = stats["percentiles_ms"]
+        return (
+            f"{name[:31]:<32}{stats['count']:>6}{cell(stats['mean_ms'])}"
+            + "".join(cell(percentiles[label]) for label in labels)
+            + cell(stats["max_ms"])
+        )
+
+    lines = ["Latency (ms)", header, row("overall", report["overall"])]
+    for title, key in (("By endpoint", "by_endpoint"), ("By category", "by_category"), ("By intent", "by_intent")):
+        lines.append("")
+        lines.append(title)
+        lines.extend(row(name, stats) for name, stats in report[key].items())
+    streamed = [(name, report[key]) for name, key in (("first byte", "first_byte"), ("first token", "first_token")) if key in report]
+    if any(stats["count"] for _, stats in streamed):
+        lines.append("")
+        lines.append("Streaming")
+        lines.extend(row(name, stats) for name, stats in streamed)
+    return "\n".join(lines)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(f"usage: {argv[0]} <run.jsonl | run.json>")
+        return 2
+    report = build_latency_report(load_records(argv[1]))
+    print(format_latency_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,258 @@
+"""Deterministic stand-in for the LLM providers used by the co-pilot.
+
+Speaks just enough of each upstream protocol for our services:
+
+* OpenAI-compatible ``POST /v1/chat/completions`` (OpenRouter), incl. SSE streaming
+* Ollama ``GET /api/tags`` and ``POST /api/chat`` (NDJSON when streaming)
+* Gemini ``POST /v1beta/models/<model>:generateContent`` (Google AI)
+* HuggingFace Inference ``POST /models/<model>``
+
+Completions are canned and chosen by hashing the last user message, so the
+same prompt always gets the same answer. Latency is modelled as a fixed
+time-to-first-token plus ``tokens / tokens_per_sec`` (whitespace tokens), and
+``GET /stub/stats`` reports how much model time was simulated so the harness
+can subtract it from the app's ``llmMs`` to isolate pipeline overhead.
+
+Usage: ``python scripts/llm_stub_server.py --ttft-ms 400 --tokens-per-sec 40``
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_COMPLETIONS = (
+    "Your squad looks balanced. Keep the premium midfield core, bank the free transfer and revisit "
+    "the defence once the next fixture swing lands. Captain the in-form forward with the best FDR.",
+    "Hold the wildcard for now. Fixtures over the next three gameweeks are manageable, and rolling "
+    "the transfer gives two moves ahead of the double gameweek when bench boost becomes attractive.",
+    "Consider moving the out-of-form forward to a cheaper option with softer fixtures and using the "
+    "saved funds to upgrade a defender who offers attacking returns. Avoid taking a hit this week.",
+    "Fixture difficulty favours the attacking assets with home games. Target players whose next four "
+    "opponents average an FDR below three and monitor late fitness news before the deadline.",
+)
+
+
+def completion_for(prompt, completion_tokens=None):
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    words = CANNED_COMPLETIONS[digest[0] % len(CANNED_COMPLETIONS)].split()
+    if completion_tokens:
+        words = [words[i % len(words)] for i in range(completion_tokens)]
+    return words
+
+
+def _last_user_text(messages):
+    for message in reversed(messages or []):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, str):
+                return content
+            return " ".join(part.get("text", "") for part in message.get("parts", []))
+    return ""
+
+
+class LLMStubRequestHandler(BaseHTTPRequestHandler):
+    server_version = "LLMStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        if self.path.startswith("/api/tags"):
+            self._send_json({"models": [{"name": "stub:latest"}]})
+        elif self.path.startswith("/stub/stats"):
+            self._send_json(self.server.stats())
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json({"error": "invalid JSON"}, 400)
+            return
+
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/chat/completions"):
+            self._openai(body)
+        elif path == "/api/chat":
+            self._ollama(body)
+        elif path.endswith(":generateContent"):
+            words = self._generate(_last_user_text(body.get("contents")))
+            text = " ".join(words)
+            self._send_json({
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(words), "totalTokenCount": len(words)},
+            })
+        elif path.startswith("/models/"):
+            words = self._generate(str(body.get("inputs", "")))
+            self._send_json([{"generated_text": " ".join(words)}])
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _generate(self, prompt):
+        """Block for the modelled completion time and return the token list."""
+        words = completion_for(prompt, self.server.completion_tokens)
+        seconds = self.server.model_seconds(len(words))
+        self.server.note_call(seconds)
+        time.sleep(seconds)
+        return words
+
+    def _openai(self, body):
+        prompt = _last_user_text(body.get("messages"))
+        if not body.get("stream"):
+            words = self._generate(prompt)
+            self._send_json({
+                "id": "stub-completion",
+                "object": "chat.completion",
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": " ".join(words)}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(words), "total_tokens": len(words)},
+            })
+            return
+
+        def chunk(delta, finish=None):
+            payload = {"id": "stub-completion", "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+        self._stream("text/event-stream", prompt, lambda word: chunk({"content": word + " "}), [chunk({}, "stop"), b"data: [DONE]\n\n"])
+
+    def _ollama(self, body):
+        prompt = _last_user_text(body.get("messages"))
+        model = body.get("model", "stub")
+        if body.get("stream") is False:
+            words = self._generate(prompt)
+            self._send_json({
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": " ".join(words)},
+                "done": True,
+                "eval_count": len(words),
+            })
+            return
+
+        def line(content, done=False):
+            return (json.dumps({"model": model, "message": {"role": "assistant", "content": content}, "done": done}) + "\n").encode("utf-8")
+
+        self._stream("application/x-ndjson", prompt, lambda word: line(word + " "), [line("", True)])
+
+    def _stream(self, content_type, prompt, encode_token, trailer):
+        words = completion_for(prompt, self.server.completion_tokens)
+        self.server.note_call(self.server.model_seconds(len(words)))
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(self.server.ttft_ms / 1000.0)
+        per_token = 1.0 / self.server.tokens_per_sec if self.server.tokens_per_sec > 0 else 0.0
+        for index, word in enumerate(words):
+            if index:
+                time.sleep(per_token)
+            self._write_chunk(encode_token(word))
+        for piece in trailer:
+            self._write_chunk(piece)
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LLMStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, ttft_ms=300.0, tokens_per_sec=50.0, completion_tokens=None, verbose=False):
+        super().__init__(address, LLMStubRequestHandler)
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.completion_tokens = completion_tokens
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._model_seconds = 0.0
+
+    @property
+    def root_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def app_env(self):
+        """Environment variables that route every LLM provider in the app to this stub."""
+        return {
+            "OLLAMA_BASE_URL": self.root_url,
+            "OPENROUTER_BASE_URL": f"{self.root_url}/v1",
+            "OPENROUTER_API_KEY": "stub",
+            "GOOGLE_AI_BASE_URL": f"{self.root_url}/v1beta/models",
+            "GOOGLE_AI_API_KEY": "stub",
+            "HUGGINGFACE_BASE_URL": f"{self.root_url}/models",
+            "HUGGINGFACE_API_KEY": "stub",
+        }
+
+    def model_seconds(self, tokens):
+        seconds = self.ttft_ms / 1000.0
+        if self.tokens_per_sec > 0 and tokens > 1:
+            seconds += (tokens - 1) / self.tokens_per_sec
+        return seconds
+
+    def note_call(self, seconds):
+        with self._lock:
+            self._calls += 1
+            self._model_seconds += seconds
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "model_ms_total": round(self._model_seconds * 1000, 1),
+                "ttft_ms": self.ttft_ms,
+                "tokens_per_sec": self.tokens_per_sec,
+            }
+
+
+def start_llm_stub(host="127.0.0.1", port=0, ttft_ms=300.0, tokens_per_sec=50.0, completion_tokens=None):
+    """Start an :class:`LLMStubServer` on a daemon thread; call ``shutdown()`` to stop it."""
+    server = LLMStubServer((host, port), ttft_ms, tokens_per_sec, completion_tokens)
+    threading.Thread(target=server.serve_forever, name="llm-stub-server", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Simulated time to first token.")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="Simulated decode speed (0 = instant).")
+    parser.add_argument("--completion-tokens", type=int, default=None, help="Force every completion to this many tokens.")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = LLMStubServer((args.host, args.port), args.ttft_ms, args.tokens_per_sec, args.completion_tokens, args.verbose)
+    print(f"LLM stub at {server.root_url}; app environment:")
+    for key, value in server.app_env().items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
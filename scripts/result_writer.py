@@ -0,0 +1,82 @@
+"""Streaming result storage for long benchmark runs.
+
+Records are appended to ``run_<id>.jsonl`` as they complete and flushed every
+``flush_every`` records, so a crash loses at most a handful. Aggregates
+(pass/fail counts, latency histograms, LLM timing) are kept incrementally and
+``run_<id>_summary.json`` is atomically rewritten every ``summary_every``
+records, which keeps memory flat on 100k-request soak runs.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from latency_report import LatencyReportBuilder, intent_of
+
+
+def llm_ms_of(response_json):
+    if not isinstance(response_json, dict) or not isinstance(response_json.get("data"), dict):
+        return None
+    value = (response_json["data"].get("conversationContext") or {}).get("llmMs")
+    return value if isinstance(value, (int, float)) else None
+
+
+class ResultWriter:
+    def __init__(self, out_dir, run_id, metadata, keep_responses=True, flush_every=10, summary_every=100):
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = out_dir / f"run_{run_id}.jsonl"
+        self.summary_path = out_dir / f"run_{run_id}_summary.json"
+        self.metadata = metadata
+        self.keep_responses = keep_responses
+        self.flush_every = max(1, flush_every)
+        self.summary_every = max(1, summary_every)
+        self.latency = LatencyReportBuilder()
+        self.progress = {"written": 0, "success": 0, "fail": 0}
+        self.llm_ms_total = 0.0
+        self.llm_ms_count = 0
+        self._handle = self.records_path.open("w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._handle.close()
+
+    def write(self, record):
+        response = record.get("response_json")
+        record["intent"] = intent_of(response)
+        llm_ms = llm_ms_of(response)
+        if llm_ms is not None:
+            record["llm_ms"] = llm_ms
+            self.llm_ms_total += llm_ms
+            self.llm_ms_count += 1
+        if not self.keep_responses:
+            record.pop("response_json", None)
+
+        self.latency.add(record)
+        self.progress["written"] += 1
+        self.progress["fail" if "error" in record else "success"] += 1
+        self._handle.write(json.dumps(record) + "\n")
+
+        written = self.progress["written"]
+        if written % self.flush_every == 0:
+            self._handle.flush()
+        if written % self.summary_every == 0:
+            self.write_summary()
+
+    def write_summary(self, final=None):
+        """Atomically rewrite the summary file; ``final`` fields are merged in when the run ends."""
+        self._handle.flush()
+        payload = {
+            **self.metadata,
+            "records_path": self.records_path.name,
+            "complete": final is not None,
+            "progress": dict(self.progress),
+            **(final or {}),
+            "latency": self.latency.to_dict(),
+        }
+        tmp_path = self.summary_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.summary_path)
+        return payload
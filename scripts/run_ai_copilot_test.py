@@ -1,12 +1,37 @@
 
+import argparse
+import asyncio
+import itertools
 import json
+import math
 import time
-import uuid
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
 
 import requests
 
+from app_server import app_server
+from chat_stream import post_chat_stream
+from copilot_load import (
+    ENDPOINT_PATHS,
+    api_url,
+    apply_response,
+    build_payload,
+    endpoint_url,
+    new_record,
+    run_concurrent,
+    run_open_loop,
+    run_sessions,
+)
+from fpl_fixture_server import start_fixture_server
+from http_session import PooledSession
+from latency_report import format_latency_report
+from llm_stub_server import start_llm_stub
+from result_writer import ResultWriter
+from soak import SoakSampler, format_trend_report, trend_report
+from workload import generate_sessions, load_workload
+
 BASE_URL = "http://localhost:5000/api/chat"
 TEAM_ID = "7892155"
 SLEEP_SECONDS = 0.8
@@ -176,58 +201,329 @@ def build_questions():
     return questions
 
 
-def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    out_path = OUTPUT_DIR / f"run_{timestamp}.json"
-    questions = build_questions()
+def parse_duration(text):
+    units = {"s": 1, "m": 60, "h": 3600}
+    text = text.strip().lower()
+    try:
+        seconds = float(text[:-1]) * units[text[-1]] if text[-1:] in units else float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {text!r}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("duration must be positive")
+    return seconds
+
+
+def soak_questions(questions, rate, duration):
+    """Cycle the question set for ``duration`` seconds of traffic at ``rate`` requests/sec."""
+    return list(itertools.islice(itertools.cycle(questions), math.ceil(rate * duration)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the 100-prompt AI co-pilot regression against /api/chat.")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--team-id", default=TEAM_ID)
+    parser.add_argument("--mode", choices=("sequential", "concurrent", "open-loop", "workload", "soak"), default="sequential")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Workers (concurrent, default 8), connection cap (open-loop/soak, default 256) or sessions in flight (workload).",
+    )
+    parser.add_argument("--rate", type=float, default=None, help="Target requests/sec (required for open-loop and soak).")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds to ramp workers and rate up to target.")
+    parser.add_argument(
+        "--endpoints",
+        default="chat",
+        help=f"Comma-separated endpoints for open-loop/soak mode, from: {', '.join(ENDPOINT_PATHS)}.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Send chat prompts to /api/chat/stream and record time to first byte and first token.",
+    )
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="constant", help="Open-loop arrival process.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for Poisson arrivals and workload generation.")
+    parser.add_argument("--workload", default=None, help="Workload spec JSON for --mode workload (see scripts/workloads/).")
+    parser.add_argument("--repeat", type=int, default=1, help="Send the question set this many times.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    soak = parser.add_argument_group("soak mode")
+    soak.add_argument("--duration", type=parse_duration, default=None, help="Soak length, e.g. 5400, 90m or 4h.")
+    soak.add_argument("--sample-interval", type=float, default=30.0, help="Seconds between /api/debug/stats samples.")
+    soak.add_argument("--soak-warmup", type=parse_duration, default=None, help="Ignore samples before this (default: 10%% of duration, max 10m).")
+
+    output = parser.add_argument_group("result output")
+    output.add_argument("--drop-responses", action="store_true", help="Do not store full response bodies in the JSONL records.")
+    output.add_argument("--flush-every", type=int, default=10, help="Flush the JSONL file every N records.")
+    output.add_argument("--summary-every", type=int, default=100, help="Rewrite the rolling summary file every N records.")
+    offline = parser.add_argument_group("offline benchmarking")
+    offline.add_argument("--fpl-fixtures", default=None, help="Serve recorded FPL API payloads from this directory.")
+    offline.add_argument("--fpl-latency-ms", type=float, default=0.0, help="Latency injected into each FPL fixture response.")
+    offline.add_argument("--fpl-jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around --fpl-latency-ms.")
+    offline.add_argument("--llm-stub", action="store_true", help="Route every LLM provider to a local deterministic stub.")
+    offline.add_argument("--llm-ttft-ms", type=float, default=300.0, help="Stub time to first token.")
+    offline.add_argument("--llm-tokens-per-sec", type=float, default=50.0, help="Stub decode speed (0 = instant).")
+    offline.add_argument("--llm-completion-tokens", type=int, default=None, help="Force stub completions to this length.")
+    offline.add_argument("--spawn-server", action="store_true", help="Start the app server wired to the local stand-ins.")
+    offline.add_argument("--server-port", type=int, default=5055)
+    args = parser.parse_args()
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    args.chat_endpoint = "chat-stream" if args.stream else "chat"
+    if args.stream:
+        args.endpoints = ["chat-stream" if name == "chat" else name for name in args.endpoints]
+    unknown = [name for name in args.endpoints if name not in ENDPOINT_PATHS]
+    if unknown or not args.endpoints:
+        parser.error(f"Unknown endpoint(s): {', '.join(unknown) or '<none>'}")
+    if args.mode in ("open-loop", "soak") and not args.rate:
+        parser.error(f"--rate is required in {args.mode} mode")
+    if (args.mode == "soak") != (args.duration is not None):
+        parser.error("--duration and --mode soak go together")
+    if (args.mode == "workload") != bool(args.workload):
+        parser.error("--workload and --mode workload go together")
+    if args.fpl_fixtures and not args.spawn_server:
+        parser.error("--fpl-fixtures needs --spawn-server (use fpl_fixture_server.py serve for an app you start yourself)")
+    if args.llm_stub and not args.spawn_server:
+        parser.error("--llm-stub needs --spawn-server (use llm_stub_server.py for an app you start yourself)")
+    return args
+
 
-    results = []
+def run_sequential(questions, base_url, team_id, on_record, timeout, endpoint="chat"):
     summary = {"total": len(questions), "success": 0, "fail": 0}
+    session = PooledSession(pool_size=1)
+    url = endpoint_url(base_url, endpoint)
+    run_started = time.time()
 
     for idx, (category, prompt) in enumerate(questions, start=1):
-        payload = {
-            "message": prompt,
-            "teamId": TEAM_ID,
-            "sessionId": f"autotest_{uuid.uuid4().hex}",
-        }
+        record = new_record(idx, category, prompt, build_payload(prompt, team_id), endpoint=endpoint)
         started = time.time()
-        record = {
-            "index": idx,
-            "category": category,
-            "prompt": prompt,
-            "payload": payload,
-        }
         try:
-            response = requests.post(BASE_URL, json=payload, timeout=30)
-            latency_ms = round((time.time() - started) * 1000, 1)
-            record["status_code"] = response.status_code
-            record["latency_ms"] = latency_ms
-            try:
-                data = response.json()
-            except json.JSONDecodeError:
-                data = None
-            record["response_json"] = data
-            if response.ok and isinstance(data, dict) and data.get("success"):
-                summary["success"] += 1
+            if endpoint == "chat-stream":
+                status_code, data, fields = post_chat_stream(session, url, record["payload"], timeout)
+                record.update(fields)
+                apply_response(record, summary, status_code, data, status_code < 400)
             else:
-                summary["fail"] += 1
-                record["error"] = "Non-success response"
+                response = session.post(url, json=record["payload"], timeout=timeout)
+                record["latency_ms"] = round((time.time() - started) * 1000, 1)
+                record["connect_ms"] = round(response.connect_time * 1000, 1)
+                record["server_ms"] = round(response.server_time * 1000, 1)
+                try:
+                    data = response.json()
+                except json.JSONDecodeError:
+                    data = None
+                apply_response(record, summary, response.status_code, data, response.ok)
         except Exception as exc:  # pylint: disable=broad-except
             summary["fail"] += 1
             record["error"] = str(exc)
-        results.append(record)
+        on_record(record)
         time.sleep(SLEEP_SECONDS)
 
-    output_payload = {
-        "generated_at": timestamp,
-        "base_url": BASE_URL,
-        "team_id": TEAM_ID,
-        "summary": summary,
-        "results": results,
+    session.close()
+    return summary, time.time() - run_started
+
+
+def prepare_environment(args, stack, timestamp):
+    """Start any requested local stand-ins and return ``(chat_url, environment_metadata, llm_stub)``."""
+    environment = {"offline": False}
+    server_env = {}
+    llm_stub = None
+
+    if args.fpl_fixtures:
+        fixture_server = start_fixture_server(
+            args.fpl_fixtures,
+            latency_ms=args.fpl_latency_ms,
+            jitter_ms=args.fpl_jitter_ms,
+            seed=args.seed,
+            fallback_entry=args.team_id,
+        )
+        stack.callback(fixture_server.server_close)
+        stack.callback(fixture_server.shutdown)
+        server_env.update({"FPL_API_BASE_URL": fixture_server.base_url, "ODDS_PROVIDER": "mock", "STATS_PROVIDER": "mock"})
+        environment.update({
+            "offline": True,
+            "fpl_fixtures": str(args.fpl_fixtures),
+            "fpl_latency_ms": args.fpl_latency_ms,
+            "fpl_jitter_ms": args.fpl_jitter_ms,
+        })
+
+    if args.llm_stub:
+        llm_stub = start_llm_stub(
+            ttft_ms=args.llm_ttft_ms,
+            tokens_per_sec=args.llm_tokens_per_sec,
+            completion_tokens=args.llm_completion_tokens,
+        )
+        stack.callback(llm_stub.server_close)
+        stack.callback(llm_stub.shutdown)
+        server_env.update(llm_stub.app_env())
+        environment["llm_stub"] = {
+            "ttft_ms": args.llm_ttft_ms,
+            "tokens_per_sec": args.llm_tokens_per_sec,
+            "completion_tokens": args.llm_completion_tokens,
+        }
+
+    if not args.spawn_server:
+        return args.base_url, environment, llm_stub
+
+    log_path = OUTPUT_DIR / f"server_{timestamp}.log"
+    root_url = stack.enter_context(app_server(args.server_port, server_env, log_path))
+    environment.update({"spawned_server": True, "server_log": str(log_path)})
+    return endpoint_url(root_url, "chat"), environment, llm_stub
+
+
+def llm_overhead_summary(writer, stub_stats):
+    """Split the app-reported ``llmMs`` into simulated model time and our own pipeline time."""
+    overhead = writer.llm_ms_total - stub_stats["model_ms_total"]
+    return {
+        **stub_stats,
+        "responses_with_llm_ms": writer.llm_ms_count,
+        "app_llm_ms_total": round(writer.llm_ms_total, 1),
+        "pipeline_overhead_ms_total": round(overhead, 1),
+        "pipeline_overhead_ms_mean": round(overhead / writer.llm_ms_count, 1) if writer.llm_ms_count else None,
     }
-    out_path.write_text(json.dumps(output_payload, indent=2), encoding="utf-8")
-    print(f"Wrote {out_path} with summary: {summary}")
+
+
+def fetch_server_stats(base_url):
+    try:
+        response = requests.get(api_url(base_url, "/api/debug/stats"), timeout=5)
+        payload = response.json()
+    except (requests.RequestException, ValueError):
+        return None
+    return payload.get("data") if isinstance(payload, dict) and payload.get("success") else None
+
+
+def server_stats_delta(before, after):
+    """Cache hit rates and session growth between two ``/api/debug/stats`` snapshots."""
+    if not before or not after:
+        return {"before": before, "after": after}
+    cache_before, cache_after = before.get("fplApiCache", {}), after.get("fplApiCache", {})
+    hits = cache_after.get("hits", 0) - cache_before.get("hits", 0)
+    misses = cache_after.get("misses", 0) - cache_before.get("misses", 0)
+    copilot_before, copilot_after = before.get("copilot", {}), after.get("copilot", {})
+    answers_before, answers_after = before.get("responseCache", {}), after.get("responseCache", {})
+    answer_hits = answers_after.get("hits", 0) - answers_before.get("hits", 0)
+    answer_misses = answers_after.get("misses", 0) - answers_before.get("misses", 0)
+    return {
+        "before": before,
+        "after": after,
+        "fpl_cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        "response_cache_hit_rate": round(answer_hits / (answer_hits + answer_misses), 4) if answer_hits + answer_misses else None,
+        "sessions_created": copilot_after.get("created", 0) - copilot_before.get("created", 0),
+        "sessions_reused": copilot_after.get("reused", 0) - copilot_before.get("reused", 0),
+        "session_message_chars_growth": copilot_after.get("messageChars", 0) - copilot_before.get("messageChars", 0),
+    }
+
+
+def run_load(args, questions, base_url, on_record):
+    if args.mode == "workload":
+        spec = load_workload(args.workload)
+        sessions = generate_sessions(spec, questions, seed=args.seed)
+        concurrency = args.concurrency or spec["concurrent_sessions"]
+        return asyncio.run(
+            run_sessions(sessions, base_url, on_record, concurrency=concurrency, timeout=args.timeout, endpoint=args.chat_endpoint)
+        )
+    if args.mode == "concurrent":
+        return asyncio.run(
+            run_concurrent(
+                questions,
+                base_url,
+                args.team_id,
+                on_record,
+                concurrency=args.concurrency or 8,
+                rate=args.rate,
+                ramp_up=args.ramp_up,
+                timeout=args.timeout,
+                endpoint=args.chat_endpoint,
+            )
+        )
+    if args.mode in ("open-loop", "soak"):
+        return asyncio.run(
+            run_open_loop(
+                questions,
+                base_url,
+                args.team_id,
+                args.rate,
+                on_record,
+                endpoints=args.endpoints,
+                arrival=args.arrival,
+                ramp_up=args.ramp_up,
+                seed=args.seed,
+                max_connections=args.concurrency or 256,
+                timeout=args.timeout,
+            )
+        )
+    return run_sequential(questions, base_url, args.team_id, on_record, args.timeout, endpoint=args.chat_endpoint)
+
+
+def main():
+    args = parse_args()
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    if args.mode == "soak":
+        questions = soak_questions(build_questions(), args.rate, args.duration)
+    else:
+        questions = build_questions() * max(1, args.repeat)
+
+    with ExitStack() as stack:
+        base_url, environment, llm_stub = prepare_environment(args, stack, timestamp)
+        metadata = {
+            "generated_at": timestamp,
+            "base_url": base_url,
+            "team_id": args.team_id,
+            "mode": args.mode,
+            "environment": environment,
+            "config": {
+                "concurrency": args.concurrency if args.mode != "sequential" else 1,
+                "workload": args.workload,
+                "rate": args.rate,
+                "ramp_up": args.ramp_up,
+                "endpoints": args.endpoints if args.mode in ("open-loop", "soak") else [args.chat_endpoint],
+                "arrival": args.arrival if args.mode in ("open-loop", "soak") else None,
+                "duration": args.duration,
+                "sample_interval": args.sample_interval if args.mode == "soak" else None,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "timeout": args.timeout,
+            },
+        }
+        writer = stack.enter_context(
+            ResultWriter(
+                OUTPUT_DIR,
+                timestamp,
+                metadata,
+                keep_responses=not args.drop_responses,
+                flush_every=args.flush_every,
+                summary_every=args.summary_every,
+            )
+        )
+        stats_before = fetch_server_stats(base_url)
+        sampler = None
+        if args.mode == "soak":
+            sampler = SoakSampler(
+                lambda: fetch_server_stats(base_url),
+                args.sample_interval,
+                OUTPUT_DIR / f"run_{timestamp}_soak.jsonl",
+            )
+            with sampler:
+                summary, duration = run_load(args, questions, base_url, writer.write)
+            warmup = args.soak_warmup if args.soak_warmup is not None else min(600.0, args.duration * 0.1)
+            summary["soak"] = {**trend_report(sampler.samples, warmup_s=warmup), "failed_samples": sampler.failed}
+        else:
+            summary, duration = run_load(args, questions, base_url, writer.write)
+        stats_after = fetch_server_stats(base_url)
+        if llm_stub is not None:
+            summary["llm"] = llm_overhead_summary(writer, llm_stub.stats())
+
+        summary["duration_s"] = round(duration, 2)
+        summary["throughput_rps"] = round(writer.progress["written"] / duration, 2) if duration > 0 else None
+        final = writer.write_summary({"summary": summary, "server_stats": server_stats_delta(stats_before, stats_after)})
+
+    latency_text = format_latency_report(final["latency"])
+    writer.summary_path.with_name(f"run_{timestamp}_latency.txt").write_text(latency_text + "\n", encoding="utf-8")
+    print(latency_text)
+    if "soak" in summary:
+        print(format_trend_report(summary["soak"]))
+        if summary["soak"]["suspected_leaks"]:
+            print(f"WARNING: monotonic growth in {', '.join(summary['soak']['suspected_leaks'])}")
+    printable = {key: value for key, value in summary.items() if key != "soak"}
+    print(f"Wrote {writer.records_path} and {writer.summary_path} with summary: {printable}")
 
 
 if __name__ == "__main__":
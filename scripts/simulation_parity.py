@@ -0,0 +1,263 @@
+"""Parity and throughput check of the server's simulation kernels against the NumPy port.
+
+Needs ``numpy`` and ``requests``. Usage::
+
+    python scripts/simulation_parity.py --players 1,2,3 [--base-url http://localhost:5000]
+    python scripts/simulation_parity.py --skip-server --runs 100000
+
+Server parity: reads ``/api/simulation/config``, rebuilds each player's event
+model from FPL bootstrap data the way ``npm run simulation:run`` does, and
+KS-tests the distribution stored behind ``/api/simulations/player/:playerId``
+against the exact reference distribution. Rows whose ``inputHash`` differs from
+the rebuilt inputs (e.g. written by an analysis that had advanced stats or
+odds) are reported but not failed.
+
+Kernel parity and runs/sec: a reference case goes through the NumPy kernels
+and, unless ``--skip-node``, through ``scripts/bench-simulation-kernels.ts``.
+The derived event setup and gameweek plan must match exactly; sampled outputs
+are compared with two-sample KS tests. Exits with status 1 on any failure.
+"""
+
+import argparse
+import json
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from simulation_reference import (
+    bootstrap_setup,
+    empirical,
+    input_hash,
+    ks_statistic,
+    ks_test,
+    match_distribution,
+    player_plan,
+    player_setup,
+    simulate_gameweeks,
+    simulate_matches,
+)
+
+BASE_URL = "http://localhost:5000"
+FPL_BASE_URL = "https://fantasy.premierleague.com/api"
+NODE_BENCH = "npx tsx scripts/bench-simulation-kernels.ts"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def fetch_json(session, url, timeout):
+    response = session.get(url, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    payload = response.json()
+    return payload.get("data", payload) if isinstance(payload, dict) and "success" in payload else payload
+
+
+def reference_case(config, runs, seed):
+    """A nailed, rising midfielder over ``gameweeksAnalyzed`` gameweeks with one double and one blank."""
+    odds = {
+        "fixtureId": 1, "homeWin": 1.9, "draw": 3.6, "awayWin": 4.2, "btts": 1.8,
+        "over25Goals": 1.7, "under25Goals": 2.2, "homeCleanSheet": 3.1, "awayCleanSheet": 5.5,
+        "homeGoalsOver15": 1.6, "awayGoalsOver15": 2.9, "lastUpdated": "2025-01-01T00:00:00Z",
+    }
+    stats = {
+        "playerId": 1, "xG": 0.32, "xA": 0.21, "xMins": 82, "role": "nailed", "volatility": 3.2,
+        "formTrend": "rising", "fixtureAdjustedXG": 0.34, "fixtureAdjustedXA": 0.22, "lastUpdated": "2025-01-01T00:00:00Z",
+    }
+    player = {
+        "id": 1, "name": "Reference MID", "position": "MID", "team": "REF", "price": 7.5,
+        "points": 96, "teamId": 1, "advancedStats": stats,
+    }
+    gameweeks = range(1, int(config.get("gameweeksAnalyzed") or 6) + 1)
+    fixtures = []
+    for gameweek in gameweeks:
+        blank = gameweek == 4
+        for leg in range(2 if gameweek == 2 else 1):
+            fixtures.append({
+                "gameweek": gameweek, "playerId": 1, "fixtureId": gameweek * 10 + leg, "hasFixture": not blank,
+                "fdr": 1 + (gameweek + leg) % 5, "isHome": (gameweek + leg) % 2 == 0,
+                **({"odds": {**odds, "fixtureId": gameweek * 10 + leg}} if gameweek % 2 else {}),
+            })
+    return {
+        "runs": runs, "seed": seed, "player": player, "stats": stats, "odds": [odds], "fixtures": fixtures,
+        "useOdds": bool(config.get("useOdds", True)), "useAdvancedStats": bool(config.get("useAdvancedStats", True)),
+    }
+
+
+def best_of(run, repeats=3):
+    value = run()
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        value = run()
+        best = min(best, time.perf_counter() - started)
+    return value, best
+
+
+def run_python_kernels(case):
+    player, runs, seed = case["player"], case["runs"], case["seed"]
+    setup = player_setup(player["position"], player["price"], case["stats"], case["odds"])
+    gameweeks, column_start, expected, volatility = player_plan(player, case["fixtures"], case["useOdds"], case["useAdvancedStats"])
+    matches, match_seconds = best_of(lambda: simulate_matches(setup, runs, np.random.default_rng(seed)))
+    exact, exact_seconds = best_of(lambda: match_distribution(setup))
+    (totals, _), gameweek_seconds = best_of(
+        lambda: simulate_gameweeks(expected, volatility, column_start, runs, np.random.default_rng(seed))
+    )
+    return {
+        "setup": setup,
+        "plan": {"gameweeks": gameweeks, "columnStart": column_start, "expected": expected, "volatility": volatility},
+        "matches": {"samples": matches, "runsPerSec": runs / match_seconds},
+        "exact": {"distribution": exact, "seconds": exact_seconds},
+        "gameweeks": {"totals": totals, "runsPerSec": runs / gameweek_seconds},
+    }
+
+
+def run_node_kernels(command, case, timeout):
+    completed = subprocess.run(
+        shlex.split(command), input=json.dumps(case), capture_output=True, text=True, cwd=REPO_ROOT, timeout=timeout
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"node bench failed ({completed.returncode}): {completed.stderr.strip()[-500:]}")
+    return json.loads(completed.stdout)
+
+
+def kernel_checks(python, node, runs, alpha):
+    checks = []
+
+    def add(name, passed, **detail):
+        checks.append({"check": name, "passed": bool(passed), **detail})
+
+    node_events = [(e["probability"], e["points"], e.get("bonusMultiplier") or 0) for e in node["matchSetup"]["events"]]
+    add(
+        "match setup",
+        node_events == python["setup"].events
+        and node["matchSetup"]["minutesProbability"] == python["setup"].minutes_probability,
+        events=len(node_events),
+    )
+    plan = node["gameweekPlan"]
+    plan_gap = float(np.max(np.abs(np.array(plan["expected"]) - python["plan"]["expected"]), initial=0.0))
+    add(
+        "gameweek plan",
+        plan["gameweeks"] == python["plan"]["gameweeks"]
+        and plan["columnStart"] == python["plan"]["columnStart"].tolist()
+        and plan["volatility"] == python["plan"]["volatility"].tolist()
+        and plan_gap <= 1e-12,
+        max_expected_gap=plan_gap,
+    )
+    exact_gap = ks_statistic((np.array(node["exact"]["points"]), np.array(node["exact"]["probabilities"])), python["exact"]["distribution"])
+    add("exact distribution", exact_gap <= 1e-9, ks_statistic=exact_gap)
+    for name, node_samples, python_samples in (
+        ("match samples", node["matches"]["samples"], python["matches"]["samples"]),
+        ("gameweek totals", node["gameweeks"]["totals"], python["gameweeks"]["totals"]),
+    ):
+        statistic, p_value = ks_test(empirical(node_samples), empirical(python_samples), runs, runs)
+        add(name, p_value >= alpha, ks_statistic=round(statistic, 5), p_value=round(p_value, 4))
+    return checks
+
+
+def server_checks(session, args, config, runs):
+    bootstrap = fetch_json(session, f"{args.fpl_base_url.rstrip('/')}/bootstrap-static/", args.timeout)
+    elements = {element["id"]: element for element in (bootstrap or {}).get("elements", [])}
+    checks = []
+    for player_id in args.players:
+        row = fetch_json(session, f"{args.base_url.rstrip('/')}/api/simulations/player/{player_id}", args.timeout)
+        check = {"check": f"player {player_id}", "passed": True}
+        checks.append(check)
+        if row is None:
+            check["status"] = "no stored simulation"
+            continue
+        if player_id not in elements:
+            check.update(status="not in bootstrap data", passed=False)
+            continue
+
+        setup = bootstrap_setup(elements[player_id])
+        reference = match_distribution(setup)
+        check["mean_gap"] = round(row["meanPoints"] - float(reference[0] @ reference[1]), 3)
+        distribution = row.get("distribution")
+        if not distribution:
+            check["status"] = "no stored distribution (row predates input fingerprints)"
+            continue
+
+        method = distribution["method"]
+        check["inputs_match"] = row.get("inputHash") == input_hash(setup, player_id, method, row.get("runs") or runs)
+        stored = (np.array(distribution["points"], dtype=np.float64), np.array(distribution["probabilities"], dtype=np.float64))
+        statistic, p_value = ks_test(stored, reference, row.get("runs") or runs)
+        check.update(method=method, ks_statistic=round(statistic, 5), p_value=round(p_value, 4))
+        if not check["inputs_match"]:
+            check["status"] = "simulated from other inputs (stats/odds); not compared"
+            continue
+        check["passed"] = statistic <= 1e-9 if method == "exact" else p_value >= args.alpha
+        check["status"] = "ok" if check["passed"] else "distribution differs"
+    return checks
+
+
+def format_report(report):
+    lines = [f"Simulation parity ({report['runs']} runs, seed {report['seed']})", ""]
+    lines.append(f"{'kernel':24}{'python runs/s':>16}{'node runs/s':>16}{'py/node':>10}")
+    for row in report["throughput"]:
+        node = row.get("node")
+        speedup = f"{row['python'] / node:>9.1f}x" if node else f"{'-':>10}"
+        lines.append(f"{row['kernel']:24}{row['python']:>16,.0f}{(f'{node:,.0f}' if node else '-'):>16}{speedup}")
+    for title, key in (("Kernel parity", "kernel_checks"), ("Server parity", "server_checks")):
+        if not report.get(key):
+            continue
+        lines += ["", title]
+        for check in report[key]:
+            detail = ", ".join(f"{name}={value}" for name, value in check.items() if name not in ("check", "passed"))
+            lines.append(f"  [{'PASS' if check['passed'] else 'FAIL'}] {check['check']}: {detail}")
+    return "\n".join(lines)
+
+
+def parse_players(text):
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the server's simulation kernels with the NumPy reference.")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--fpl-base-url", default=FPL_BASE_URL, help="FPL API (or scripts/fpl_fixture_server.py) for bootstrap data.")
+    parser.add_argument("--players", type=parse_players, default=[], help="Comma-separated player IDs to check on the server.")
+    parser.add_argument("--runs", type=int, default=None, help="Runs per kernel (default: the server's defaultRuns x 10).")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--alpha", type=float, default=0.01, help="KS significance level.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--skip-server", action="store_true", help="Do not contact the server; use default config.")
+    parser.add_argument("--skip-node", action="store_true", help="Only benchmark the NumPy kernels.")
+    parser.add_argument("--node-command", default=NODE_BENCH)
+    parser.add_argument("--json", default=None, help="Also write the full report to this path.")
+    args = parser.parse_args(argv)
+
+    session = requests.Session()
+    config = {} if args.skip_server else fetch_json(session, f"{args.base_url.rstrip('/')}/api/simulation/config", args.timeout) or {}
+    runs = args.runs or int(config.get("defaultRuns") or 1000) * 10
+    case = reference_case(config, runs, args.seed)
+
+    python = run_python_kernels(case)
+    node = None if args.skip_node else run_node_kernels(args.node_command, case, timeout=max(120.0, args.timeout))
+    report = {"runs": runs, "seed": args.seed, "config": config, "throughput": []}
+    for kernel, key in (("match (sampled)", "matches"), ("gameweek matrix", "gameweeks")):
+        report["throughput"].append({"kernel": kernel, "python": python[key]["runsPerSec"], "node": node[key]["runsPerSec"] if node else None})
+    # The exact path has no runs, so this row counts distributions built per second
+    report["throughput"].append({
+        "kernel": "match (exact, per dist)",
+        "python": 1 / python["exact"]["seconds"],
+        "node": 1 / node["exact"]["seconds"] if node else None,
+    })
+    if node:
+        report["kernel_checks"] = kernel_checks(python, node, runs, args.alpha)
+    if args.players and not args.skip_server:
+        report["server_checks"] = server_checks(session, args, config, runs)
+
+    print(format_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    checks = report.get("kernel_checks", []) + report.get("server_checks", [])
+    return 0 if all(check["passed"] for check in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
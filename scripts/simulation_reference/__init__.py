@@ -0,0 +1,36 @@
+"""NumPy reference implementation of the server's simulation kernels.
+
+An independent oracle for ``MonteCarloEngine`` (per-match event model) and
+``SimulationEngine`` (multi-gameweek FDR/odds model), plus the KS helpers the
+parity checker in ``scripts/simulation_parity.py`` uses to compare them.
+"""
+
+from .gameweek_model import expected_gameweek_points, player_plan, simulate_gameweeks
+from .ks import empirical, ks_statistic, ks_test
+from .match_model import (
+    SIMULATION_MODEL_VERSION,
+    MatchSetup,
+    bootstrap_setup,
+    define_events,
+    input_hash,
+    match_distribution,
+    player_setup,
+    simulate_matches,
+)
+
+__all__ = [
+    "SIMULATION_MODEL_VERSION",
+    "MatchSetup",
+    "bootstrap_setup",
+    "define_events",
+    "empirical",
+    "expected_gameweek_points",
+    "input_hash",
+    "ks_statistic",
+    "ks_test",
+    "match_distribution",
+    "player_plan",
+    "player_setup",
+    "simulate_gameweeks",
+    "simulate_matches",
+]
@@ -0,0 +1,79 @@
+"""Multi-gameweek points model of ``SimulationEngine``, vectorised with NumPy.
+
+Mirrors ``getExpectedGameweekPoints`` (historical base scaled by the FDR, odds
+and advanced-stats adjustments), ``buildPlayerPlan`` (fixtures grouped into
+gameweek columns, blanks contributing nothing) and ``simulateGameweekMatrix``
+(one clipped normal draw per player-fixture per run).
+"""
+
+import numpy as np
+
+_DEFAULT_VOLATILITY = {"FWD": 4.5, "MID": 3.5, "DEF": 2.5, "GK": 2.0}
+
+
+def fdr_adjustment(fdr, is_home):
+    adjustment = 1.3 - fdr * 0.15
+    if is_home:
+        adjustment *= 1.1
+    return max(0.4, min(1.8, adjustment))
+
+
+def odds_adjustment(position, odds):
+    adjustment = 1.0
+    if position in ("GK", "DEF"):
+        adjustment *= 1 + (1 / odds["homeCleanSheet"]) * 0.3
+    if position in ("MID", "FWD"):
+        adjustment *= 1 + (1 / odds["over25Goals"]) * 0.2
+    return max(0.7, min(1.4, adjustment))
+
+
+def advanced_stats_adjustment(stats):
+    adjustment = 0.5 + 0.5 * min(1.0, stats["xMins"] / 90)
+    adjustment *= {"rising": 1.15, "declining": 0.85}.get(stats.get("formTrend"), 1.0)
+    adjustment *= {"nailed": 1.1, "benchwarmer": 0.6}.get(stats.get("role"), 1.0)
+    return max(0.4, min(1.6, adjustment))
+
+
+def expected_gameweek_points(player, fixture, use_odds=True, use_advanced_stats=True):
+    """``player`` and ``fixture`` use the server's ``ProcessedPlayer``/``GameweekFixture`` field names."""
+    points = player["points"] / 15  # season total over the engine's fixed 15-game estimate
+    points *= fdr_adjustment(fixture["fdr"], fixture["isHome"])
+    if use_odds and fixture.get("odds"):
+        points *= odds_adjustment(player["position"], fixture["odds"])
+    if use_advanced_stats and player.get("advancedStats"):
+        points *= advanced_stats_adjustment(player["advancedStats"])
+    return points
+
+
+def player_plan(player, fixtures, use_odds=True, use_advanced_stats=True):
+    """``(gameweeks, column_start, expected, volatility)`` for one player's fixtures."""
+    volatility = player.get("volatility") or _DEFAULT_VOLATILITY.get(player["position"], 3.0)
+    own = sorted((fixture for fixture in fixtures if fixture["playerId"] == player["id"]), key=lambda f: f["gameweek"])
+    gameweeks, column_start, expected = [], [], []
+    for fixture in own:
+        if not gameweeks or gameweeks[-1] != fixture["gameweek"]:
+            gameweeks.append(fixture["gameweek"])
+            column_start.append(len(expected))
+        if fixture["hasFixture"]:
+            expected.append(expected_gameweek_points(player, fixture, use_odds, use_advanced_stats))
+    column_start.append(len(expected))
+    return (
+        gameweeks,
+        np.array(column_start, dtype=np.int64),
+        np.array(expected, dtype=np.float64),
+        np.full(len(expected), volatility, dtype=np.float64),
+    )
+
+
+def sample_points(expected, volatility, normal):
+    """``samplePoints``: clip at zero and round half up to one decimal, as ``Math.round`` does."""
+    return np.maximum(0.0, np.floor((expected + normal * volatility) * 10 + 0.5) / 10)
+
+
+def simulate_gameweeks(expected, volatility, column_start, runs, rng):
+    """``(totals, samples)`` with ``samples`` shaped ``(gameweeks, runs)``."""
+    draws = sample_points(expected, volatility, rng.standard_normal((runs, len(expected))))
+    cumulative = np.concatenate((np.zeros((runs, 1)), np.cumsum(draws, axis=1)), axis=1)
+    # Column sums as differences of prefix sums, so blank (empty) gameweeks come out as zero
+    samples = (cumulative[:, column_start[1:]] - cumulative[:, column_start[:-1]]).T
+    return draws.sum(axis=1), samples
@@ -0,0 +1,48 @@
+"""Kolmogorov-Smirnov comparisons between points distributions.
+
+Distributions are ``(points, probabilities)`` pairs over a discrete support,
+which covers the exact PMFs, empirical PMFs of sampled runs and the
+``distribution`` column of ``player_simulations`` alike. P-values use the
+asymptotic Kolmogorov distribution; on discrete data the test is
+conservative, so a small p-value is a real disagreement.
+"""
+
+import math
+
+import numpy as np
+
+
+def empirical(samples):
+    points, counts = np.unique(np.round(np.asarray(samples, dtype=np.float64), 6), return_counts=True)
+    return points, counts / counts.sum()
+
+
+def ks_statistic(first, second):
+    """Largest gap between the two CDFs over their joint support."""
+    support = np.union1d(first[0], second[0])
+
+    def cdf(distribution):
+        points, probabilities = distribution
+        cumulative = np.concatenate(([0.0], np.cumsum(probabilities)))
+        return cumulative[np.searchsorted(points, support, side="right")]
+
+    return float(np.max(np.abs(cdf(first) - cdf(second))))
+
+
+def kolmogorov_pvalue(statistic, effective_n):
+    """``P(D > statistic)`` for ``effective_n`` samples (Stephens' small-sample correction)."""
+    if statistic <= 0 or effective_n <= 0:
+        return 1.0
+    root = math.sqrt(effective_n)
+    lam = (root + 0.12 + 0.11 / root) * statistic
+    if lam < 0.2:
+        return 1.0
+    total = sum((-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam) for k in range(1, 101))
+    return max(0.0, min(1.0, 2 * total))
+
+
+def ks_test(first, second, n_first, n_second=None):
+    """``(statistic, p_value)``; leave ``n_second`` as None when ``second`` is exact rather than sampled."""
+    statistic = ks_statistic(first, second)
+    effective_n = n_first if n_second is None else n_first * n_second / (n_first + n_second)
+    return statistic, kolmogorov_pvalue(statistic, effective_n)
@@ -0,0 +1,180 @@
+"""Per-match event model of ``MonteCarloEngine``, vectorised with NumPy.
+
+Mirrors ``setupPlayerSimulation``/``defineEvents`` (which events a player can
+record and how likely each is), ``simulateMatch`` (one draw per run) and
+``matchDistribution`` (the exact points distribution the engine serves by
+default). ``input_hash`` reproduces ``simulationInputHash`` so a stored
+``player_simulations`` row can be matched to the inputs rebuilt here.
+"""
+
+import hashlib
+import json
+import math
+
+import numpy as np
+
+# Keep in step with SIMULATION_MODEL_VERSION in server/services/simulationCache.ts
+SIMULATION_MODEL_VERSION = 1
+
+POSITIONS = {1: "GK", 2: "DEF", 3: "MID", 4: "FWD"}
+_POSITION_START = {"GK": 0.9, "DEF": 0.8, "MID": 0.7, "FWD": 0.75}
+_ROLE_START = {"nailed": 0.9, "rotation": 0.6, "benchwarmer": 0.2}
+
+
+class MatchSetup:
+    """Minutes probability plus parallel ``probability``/``points``/``bonus_multiplier`` event arrays."""
+
+    def __init__(self, minutes_probability, events):
+        self.minutes_probability = minutes_probability
+        self.events = [tuple(event) for event in events]
+        self.probability = np.array([event[0] for event in self.events], dtype=np.float64)
+        self.points = np.array([event[1] for event in self.events], dtype=np.float64)
+        self.bonus_multiplier = np.array([event[2] for event in self.events], dtype=np.float64)
+        # Bonus credit an event contributes when it happens (only positive multipliers count)
+        self.bonus_gain = np.where(self.bonus_multiplier > 0, self.points * self.bonus_multiplier, 0.0)
+
+    @classmethod
+    def from_dict(cls, payload):
+        """Build from the ``{minutesProbability, events: [{probability, points, bonusMultiplier}]}`` shape."""
+        return cls(
+            payload["minutesProbability"],
+            [(event["probability"], event["points"], event.get("bonusMultiplier") or 0) for event in payload["events"]],
+        )
+
+
+def starting_probability(position, price, stats=None):
+    if stats:
+        return _ROLE_START.get(stats.get("role"), 0.7)
+    price = price or 50  # the engine's ``price || 50``
+    price_factor = min(0.3, (price - 40) / 100)
+    return min(0.95, _POSITION_START.get(position, 0.7) + price_factor)
+
+
+def _clean_sheet_probability(odds, fallback):
+    home_clean_sheet = odds[0].get("homeCleanSheet") if odds else None
+    return 1 / home_clean_sheet if home_clean_sheet else fallback
+
+
+def define_events(position, stats=None, odds=None):
+    """``[(probability, points, bonus_multiplier), ...]`` in the engine's order."""
+    stats = stats or {}
+    x_goals = stats.get("xG")
+    x_assists = stats.get("xA")
+    events = [(1.0, 1, 0)]  # appearance points
+
+    if position == "GK":
+        events += [
+            (_clean_sheet_probability(odds, 0.3), 4, 1.5),
+            (0.7, 1, 0.5),
+            (0.05, 5, 2.0),
+            (0.01, 6, 3.0),
+        ]
+    elif position == "DEF":
+        events += [
+            (_clean_sheet_probability(odds, 0.35), 4, 1.2),
+            (x_goals or 0.08, 6, 2.0),
+            (x_assists or 0.12, 3, 1.5),
+            (0.02, -2, 0),
+        ]
+    elif position == "MID":
+        events += [
+            (x_goals or 0.25, 5, 1.8),
+            (x_assists or 0.35, 3, 1.5),
+            (_clean_sheet_probability(odds, 0.3) * 0.3, 1, 0.5),
+        ]
+    elif position == "FWD":
+        events += [
+            (x_goals or 0.45, 4, 2.0),
+            (x_assists or 0.20, 3, 1.5),
+            (0.03, -2, 0),
+        ]
+
+    events += [(0.15, -1, 0), (0.02, -3, 0)]  # yellow, red
+    return events
+
+
+def player_setup(position, price, stats=None, odds=None):
+    return MatchSetup(starting_probability(position, price, stats), define_events(position, stats, odds))
+
+
+def bootstrap_setup(element):
+    """Setup for a bootstrap-static element as ``scripts/run-simulations.ts`` builds it (no stats or odds)."""
+    return player_setup(POSITIONS.get(element["element_type"], "FWD"), element["now_cost"] / 10)
+
+
+def _bonus_points(total, bonus, uniforms):
+    bonus_probability = np.minimum(0.4, bonus / 15)
+    tier = np.where(bonus > 10, 3, np.where(bonus > 6, 2, 1))
+    return total + np.where(uniforms < bonus_probability, tier, 0)
+
+
+def simulate_matches(setup, runs, rng):
+    """Points for ``runs`` independent matches; one uniform matrix replaces the engine's per-event draws."""
+    plays = rng.random(runs) <= setup.minutes_probability
+    hits = rng.random((runs, len(setup.events))) < setup.probability
+    total = hits @ setup.points
+    bonus = hits @ setup.bonus_gain
+    points = _bonus_points(total, bonus, rng.random(runs))
+    return np.where(plays, np.maximum(0.0, points), 0.0)
+
+
+def match_distribution(setup):
+    """Exact ``(points, probabilities)`` by enumerating every event outcome (2^events rows)."""
+    count = len(setup.events)
+    outcomes = (np.arange(1 << count)[:, None] >> np.arange(count)) & 1
+    hit = np.clip(setup.probability, 0.0, 1.0)
+    weight = np.where(outcomes == 1, hit, 1 - hit).prod(axis=1)
+    total = outcomes @ setup.points
+    bonus = outcomes @ setup.bonus_gain
+
+    plays = min(1.0, max(0.0, setup.minutes_probability))
+    bonus_probability = np.minimum(0.4, bonus / 15)
+    tier = np.where(bonus > 10, 3, np.where(bonus > 6, 2, 1))
+    values = np.concatenate(([0.0], np.maximum(0.0, total + tier), np.maximum(0.0, total)))
+    masses = np.concatenate((
+        [1 - plays],
+        plays * weight * np.maximum(0.0, bonus_probability),
+        plays * weight * (1 - np.maximum(0.0, bonus_probability)),
+    ))
+    support, inverse = np.unique(values, return_inverse=True)
+    probabilities = np.bincount(inverse, weights=masses, minlength=len(support))
+    keep = probabilities > 0
+    return support[keep], probabilities[keep]
+
+
+def _js_number(value):
+    """Format a number the way ``JSON.stringify`` does."""
+    value = float(value)
+    if value == 0:
+        return "0"
+    if 1e-6 <= abs(value) < 1e21:
+        return np.format_float_positional(value, unique=True, trim="-")
+    return np.format_float_scientific(value, unique=True, trim="-", exp_digits=1)
+
+
+def _js_json(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return _js_number(value) if math.isfinite(value) else "null"
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_js_json(item) for item in value) + "]"
+    return "{" + ",".join(f"{json.dumps(key)}:{_js_json(item)}" for key, item in value.items()) + "}"
+
+
+def input_hash(setup, player_id, method="exact", runs=1000, seed=None):
+    """``simulationInputHash`` for ``setup``; equal hashes mean the server simulated the same inputs."""
+    sampled = method == "sampled"
+    payload = {
+        "version": SIMULATION_MODEL_VERSION,
+        "method": method,
+        "runs": runs if sampled else None,
+        "seed": [seed, player_id] if sampled and seed is not None else None,
+        "minutesProbability": setup.minutes_probability,
+        "events": [list(event) for event in setup.events],
+    }
+    return hashlib.sha256(_js_json(payload).encode("utf-8")).hexdigest()
@@ -0,0 +1,134 @@
+"""Server resource sampling and leak detection for long soak runs.
+
+While the runner drives fixed-rate traffic, :class:`SoakSampler` polls
+``GET /api/debug/stats`` on a background thread and appends one flattened
+sample per interval to ``run_<ts>_soak.jsonl``. :func:`trend_report` then runs
+a Mann-Kendall trend test over each series (RSS, heap, cache and session
+sizes, event-loop lag) after a warm-up window and flags series that keep
+growing - the signature of the slow leak that forces periodic restarts.
+"""
+
+import json
+import math
+import statistics
+import threading
+import time
+
+# (sample key, path into the /api/debug/stats payload)
+SERIES = (
+    ("rss_bytes", ("process", "rssBytes")),
+    ("heap_used_bytes", ("process", "heapUsedBytes")),
+    ("external_bytes", ("process", "externalBytes")),
+    ("event_loop_lag_p99_ms", ("process", "eventLoopLag", "p99Ms")),
+    ("event_loop_lag_max_ms", ("process", "eventLoopLag", "maxMs")),
+    ("copilot_sessions", ("copilot", "activeSessions")),
+    ("copilot_message_chars", ("copilot", "messageChars")),
+    ("fpl_api_cache_entries", ("fplApiCache", "entries")),
+    ("rival_analysis_cache_entries", ("rivalAnalysisCache", "entries")),
+    ("historical_data_cache_entries", ("historicalDataCache", "entries")),
+)
+
+
+def flatten_stats(stats):
+    sample = {}
+    for key, path in SERIES:
+        value = stats
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        if isinstance(value, (int, float)):
+            sample[key] = value
+    return sample
+
+
+class SoakSampler:
+    """Poll ``fetch()`` every ``interval_s`` seconds until :meth:`stop` is called."""
+
+    def __init__(self, fetch, interval_s, out_path):
+        self.fetch = fetch
+        self.interval_s = interval_s
+        self.out_path = out_path
+        self.samples = []
+        self.failed = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="soak-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        started = time.time()
+        with open(self.out_path, "w", encoding="utf-8") as handle:
+            while True:
+                stats = self.fetch()
+                if stats is None:
+                    self.failed += 1
+                else:
+                    sample = {"elapsed_s": round(time.time() - started, 1), **flatten_stats(stats)}
+                    self.samples.append(sample)
+                    handle.write(json.dumps(sample) + "\n")
+                    handle.flush()
+                if self._stop.wait(self.interval_s):
+                    break
+
+
+def mann_kendall(values):
+    """Return ``(tau, z)`` for the Mann-Kendall test; positive ``z`` means an upward trend."""
+    n = len(values)
+    if n < 3:
+        return 0.0, 0.0
+    s = 0
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            diff = values[j] - values[i]
+            s += (diff > 0) - (diff < 0)
+    variance = n * (n - 1) * (2 * n + 5) / 18.0
+    z = (s - math.copysign(1, s)) / math.sqrt(variance) if s else 0.0
+    return s / (n * (n - 1) / 2.0), z
+
+
+def trend_report(samples, warmup_s=0.0, z_threshold=2.33, min_growth=0.05):
+    """Per-series trend after ``warmup_s``; ``growing`` needs a significant trend and ``min_growth`` relative rise."""
+    window = [sample for sample in samples if sample["elapsed_s"] >= warmup_s]
+    report = {"samples": len(window), "warmup_s": warmup_s, "series": {}, "suspected_leaks": []}
+    for key, _ in SERIES:
+        values = [sample[key] for sample in window if key in sample]
+        if len(values) < 8:
+            continue
+        quarter = max(1, len(values) // 4)
+        start, end = statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+        tau, z = mann_kendall(values)
+        growth = (end - start) / start if start else (math.inf if end > 0 else 0.0)
+        growing = z >= z_threshold and growth >= min_growth
+        report["series"][key] = {
+            "start": start,
+            "end": end,
+            "max": max(values),
+            "relative_growth": round(growth, 4) if math.isfinite(growth) else None,
+            "kendall_tau": round(tau, 3),
+            "z": round(z, 2),
+            "growing": growing,
+        }
+        if growing:
+            report["suspected_leaks"].append(key)
+    return report
+
+
+def format_trend_report(report):
+    lines = [f"Soak trends ({report['samples']} samples after {report['warmup_s']:.0f}s warm-up)"]
+    lines.append(f"{'series':32} {'start':>14} {'end':>14} {'growth':>8} {'tau':>6} {'z':>7}")
+    for key, row in report["series"].items():
+        growth = f"{row['relative_growth'] * 100:.1f}%" if row["relative_growth"] is not None else "new"
+        flag = "  <-- growing" if row["growing"] else ""
+        lines.append(f"{key:32} {row['start']:>14.1f} {row['end']:>14.1f} {growth:>8} {row['kendall_tau']:>6.2f} {row['z']:>7.2f}{flag}")
+    if not report["series"]:
+        lines.append("(not enough samples)")
+    return "\n".join(lines)
@@ -4,16 +4,20 @@ Comprehensive test script to verify AI copilot fixes
 Tests for hallucination prevention, currency formatting, and data accuracy
 """
 
-import requests
+import argparse
 import json
 import time
 from typing import Dict, List, Any
 
+from http_session import PooledSession
+from latency_report import build_latency_report, format_latency_report
+
 class AICopilotTester:
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(self, base_url: str = "http://localhost:5000", pool_size: int = 10):
         self.base_url = base_url
         self.team_id = "7892155"
         self.session_id = "test_session_123"
+        self.http = PooledSession(pool_size=pool_size)
 
     def test_chat_endpoint(self, message: str) -> Dict[str, Any]:
         """Test the chat endpoint with a specific message"""
@@ -26,17 +30,22 @@ class AICopilotTester:
 
         start_time = time.time()
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.http.post(url, json=payload, timeout=30)
             end_time = time.time()
+            timings = {
+                "response_time": end_time - start_time,
+                "connect_time": response.connect_time,
+                "server_time": response.server_time
+            }
 
             if response.status_code == 200:
                 data = response.json()
-                data['response_time'] = end_time - start_time
+                data.update(timings)
                 return data
             else:
                 return {
                     "error": f"HTTP {response.status_code}",
-                    "response_time": end_time - start_time
+                    **timings
                 }
         except Exception as e:
             return {
@@ -89,6 +98,7 @@ class AICopilotTester:
             "response_times": [],
             "test_details": []
         }
+        latency_samples = []
 
         for i, test_case in enumerate(test_cases, 1):
             print(f"\n📝 Test {i}: {test_case['name']}")
@@ -131,7 +141,12 @@ class AICopilotTester:
                 # Check response time
                 response_time = result.get('response_time', 0)
                 results['response_times'].append(response_time)
-                print(f"Response time: {response_time:.2f}s")
+                latency_samples.append({
+                    "category": test_case['name'],
+                    "response_json": result,
+                    "latency_ms": result.get('server_time', response_time) * 1000
+                })
+                print(f"Response time: {response_time:.2f}s (connect {result.get('connect_time', 0) * 1000:.1f}ms)")
 
                 if response_time > 15:
                     issues.append(f"Slow response time: {response_time:.2f}s")
@@ -154,6 +169,7 @@ class AICopilotTester:
             results['avg_response_time'] = sum(results['response_times']) / len(results['response_times'])
             results['max_response_time'] = max(results['response_times'])
             results['min_response_time'] = min(results['response_times'])
+        results['latency'] = build_latency_report(latency_samples)
 
         print("\n📊 Test Results Summary:")
         print(f"Total tests: {results['total_tests']}")
@@ -165,11 +181,18 @@ class AICopilotTester:
             print(f"Average response time: {results['avg_response_time']:.2f}s")
             print(f"Fastest response: {results['min_response_time']:.2f}s")
             print(f"Slowest response: {results['max_response_time']:.2f}s")
+            print()
+            print(format_latency_report(results['latency']))
 
         return results
 
 def main():
-    tester = AICopilotTester()
+    parser = argparse.ArgumentParser(description="Verify AI copilot fixes against a running server.")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--pool-size", type=int, default=10, help="Keep-alive connections to hold open.")
+    args = parser.parse_args()
+
+    tester = AICopilotTester(args.base_url, pool_size=args.pool_size)
     results = tester.run_comprehensive_test()
 
     # Save results to file
@@ -0,0 +1,94 @@
+"""Workload specs for multi-team, multi-turn co-pilot replays.
+
+A spec (see ``scripts/workloads/*.json``) describes a population of managers
+and how they talk to the co-pilot:
+
+* ``sessions`` / ``concurrent_sessions`` - how many conversations, and how many run at once
+* ``teams`` - explicit ``ids`` plus an optional ``synthetic`` block of sequential IDs,
+  picked uniformly or Zipf-weighted when ``skew`` is set
+* ``session_reuse`` - probability that a conversation resumes an earlier ``sessionId``;
+  the replay runs it after the conversation it resumes, never alongside it
+* ``turns`` - ``{turn_count: weight}`` distribution of conversation lengths
+* ``think_time_s`` - uniform pause between turns of one conversation
+* ``intent_mix`` - ``{category: weight}`` over the ``build_questions()`` categories
+
+Generation is seeded, so a spec always expands to the same sessions.
+"""
+
+import json
+import random
+from pathlib import Path
+
+DEFAULTS = {
+    "sessions": 50,
+    "concurrent_sessions": 8,
+    "teams": {"ids": ["7892155"]},
+    "session_reuse": 0.0,
+    "turns": {"3": 1.0},
+    "think_time_s": {"min": 0.0, "max": 0.0},
+    "intent_mix": {},
+}
+
+
+def load_workload(path):
+    spec = {**DEFAULTS, **json.loads(Path(path).read_text(encoding="utf-8"))}
+    spec.setdefault("name", Path(path).stem)
+    if not 0.0 <= float(spec["session_reuse"]) <= 1.0:
+        raise ValueError("session_reuse must be between 0 and 1")
+    if not spec["turns"]:
+        raise ValueError("turns distribution must not be empty")
+    return spec
+
+
+def team_population(spec):
+    teams = spec.get("teams") or {}
+    ids = [str(team_id) for team_id in teams.get("ids", [])]
+    synthetic = teams.get("synthetic")
+    if synthetic:
+        start = int(synthetic.get("start", 1))
+        ids.extend(str(start + offset) for offset in range(int(synthetic["count"])))
+    if not ids:
+        raise ValueError("workload defines no team IDs")
+    return ids
+
+
+def _weighted(rng, weights):
+    keys = list(weights)
+    return rng.choices(keys, weights=[float(weights[key]) for key in keys], k=1)[0]
+
+
+def generate_sessions(spec, questions, seed=None):
+    """Expand ``spec`` into ``[{session_id, team_id, returning, turns: [...]}, ...]``."""
+    rng = random.Random(spec.get("seed") if seed is None else seed)
+    teams = team_population(spec)
+    skew = (spec.get("teams") or {}).get("skew")
+    team_weights = [1.0 / (rank ** float(skew)) for rank in range(1, len(teams) + 1)] if skew else None
+
+    by_category = {}
+    for category, prompt in questions:
+        by_category.setdefault(category, []).append(prompt)
+    mix = {category: weight for category, weight in (spec.get("intent_mix") or {}).items() if category in by_category}
+    if not mix:
+        mix = {category: 1.0 for category in by_category}
+
+    think = spec.get("think_time_s") or {}
+    think_min, think_max = float(think.get("min", 0.0)), float(think.get("max", 0.0))
+    sessions = []
+    for index in range(int(spec["sessions"])):
+        if sessions and rng.random() < float(spec["session_reuse"]):
+            previous = rng.choice(sessions)
+            session_id, team_id, returning = previous["session_id"], previous["team_id"], True
+        else:
+            team_id = rng.choices(teams, weights=team_weights, k=1)[0]
+            session_id = f"workload_{spec['name']}_{index:06d}"
+            returning = False
+        turns = []
+        for _ in range(int(_weighted(rng, spec["turns"]))):
+            category = _weighted(rng, mix)
+            turns.append({
+                "category": category,
+                "prompt": rng.choice(by_category[category]),
+                "think_time_s": round(rng.uniform(think_min, think_max), 3),
+            })
+        sessions.append({"session_id": session_id, "team_id": team_id, "returning": returning, "turns": turns})
+    return sessions
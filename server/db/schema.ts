@@ -4,7 +4,8 @@ import type {
   FPLPlayer,
   FPLTeam,
   PlayerAdvanced,
-  StrategyPolicyPayload
+  StrategyPolicyPayload,
+  SimulatedDistribution
 } from "@shared/schema";
 
 export type ProviderHealthStatus =
@@ -97,6 +98,8 @@ export const playerSimulations = pgTable("player_simulations", {
   ceilingProbability: doublePrecision("ceiling_probability").notNull(),
   captainEv: doublePrecision("captain_ev").notNull(),
   coefficientOfVariation: doublePrecision("coefficient_variation"),
+  inputHash: text("input_hash"),
+  distribution: jsonb("distribution").$type<SimulatedDistribution>(),
 });
 
 export const analysisCache = pgTable("analysis_cache", {
@@ -18,7 +18,15 @@ import { ProviderStatusService } from "./services/providerStatusService";
 import { StrategyModelRegistry } from "./services/strategyModelRegistry";
 import { EffectiveOwnershipEngine } from "./services/effectiveOwnershipEngine";
 import { MonteCarloEngine } from "./services/monteCarloEngine";
+import { SimulationQueueFullError, SimulationWorkerPool } from "./services/simulationWorkerPool";
+import { FPLApiService } from "./services/fplApi";
+import { RivalAnalysisService } from "./services/rivalAnalysisService";
+import { HistoricalDataService } from "./services/historicalDataService";
+import { getLruCacheStats } from "./services/lruCache";
 import { DataRepository } from "./services/repositories/dataRepository";
+import { processMetrics } from "./telemetry/processMetrics";
+import { RequestDeadline } from "./services/requestDeadline";
+import { ResponseCache } from "./services/responseCache";
 
 const analysisEngine = new AnalysisEngine();
 const transferEngine = new TransferEngine();
@@ -28,6 +36,15 @@ const strategyRegistry = StrategyModelRegistry.getInstance();
 const effectiveOwnershipEngine = EffectiveOwnershipEngine.getInstance();
 const repository = DataRepository.getInstance();
 
+// Total budget for one /api/chat request, shared by every upstream LLM call it makes
+const CHAT_DEADLINE_MS = parseInt(process.env.CHAT_DEADLINE_MS || '30000', 10);
+
+// Internal counters are served outside production only, unless ENABLE_DEBUG_STATS=true opts in
+const DEBUG_STATS_ENABLED = process.env.NODE_ENV !== 'production' || process.env.ENABLE_DEBUG_STATS === 'true';
+
+// Retry-After sent with a 503 when the simulation queue stays full past SIMULATION_QUEUE_WAIT_MS
+const SIMULATION_RETRY_AFTER_SECONDS = 5;
+
 const STRATEGY_STATUSES: StrategyModelSummary['status'][] = ['active', 'staging', 'archived'];
 
 function parseStrategyStatus(input: unknown): StrategyModelSummary['status'][] | undefined {
@@ -42,6 +59,8 @@ function parseStrategyStatus(input: unknown): StrategyModelSummary['status'][] |
 
 
 export async function registerRoutes(app: Express): Promise<Server> {
+  processMetrics.start();
+
   // Health check route
   app.get("/api/health", (req, res) => {
     res.json({ status: "ok", timestamp: new Date().toISOString() });
@@ -117,6 +136,11 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.json(response);
       }
 
+      if (error instanceof SimulationQueueFullError) {
+        res.setHeader('Retry-After', String(SIMULATION_RETRY_AFTER_SECONDS));
+        return res.status(503).json({ success: false, error: 'Simulations are busy. Please try again shortly.' });
+      }
+
       const errorResponse: AnalyzeTeamResponse = {
         success: false,
         error: errorMessage
@@ -188,6 +212,32 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Session and cache counters for load testing (scripts/run_ai_copilot_test.py)
+  if (DEBUG_STATS_ENABLED) {
+    app.get("/api/debug/stats", (_req, res) => {
+      try {
+        res.json({
+          success: true,
+          data: {
+            copilot: aiCopilotService.getSessionStats(),
+            fplApiCache: FPLApiService.getInstance().getCacheStats(),
+            rivalAnalysisCache: RivalAnalysisService.getInstance().getCacheStats(),
+            historicalDataCache: HistoricalDataService.getInstance().getCacheStats(),
+            simulationPool: SimulationWorkerPool.getInstance().getStats(),
+            simulationCache: MonteCarloEngine.getInstance().getCacheStats(),
+            responseCache: ResponseCache.getInstance().getStats(),
+            caches: getLruCacheStats(),
+            process: processMetrics.snapshot(),
+            generatedAt: new Date().toISOString()
+          }
+        });
+      } catch (error) {
+        console.error('Debug stats error:', error);
+        res.status(500).json({ success: false, error: 'Failed to collect debug stats' });
+      }
+    });
+  }
+
   // Clear cache route (for development/testing)
   app.post("/api/cache/clear", async (req, res) => {
     try {
@@ -203,6 +253,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
       apiService.clearCache();
       odds.clearCache();
       stats.clearCache();
+      ResponseCache.getInstance().invalidate('cache cleared');
       
       res.json({ success: true, message: 'All caches cleared successfully' });
     } catch (error) {
@@ -462,6 +513,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
       });
     } catch (error) {
       console.error('Scenario analysis error:', error);
+      if (error instanceof SimulationQueueFullError) {
+        res.setHeader('Retry-After', String(SIMULATION_RETRY_AFTER_SECONDS));
+        return res.status(503).json({ success: false, error: 'Simulations are busy. Please try again shortly.' });
+      }
       res.status(500).json({
         success: false,
         error: 'Failed to generate scenario analysis'
@@ -554,14 +609,25 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
       console.log(`🎯 [CHAT ENDPOINT] Processing chat message for session ${sessionId}...`);
 
-      // Process the chat message
-      const response = await aiCopilotService.processChatMessage(
-        validatedData.message,
-        sessionId,
-        validatedData.teamId,
-        validatedData.userId,
-        requestId
-      );
+      // Process the chat message; LLM calls are aborted once the budget runs out or the client disconnects
+      const deadline = new RequestDeadline(CHAT_DEADLINE_MS);
+      res.on('close', () => {
+        if (!res.writableFinished) deadline.abort();
+      });
+
+      let response: AICopilotResponse;
+      try {
+        response = await aiCopilotService.processChatMessage(
+          validatedData.message,
+          sessionId,
+          validatedData.teamId,
+          validatedData.userId,
+          requestId,
+          { signal: deadline.signal }
+        );
+      } finally {
+        deadline.dispose();
+      }
 
       console.log(`✅ [CHAT ENDPOINT] Chat response generated (${response.conversationContext.responseTime}ms)`);
 
@@ -594,6 +660,61 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Server-sent events variant of /api/chat. Sends `meta` straight away, a `token` event for each chunk
+  // of the final answer as it arrives, then `done` with the full response or `error`. Tokens come only
+  // from the call that produces the final answer, so they spell out `done`'s message; static fallbacks
+  // stream no tokens.
+  app.post("/api/chat/stream", async (req, res) => {
+    const parsed = chatRequestSchema.safeParse(req.body);
+    if (!parsed.success) {
+      return res.status(400).json({
+        success: false,
+        error: 'Invalid chat message format.'
+      });
+    }
+    const validatedData = parsed.data;
+    const sessionId = validatedData.sessionId || `session_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+    const requestId = `req_${Date.now()}_${Math.random().toString(36).substr(2, 6)}`;
+
+    res.status(200);
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache, no-transform');
+    res.setHeader('Connection', 'keep-alive');
+    res.setHeader('X-Accel-Buffering', 'no'); // stop reverse proxies from buffering the stream
+    res.flushHeaders();
+
+    const send = (event: string, data: unknown) => {
+      if (!res.writableEnded) {
+        res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+      }
+    };
+    send('meta', { sessionId, requestId });
+
+    const deadline = new RequestDeadline(CHAT_DEADLINE_MS);
+    res.on('close', () => {
+      if (!res.writableFinished) deadline.abort();
+    });
+
+    try {
+      const response = await aiCopilotService.processChatMessage(
+        validatedData.message,
+        sessionId,
+        validatedData.teamId,
+        validatedData.userId,
+        requestId,
+        { signal: deadline.signal, onToken: text => send('token', { text }) }
+      );
+      console.log(`✅ [CHAT STREAM] Chat response streamed (${response.conversationContext.responseTime}ms)`);
+      send('done', { ...response, sessionId, requestId });
+    } catch (error) {
+      console.error('❌ [CHAT STREAM] Chat processing error:', error);
+      send('error', { error: error instanceof Error ? error.message : 'Failed to process chat message' });
+    } finally {
+      deadline.dispose();
+      res.end();
+    }
+  });
+
   const httpServer = createServer(app);
   return httpServer;
 }
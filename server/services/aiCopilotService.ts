@@ -12,7 +12,9 @@ import { TransferEngine } from './transferEngine';
 import { CompetitiveIntelligenceEngine } from './competitiveIntelligenceEngine';
 import { GoogleAIService } from './googleAIService';
 import { OllamaService } from './ollamaService';
-import { BaseAIService } from './baseAIService';
+import { BaseAIService, type AICallOptions } from './baseAIService';
+import { DeadlineExceededError } from './requestDeadline';
+import { ResponseCache } from './responseCache';
 
 // Adapter to make GoogleAIService compatible with BaseAIService
 class GoogleAIServiceAdapter implements BaseAIService {
@@ -22,7 +24,7 @@ class GoogleAIServiceAdapter implements BaseAIService {
     this.googleService = GoogleAIService.getInstance();
   }
 
-  async generateCompletion(prompt: string | Array<{ role: string; content: string }>, options?: { temperature?: number; maxTokens?: number }): Promise<string> {
+  async generateCompletion(prompt: string | Array<{ role: string; content: string }>, options?: { temperature?: number; maxTokens?: number } & AICallOptions): Promise<string> {
     if (typeof prompt === 'string') {
       return this.googleService.generateCompletion([{ role: 'user', content: prompt }], options);
     } else {
@@ -30,8 +32,8 @@ class GoogleAIServiceAdapter implements BaseAIService {
     }
   }
 
-  async generateFPLResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>): Promise<string> {
-    return this.googleService.generateFPLResponse(userQuery, fplContext, conversationHistory);
+  async generateFPLResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>, options?: AICallOptions): Promise<string> {
+    return this.googleService.generateFPLResponse(userQuery, fplContext, conversationHistory, options);
   }
 
   async isHealthy(): Promise<boolean> {
@@ -42,7 +44,7 @@ class GoogleAIServiceAdapter implements BaseAIService {
     return this.googleService.isConfigured();
   }
 
-  async generateCompletionSafe(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }> }): Promise<string> {
+  async generateCompletionSafe(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }> } & AICallOptions): Promise<string> {
     return this.googleService.generateCompletionSafe(messages, options);
   }
 
@@ -76,7 +78,9 @@ export class AICopilotService {
   private competitiveEngine: CompetitiveIntelligenceEngine;
   private llmService!: BaseAIService;
   private transferEngine: TransferEngine;
+  private responseCache: ResponseCache;
   private sessions = new Map<string, ConversationSession>();
+  private sessionCounters = { created: 0, reused: 0, expired: 0 };
   private readonly SESSION_TIMEOUT = 30 * 60 * 1000; // 30 minutes
 
   private constructor() {
@@ -89,6 +93,7 @@ export class AICopilotService {
     this.initializeAIService();
 
     this.transferEngine = new TransferEngine();
+    this.responseCache = ResponseCache.getInstance();
 
     // Clean up expired sessions periodically
     setInterval(() => this.cleanupExpiredSessions(), 5 * 60 * 1000); // Every 5 minutes
@@ -130,7 +135,8 @@ export class AICopilotService {
     sessionId: string,
     teamId?: string,
     userId?: string,
-    requestId?: string
+    requestId?: string,
+    options: AICallOptions = {}
   ): Promise<AICopilotResponse> {
     const startTime = Date.now();
     console.log('🔍 [AI COPILOT] Processing chat message:', {
@@ -230,7 +236,7 @@ export class AICopilotService {
       
       // Generate response based on intent
       const llmStart = Date.now();
-      const response = await this.generateResponse(intent, context);
+      const response = await this.generateResponse(intent, context, options);
       const llmMs = Date.now() - llmStart;
       
       // Add assistant response to conversation history
@@ -258,7 +264,8 @@ export class AICopilotService {
             modelVersion: 'ai-copilot-v3.0',
             requestId,
             nlpMs,
-            llmMs
+            llmMs,
+            ...(response.conversationContext.cacheHit ? { cacheHit: true } : {})
           }
         };
       
@@ -296,24 +303,40 @@ export class AICopilotService {
   /**
    * Generate intelligent response based on query intent
    */
-  private async generateResponse(intent: QueryIntent, context: ConversationContext): Promise<AICopilotResponse> {
+  private async generateResponse(intent: QueryIntent, context: ConversationContext, options: AICallOptions = {}): Promise<AICopilotResponse> {
     console.log('🎯 [AI COPILOT] Generating response for intent:', {
       intentType: intent.type,
       hasTeamId: !!context.teamId,
       llmConfigured: this.llmService.isConfigured()
     });
 
+    // Repeated questions about the same team and data snapshot skip the LLM entirely
+    const cacheVersion = this.responseCache.version;
+    const cached = this.responseCache.get(intent, context.teamId);
+    if (cached) {
+      console.log('⚡ [AI COPILOT] Answering from response cache:', { intentType: intent.type, teamId: context.teamId });
+      options.onToken?.(cached.message);
+      return { ...cached, conversationContext: { ...cached.conversationContext, cacheHit: true } };
+    }
+
     // Try to generate LLM-enhanced response first
-    if (this.llmService.isConfigured()) {
+    if (options.signal?.aborted) {
+      console.log('⏱️ [AI COPILOT] Request deadline already passed, using static responses');
+    } else if (this.llmService.isConfigured()) {
       console.log('🤖 [AI COPILOT] Attempting LLM-enhanced response generation');
       try {
-        const llmResponse = await this.generateLLMEnhancedResponse(intent, context);
+        const llmResponse = await this.generateLLMEnhancedResponse(intent, context, options);
         console.log('✅ [AI COPILOT] LLM response generated successfully:', {
           messageLength: llmResponse.message.length,
           insightsCount: llmResponse.insights.length,
           suggestionsCount: llmResponse.suggestions.length,
           analysisPerformed: !!llmResponse.analysisPerformed
         });
+        // Only complete answers are reused: data-request and error replies carry no analysis, and a
+        // deadline-cut answer skipped its validation rewrites
+        if (llmResponse.analysisPerformed && !options.signal?.aborted) {
+          void this.responseCache.set(intent, context.teamId, llmResponse, cacheVersion);
+        }
         return llmResponse;
       } catch (error) {
         console.error('❌ [AI COPILOT] LLM generation failed, falling back to static responses:', error);
@@ -350,7 +373,13 @@ export class AICopilotService {
   /**
    * Generate LLM-enhanced response with live FPL data (RAG Architecture)
    */
-  private async generateLLMEnhancedResponse(intent: QueryIntent, context: ConversationContext): Promise<AICopilotResponse> {
+  private async generateLLMEnhancedResponse(intent: QueryIntent, context: ConversationContext, options: AICallOptions = {}): Promise<AICopilotResponse> {
+    const { signal, onToken } = options;
+    // Each LLM step checks the deadline first; once it has passed, the static handlers answer instead
+    const ensureWithinDeadline = () => {
+      if (signal?.aborted) throw signal.reason ?? new DeadlineExceededError();
+    };
+
     console.log('🔄 [AI COPILOT] Starting LLM-enhanced response generation:', {
       intentType: intent.type,
       hasTeamId: !!context.teamId,
@@ -497,13 +526,16 @@ export class AICopilotService {
     console.log('🏗️ [AI COPILOT] Attempting structured LLM response generation');
     let structured: any = null;
     let structuredTime = 0;
+    // A structured (JSON) answer cannot be streamed, so streaming requests go straight to the free-form path
     // @ts-ignore - Optional method may not exist
-    if (llmService.generateFPLStructuredResponse) {
+    if (llmService.generateFPLStructuredResponse && !onToken) {
+      ensureWithinDeadline();
       const structuredStart = Date.now();
       structured = await llmService.generateFPLStructuredResponse(
         currentQuery,
         { intent: intent.type, entities: intent.entities, squadData, analysisData, recommendations, liveFPLData },
-        conversationHistory
+        conversationHistory,
+        { signal }
       );
       structuredTime = Date.now() - structuredStart;
       console.log('📋 [AI COPILOT] Structured response result:', {
@@ -522,6 +554,14 @@ export class AICopilotService {
     // Build allowed validation sets
     const allowedNames: string[] = (liveFPLData?.players || []).map((p: any) => (p.name as string)).filter(Boolean);
     const allowedNameSet = new Set(allowedNames.map(n => n.toLowerCase()));
+    // Tokens stream only from the call that produces the final answer; when the player rewrites run, the
+    // free-form draft is not streamed, so clients never show names the rewrites would remove
+    const rewritesAnswer = allowedNames.length > 0;
+    let streamed = false;
+    const streamToken = onToken && ((token: string) => {
+      streamed = true;
+      onToken(token);
+    });
     const allowedFixturesSet = new Set<string>();
     try {
       for (const gw of (analysisData?.gameweeks || [])) {
@@ -566,11 +606,13 @@ export class AICopilotService {
     } else {
       console.log('🔄 [AI COPILOT] Structured failed, using free-form fallback');
       // Fallback to free-form with sanitizer + rewrite enforcement
+      ensureWithinDeadline();
       const freeformStart = Date.now();
       let llmResponse = await this.llmService!.generateFPLResponse(
         currentQuery,
         { intent: intent.type, entities: intent.entities, squadData, analysisData, recommendations, liveFPLData },
-        conversationHistory
+        conversationHistory,
+        { signal, onToken: rewritesAnswer ? undefined : streamToken }
       );
       const freeformTime = Date.now() - freeformStart;
 
@@ -580,14 +622,14 @@ export class AICopilotService {
       });
 
       try {
-        if (allowedNames.length > 0) {
+        if (allowedNames.length > 0 && !signal?.aborted) {
           console.log('🔧 [AI COPILOT] Applying player reference sanitization');
           const rewriteSystem = `Rewrite the following answer so that it ONLY mentions players from this allowed list: ${allowedNames.join(', ')}.\nIf a player not on the list is referenced, change it to a generic role (e.g., 'your starting forward'). Keep under 200 words. Do not add new players.`;
           // @ts-ignore - Optional method may not exist
           const rewritten = await this.llmService!.generateCompletionSafe([
             { role: 'system', content: rewriteSystem },
             { role: 'user', content: llmResponse }
-          ], { maxTokens: 600, timeoutMs: 10000 });
+          ], { maxTokens: 600, timeoutMs: 10000, signal });
           if (rewritten && rewritten.trim().length > 0) {
             console.log('✅ [AI COPILOT] Player sanitization applied:', {
               originalLength: llmResponse.length,
@@ -607,14 +649,14 @@ export class AICopilotService {
     // Enforce allowed player references only (rewrite if needed)
     try {
       const allowedNames2: string[] = (liveFPLData?.players || []).map((p: any) => p.name).filter(Boolean);
-      if (allowedNames2.length > 0) {
+      if (allowedNames2.length > 0 && !signal?.aborted) {
         console.log('🔒 [AI COPILOT] Applying final player reference enforcement');
         const rewriteSystem = `Rewrite the following answer so that it ONLY mentions players from this allowed list: ${allowedNames2.join(', ')}.\nIf a player not on the list is referenced, change it to a generic role (e.g., 'your starting forward'). Keep under 200 words. Do not add new players.`;
         // @ts-ignore - Optional method may not exist
         const rewritten = await this.llmService!.generateCompletionSafe([
           { role: 'system', content: rewriteSystem },
           { role: 'user', content: finalMessage }
-        ], { maxTokens: 600, timeoutMs: 10000 });
+        ], { maxTokens: 600, timeoutMs: 10000, signal, onToken: streamToken });
         if (rewritten && rewritten.trim().length > 0) {
           console.log('✅ [AI COPILOT] Final enforcement applied:', {
             originalLength: finalMessage.length,
@@ -632,6 +674,8 @@ export class AICopilotService {
     console.log('🎯 [AI COPILOT] Final response ready:', {
       finalMessageLength: finalMessage.length
     });
+    // The rewrite failed or the provider cannot stream: send the final answer as one chunk
+    if (onToken && !streamed) onToken(finalMessage);
 
     // Generate insights based on analysis data
     const insights: AIInsight[] = [];
@@ -1347,6 +1391,7 @@ export class AICopilotService {
     const existing = this.sessions.get(sessionId);
     
     if (existing) {
+      this.sessionCounters.reused += 1;
       existing.lastActivity = new Date();
       if (teamId && !existing.context.teamId) {
         existing.context.teamId = teamId;
@@ -1371,6 +1416,7 @@ export class AICopilotService {
       context: newContext,
       lastActivity: new Date()
     });
+    this.sessionCounters.created += 1;
 
     return newContext;
   }
@@ -1388,6 +1434,7 @@ export class AICopilotService {
     for (const [sessionId, session] of Array.from(this.sessions.entries())) {
       if (now - session.lastActivity.getTime() > this.SESSION_TIMEOUT) {
         this.sessions.delete(sessionId);
+        this.sessionCounters.expired += 1;
       }
     }
   }
@@ -1396,6 +1443,33 @@ export class AICopilotService {
     return `msg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
   }
 
+  /**
+   * Session memory counters for load testing (message content is the dominant cost)
+   */
+  public getSessionStats(): {
+    activeSessions: number;
+    totalMessages: number;
+    messageChars: number;
+    created: number;
+    reused: number;
+    expired: number;
+  } {
+    let totalMessages = 0;
+    let messageChars = 0;
+    for (const session of Array.from(this.sessions.values())) {
+      totalMessages += session.context.messages.length;
+      for (const message of session.context.messages) {
+        messageChars += message.content.length;
+      }
+    }
+    return {
+      activeSessions: this.sessions.size,
+      totalMessages,
+      messageChars,
+      ...this.sessionCounters
+    };
+  }
+
   /**
    * Get service information for debugging
    */
@@ -28,6 +28,8 @@ import { SimulationEngine, type GameweekFixture, type SimulationConfig } from '.
 import { EffectiveOwnershipEngine } from './effectiveOwnershipEngine';
 import { MLPredictionEngine } from './mlPredictionEngine';
 import { CompetitiveIntelligenceEngine } from './competitiveIntelligenceEngine';
+import { DependencyTracker, sourceKey } from './simulationDependencies';
+import { SimulationQueueFullError } from './simulationWorkerPool';
 
 const POSITION_MAP: Record<number, 'GK' | 'DEF' | 'MID' | 'FWD'> = {
   1: 'GK',
@@ -52,6 +54,7 @@ export class AnalysisEngine {
   private effectiveOwnershipEngine: EffectiveOwnershipEngine;
   private mlPredictionEngine: MLPredictionEngine;
   private competitiveIntelligenceEngine: CompetitiveIntelligenceEngine;
+  private dependencies: DependencyTracker;
 
   constructor() {
     this.fplApi = FPLApiService.getInstance();
@@ -62,6 +65,7 @@ export class AnalysisEngine {
     this.effectiveOwnershipEngine = EffectiveOwnershipEngine.getInstance();
     this.mlPredictionEngine = MLPredictionEngine.getInstance();
     this.competitiveIntelligenceEngine = CompetitiveIntelligenceEngine.getInstance();
+    this.dependencies = DependencyTracker.getInstance();
     this.repository = this.safeCreateRepository();
     this.dataPipeline = this.safeCreatePipeline();
   }
@@ -220,6 +224,13 @@ export class AnalysisEngine {
         .map(id => statsById.get(id))
         .filter((stat): stat is PlayerAdvanced => Boolean(stat));
 
+      // Fingerprint this analysis's inputs so memoised projections and simulations are reused only while unchanged
+      const squadIds = new Set(playerIds);
+      this.dependencies.observePlayers(players.filter(player => squadIds.has(player.id)));
+      this.dependencies.observeFixtures(fixtures);
+      this.dependencies.observeAdvancedStats(orderedPlayerStats, playerIds);
+      this.dependencies.observeOdds(oddsData, fixtureIds);
+
       const playersWithEnhancements = await this.processPlayersEnhanced(
         userSquad,
         players,
@@ -235,7 +246,11 @@ export class AnalysisEngine {
       );
 
       const simulationContext = this.buildSimulationContext(playersWithEnhancements, fixtures, oddsData);
-      const simulationSummary = await this.simulationEngine.simulateSquad(playersWithEnhancements, simulationContext.gameweekFixtures, simulationContext.config);
+      const simulationSummary = await this.dependencies.memoize(
+        `squad-simulation:${playersWithEnhancements.map(player => player.id).sort((a, b) => a - b).join(',')}:${this.simulationConfigKey(simulationContext.config)}:${simulationContext.config.targetThreshold ?? ''}`,
+        playersWithEnhancements.flatMap(player => this.simulationDependencies(player.id, simulationContext.gameweekFixtures)),
+        () => this.simulationEngine.simulateSquad(playersWithEnhancements, simulationContext.gameweekFixtures, simulationContext.config)
+      );
 
       const [mlPredictions, competitiveIntelligence] = await Promise.all([
         this.mlPredictionEngine.predictPlayers(playersWithEnhancements, 5).catch(error => {
@@ -254,7 +269,11 @@ export class AnalysisEngine {
 
       const playerSimulationResults = await Promise.all(playersWithML.map(async (player) => {
         const fixturesForPlayer = simulationContext.gameweekFixtures.filter(f => f.playerId === player.id);
-        const outcome = await this.simulationEngine.simulatePlayer(player, fixturesForPlayer, simulationContext.config);
+        const outcome = await this.dependencies.memoize(
+          `player-simulation:${player.id}:${this.simulationConfigKey(simulationContext.config)}`,
+          this.simulationDependencies(player.id, fixturesForPlayer),
+          () => this.simulationEngine.simulatePlayer(player, fixturesForPlayer, simulationContext.config)
+        );
         return { player, outcome };
       }));
 
@@ -366,6 +385,7 @@ export class AnalysisEngine {
       };
     } catch (error) {
       console.error('Analysis Engine Error:', error);
+      if (error instanceof SimulationQueueFullError) throw error; // the route answers 503 for this one
       throw new Error(`Failed to analyze team: ${error instanceof Error ? error.message : 'Unknown error'}`);
     }
   }
@@ -437,8 +457,14 @@ export class AnalysisEngine {
       }
 
       const stats = statsIndex.get(pick.element);
-      const expectedPoints = await this.calculateEnhancedExpectedPoints(player, stats);
-      const volatility = stats?.volatility ?? this.calculateHistoricalVolatility(player);
+      const { expectedPoints, volatility } = await this.dependencies.memoize(
+        `projection:${player.id}`,
+        [sourceKey('bootstrap', player.id), sourceKey('advancedStats', player.id)],
+        async () => ({
+          expectedPoints: await this.calculateEnhancedExpectedPoints(player, stats),
+          volatility: stats?.volatility ?? this.calculateHistoricalVolatility(player),
+        })
+      );
       const position = POSITION_MAP[player.element_type] ?? 'MID';
 
       processed.push({
@@ -969,6 +995,7 @@ export class AnalysisEngine {
           gameweekFixtures.push({
             gameweek: fixture.event,
             playerId: player.id,
+            fixtureId: fixture.id,
             hasFixture: true,
             odds,
             fdr,
@@ -992,6 +1019,21 @@ export class AnalysisEngine {
     return { gameweekFixtures, config };
   }
 
+  // A player's simulation reads their bootstrap fields and stats plus each of their fixtures and its odds
+  private simulationDependencies(playerId: number, gameweekFixtures: GameweekFixture[]): string[] {
+    const dependencies = [sourceKey('bootstrap', playerId), sourceKey('advancedStats', playerId)];
+    gameweekFixtures.forEach(fixture => {
+      if (fixture.playerId !== playerId || fixture.fixtureId === undefined) return;
+      dependencies.push(sourceKey('fixture', fixture.fixtureId), sourceKey('odds', fixture.fixtureId));
+    });
+    return dependencies;
+  }
+
+  private simulationConfigKey(config: SimulationConfig): string {
+    // targetThreshold is left out: it only affects squad summaries, whose key adds it separately
+    return JSON.stringify([config.runs, config.gameweeksToSimulate, config.useOdds, config.useAdvancedStats, config.seed ?? null]);
+  }
+
   private async runSquadSimulation(
     players: ProcessedPlayer[], 
     fixtures: FPLFixture[], 
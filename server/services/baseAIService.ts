@@ -3,12 +3,19 @@
  * Provides common interface for all AI services
  */
 
+export interface AICallOptions {
+  // Aborts the upstream request when the caller's deadline passes or the client disconnects
+  signal?: AbortSignal;
+  // Receives answer text as it is generated; providers that cannot stream ignore it and just return the text
+  onToken?: (token: string) => void;
+}
+
 export abstract class BaseAIService {
-  abstract generateCompletion(prompt: string | Array<{ role: string; content: string }>, options?: { temperature?: number; maxTokens?: number }): Promise<string>;
-  abstract generateFPLResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>): Promise<string>;
+  abstract generateCompletion(prompt: string | Array<{ role: string; content: string }>, options?: { temperature?: number; maxTokens?: number } & AICallOptions): Promise<string>;
+  abstract generateFPLResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>, options?: AICallOptions): Promise<string>;
   abstract isHealthy(): Promise<boolean>;
   abstract isConfigured(): boolean;
-  generateCompletionSafe?(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }> }): Promise<string>;
-  generateFPLStructuredResponse?(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>): Promise<any>;
+  generateCompletionSafe?(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }> } & AICallOptions): Promise<string>;
+  generateFPLStructuredResponse?(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>, options?: AICallOptions): Promise<any>;
   formatStructuredToText?(structured: any, context?: any): string;
 }
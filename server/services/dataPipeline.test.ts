@@ -3,6 +3,7 @@ import type { FPLFixture, FPLPlayer, FPLTeam, PlayerAdvanced } from "@shared/sch
 import { DataPipeline } from "./dataPipeline";
 import { FPLApiService } from "./fplApi";
 import { StatsService } from "./statsService";
+import { DependencyTracker, sourceKey } from "./simulationDependencies";
 import type { DataRepository } from "./repositories/dataRepository";
 
 type RepositoryStub = {
@@ -211,4 +212,39 @@ describe("DataPipeline", () => {
       expect.objectContaining({ status: "online" })
     );
   });
+
+  it("reports which inputs changed and invalidates only their dependents", async () => {
+    const tracker = DependencyTracker.getInstance();
+    tracker.clear();
+    const pipeline = DataPipeline.create(createRepositoryStub());
+
+    const first = await pipeline.runFullRefresh("manual");
+    expect(first.delta).toEqual({ bootstrap: [], advancedStats: [], fixtures: [], invalidated: 0 });
+
+    const compute = vi.fn(() => "projection");
+    await tracker.memoize("projection:1", [sourceKey("bootstrap", 1)], compute);
+    await tracker.memoize("fixture-view:101", [sourceKey("fixture", 101)], compute);
+
+    // Only the injury flag changes; the fixture and stats are identical apart from fetch time
+    vi.mocked(fplApiMock.getBootstrapData).mockResolvedValueOnce({
+      ...bootstrapMock,
+      elements: [{ ...samplePlayers[0], chance_of_playing_next_round: 50 }],
+    } as Awaited<ReturnType<FPLApiService["getBootstrapData"]>>);
+    vi.mocked(statsServiceMock.getPlayerAdvancedBatch).mockResolvedValueOnce(
+      sampleAdvanced.map(stat => ({ ...stat, lastUpdated: new Date(Date.now() + 3600_000).toISOString() }))
+    );
+
+    const second = await pipeline.runFullRefresh("cron");
+    expect(second.delta).toEqual({ bootstrap: [1], advancedStats: [], fixtures: [], invalidated: 1 });
+
+    await tracker.memoize("projection:1", [sourceKey("bootstrap", 1)], compute);
+    await tracker.memoize("fixture-view:101", [sourceKey("fixture", 101)], compute);
+    expect(compute).toHaveBeenCalledTimes(3);
+
+    // A player's stat line going missing is a change too
+    await tracker.memoize("stats-view:1", [sourceKey("advancedStats", 1)], compute);
+    vi.mocked(statsServiceMock.getPlayerAdvancedBatch).mockResolvedValueOnce([]);
+    const third = await pipeline.runFullRefresh("cron");
+    expect(third.delta.advancedStats).toEqual([1]);
+  });
 });
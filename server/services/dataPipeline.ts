@@ -1,9 +1,11 @@
 ﻿import cron, { type ScheduledTask } from "node-cron";
-import type { FPLPlayer } from "@shared/schema";
+import type { FPLFixture, FPLPlayer, PlayerAdvanced } from "@shared/schema";
 import { FPLApiService } from "./fplApi";
 import { StatsService } from "./statsService";
 import { DataRepository } from "./repositories/dataRepository";
 import type { ProviderCallMetadata } from './providers';
+import { DependencyTracker, type RefreshDelta } from "./simulationDependencies";
+import { ResponseCache } from "./responseCache";
 
 interface PipelineStats {
   trigger: "startup" | "manual" | "cron" | "stale-check";
@@ -14,6 +16,7 @@ interface PipelineStats {
   fixturesIngested: number;
   advancedStatsIngested: number;
   status: "success" | "partial" | "failed";
+  delta?: RefreshDelta;
   error?: string;
 }
 
@@ -22,6 +25,8 @@ export class DataPipeline {
   private readonly repository: DataRepository;
   private readonly fplApi: FPLApiService;
   private readonly statsService: StatsService;
+  private readonly dependencies: DependencyTracker;
+  private readonly responseCache: ResponseCache;
   private cronTask: ScheduledTask | null = null;
   private lastRun?: PipelineStats;
 
@@ -29,6 +34,8 @@ export class DataPipeline {
     this.repository = repository;
     this.fplApi = FPLApiService.getInstance();
     this.statsService = StatsService.getInstance();
+    this.dependencies = DependencyTracker.getInstance();
+    this.responseCache = ResponseCache.getInstance();
   }
 
   static getInstance(): DataPipeline {
@@ -84,12 +91,17 @@ export class DataPipeline {
       const players = await this.ingestFplBootstrap();
       playersIngested = players.length;
 
-      fixturesIngested = await this.ingestFixtures();
+      const fixtures = await this.ingestFixtures();
+      fixturesIngested = fixtures.length;
 
+      let stats: PlayerAdvanced[] = [];
       if (playersIngested > 0) {
-        advancedStatsIngested = await this.ingestAdvancedStats(players);
+        stats = await this.ingestAdvancedStats(players);
+        advancedStatsIngested = stats.length;
       }
 
+      const delta = this.recordDelta(players, fixtures, stats);
+
       this.lastRun = {
         trigger,
         startedAt,
@@ -99,6 +111,7 @@ export class DataPipeline {
         fixturesIngested,
         advancedStatsIngested,
         status,
+        delta,
       };
 
       console.log(`[pipeline] Full refresh complete in ${this.lastRun.durationMs}ms`);
@@ -124,6 +137,30 @@ export class DataPipeline {
     }
   }
 
+  // Diff the refreshed inputs against what earlier projections and simulations were computed from
+  private recordDelta(players: FPLPlayer[], fixtures: FPLFixture[], stats: PlayerAdvanced[]): RefreshDelta {
+    const bootstrap = this.dependencies.observePlayers(players);
+    const fixtureChanges = this.dependencies.observeFixtures(fixtures);
+    // Every refreshed player is observed, so one whose stat line disappeared counts as changed
+    const statChanges = this.dependencies.observeAdvancedStats(stats, players.map(player => player.id));
+    const delta: RefreshDelta = {
+      bootstrap: bootstrap.changed,
+      fixtures: fixtureChanges.changed,
+      advancedStats: statChanges.changed,
+      invalidated: bootstrap.invalidated + fixtureChanges.invalidated + statChanges.invalidated,
+    };
+
+    // Cached co-pilot answers quote players, fixtures and stats, so any change retires them all
+    if (delta.bootstrap.length || delta.fixtures.length || delta.advancedStats.length) {
+      this.responseCache.invalidate('pipeline refresh');
+    }
+
+    if (delta.invalidated > 0) {
+      console.log(`[pipeline] Delta: ${delta.bootstrap.length} players, ${delta.fixtures.length} fixtures, ${delta.advancedStats.length} stat lines changed; ${delta.invalidated} cached results invalidated`);
+    }
+    return delta;
+  }
+
   private async ingestFplBootstrap(): Promise<FPLPlayer[]> {
     try {
       const bootstrap = await this.fplApi.getBootstrapData();
@@ -146,7 +183,7 @@ export class DataPipeline {
     }
   }
 
-  private async ingestFixtures(): Promise<number> {
+  private async ingestFixtures(): Promise<FPLFixture[]> {
     try {
       const fixtures = await this.fplApi.getFixtures();
       await this.repository.upsertFplFixtures(fixtures, new Date());
@@ -155,7 +192,7 @@ export class DataPipeline {
         fixtures: fixtures.length,
       });
 
-      return fixtures.length;
+      return fixtures;
     } catch (error) {
       await this.updateProviderStatus('fpl-fixtures', this.fplApi.getProviderMetadata(), {
         error: error instanceof Error ? error.message : String(error),
@@ -164,7 +201,7 @@ export class DataPipeline {
     }
   }
 
-  private async ingestAdvancedStats(players: FPLPlayer[]): Promise<number> {
+  private async ingestAdvancedStats(players: FPLPlayer[]): Promise<PlayerAdvanced[]> {
     const providerName = process.env.STATS_PROVIDER || "mock";
     try {
       const playerIds = players.map(player => player.id);
@@ -183,14 +220,14 @@ export class DataPipeline {
         players: stats.length,
       });
 
-      return stats.length;
+      return stats;
     } catch (error) {
       await this.updateProviderStatus('advanced-stats', this.statsService.getProviderMetadata(), {
         provider: providerName,
         error: error instanceof Error ? error.message : String(error),
       });
       console.warn("[pipeline] Advanced stats ingestion failed", error);
-      return 0;
+      return [];
     }
   }
 
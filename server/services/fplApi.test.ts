@@ -0,0 +1,60 @@
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import { FPLApiService } from "./fplApi";
+import type { FPLProvider } from "./providers";
+
+function deferred<T>() {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>(done => { resolve = done; });
+  return { promise, resolve };
+}
+
+function createService() {
+  const getBootstrapStatic = vi.fn();
+  const service = new FPLApiService({ getBootstrapStatic } as unknown as FPLProvider);
+  return { service, getBootstrapStatic };
+}
+
+describe('FPLApiService cache', () => {
+  let now = 1_000_000;
+
+  beforeEach(() => {
+    vi.restoreAllMocks();
+    now = 1_000_000;
+    vi.spyOn(Date, 'now').mockImplementation(() => now);
+  });
+
+  it('shares one upstream request between concurrent misses', async () => {
+    const { service, getBootstrapStatic } = createService();
+    const upstream = deferred<{ events: [] }>();
+    getBootstrapStatic.mockImplementation(() => upstream.promise);
+
+    const requests = Array.from({ length: 5 }, () => service.getBootstrapData());
+    upstream.resolve({ events: [] });
+    const results = await Promise.all(requests);
+
+    expect(getBootstrapStatic).toHaveBeenCalledTimes(1);
+    expect(new Set(results).size).toBe(1);
+    expect(service.getCacheStats()).toMatchObject({ entries: 1, inFlight: 0, misses: 5, coalesced: 4 });
+  });
+
+  it('serves stale data while a single background refresh runs', async () => {
+    const { service, getBootstrapStatic } = createService();
+    getBootstrapStatic.mockImplementation(async () => ({ version: 1 }));
+    await service.getBootstrapData();
+
+    now += 6 * 60 * 1000; // past the 5 minute expiry, inside the stale window
+    const refreshed = deferred<{ version: number }>();
+    getBootstrapStatic.mockImplementation(() => refreshed.promise);
+
+    const stale = await Promise.all([service.getBootstrapData(), service.getBootstrapData()]);
+    expect(stale.map(data => (data as any).version)).toEqual([1, 1]);
+    expect(getBootstrapStatic).toHaveBeenCalledTimes(2);
+
+    refreshed.resolve({ version: 2 });
+    await refreshed.promise;
+    await Promise.resolve();
+
+    expect(((await service.getBootstrapData()) as any).version).toBe(2);
+    expect(service.getCacheStats()).toMatchObject({ hits: 1, staleServed: 2, revalidations: 1, inFlight: 0 });
+  });
+});
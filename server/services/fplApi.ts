@@ -6,6 +6,7 @@ import {
 } from '@shared/schema';
 import { ProxyAgent, setGlobalDispatcher } from 'undici';
 import { FPLProvider } from './providers';
+import { LruCache } from './lruCache';
 
 interface FPLBootstrapResponse {
   events: any[];
@@ -32,9 +33,20 @@ interface FPLBootstrapResponse {
 
 export class FPLApiService {
   private static instance: FPLApiService;
-  private cache: Map<string, { data: any; timestamp: number }> = new Map();
   private readonly cacheExpiry = 5 * 60 * 1000; // 5 minutes
+  // How long past expiry an entry may still be served while one background refresh replaces it
+  private readonly staleWhileRevalidate = Number(process.env.FPL_CACHE_STALE_MS ?? 10 * 60 * 1000);
+  // Entries outlive cacheExpiry so a stale copy can stand in when the API fails; per-manager
+  // keys (squads, histories) are what the entry and byte bounds keep in check
+  private cache = new LruCache<any>('fpl-api', {
+    ttlMs: 24 * 60 * 60 * 1000,
+    maxEntries: Number(process.env.FPL_CACHE_MAX_ENTRIES ?? 5000),
+    maxBytes: Number(process.env.FPL_CACHE_MAX_BYTES ?? 128 * 1024 * 1024)
+  });
+  // One upstream request per key at a time; concurrent misses share it
+  private inFlight: Map<string, Promise<any>> = new Map();
   private readonly provider: FPLProvider;
+  private cacheStats = { hits: 0, misses: 0, staleServed: 0, coalesced: 0, revalidations: 0 };
 
   public static getInstance(): FPLApiService {
     if (!FPLApiService.instance) {
@@ -43,7 +55,7 @@ export class FPLApiService {
     return FPLApiService.instance;
   }
 
-  constructor() {
+  constructor(provider?: FPLProvider) {
     const proxyUrl = process.env.HTTPS_PROXY || process.env.HTTP_PROXY;
     try {
       if (proxyUrl) {
@@ -55,7 +67,7 @@ export class FPLApiService {
       console.warn('[FPLApiService] Failed to initialise proxy agent:', error);
     }
 
-    this.provider = new FPLProvider();
+    this.provider = provider ?? new FPLProvider();
   }
 
   getProviderMetadata() {
@@ -63,27 +75,63 @@ export class FPLApiService {
   }
 
   private async fetchWithCache<T>(cacheKey: string, fetcher: () => Promise<T>): Promise<T> {
-    const cached = this.cache.get(cacheKey);
-    const now = Date.now();
+    const cached = this.cache.getEntry(cacheKey);
+    const age = cached ? Date.now() - cached.storedAt : Infinity;
 
-    if (cached && now - cached.timestamp < this.cacheExpiry) {
-      return cached.data as T;
+    if (cached && age < this.cacheExpiry) {
+      this.cacheStats.hits += 1;
+      return cached.value as T;
     }
 
+    // Recently expired: answer with the stale copy and let a single background request refresh it
+    if (cached && age < this.cacheExpiry + this.staleWhileRevalidate) {
+      this.cacheStats.staleServed += 1;
+      if (!this.inFlight.has(cacheKey)) {
+        this.cacheStats.revalidations += 1;
+        this.refresh(cacheKey, fetcher).catch(error => {
+          console.warn(`[FPLApiService] Background refresh failed for ${cacheKey}:`, error instanceof Error ? error.message : error);
+        });
+      }
+      return cached.value as T;
+    }
+
+    this.cacheStats.misses += 1;
     try {
-      const data = await fetcher();
-      this.cache.set(cacheKey, { data, timestamp: now });
-      return data;
+      return await this.refresh(cacheKey, fetcher);
     } catch (error) {
       console.error(`[FPLApiService] Error for ${cacheKey}:`, error);
       if (cached) {
         console.warn(`[FPLApiService] Using stale cache for ${cacheKey} due to error.`);
-        return cached.data as T;
+        this.cacheStats.staleServed += 1;
+        return cached.value as T;
       }
       throw new Error(`Failed to fetch data from FPL API: ${error instanceof Error ? error.message : 'Unknown error'}`);
     }
   }
 
+  // Single-flight fetch: joins the request already running for cacheKey, if any
+  private refresh<T>(cacheKey: string, fetcher: () => Promise<T>): Promise<T> {
+    const pending = this.inFlight.get(cacheKey);
+    if (pending) {
+      this.cacheStats.coalesced += 1;
+      return pending as Promise<T>;
+    }
+
+    const request: Promise<T> = fetcher()
+      .then(data => {
+        // Clearing the key while the request ran means its result must not repopulate the cache
+        if (this.inFlight.get(cacheKey) === request) {
+          this.cache.set(cacheKey, data);
+        }
+        return data;
+      })
+      .finally(() => {
+        if (this.inFlight.get(cacheKey) === request) this.inFlight.delete(cacheKey);
+      });
+    this.inFlight.set(cacheKey, request);
+    return request;
+  }
+
   async getBootstrapData(): Promise<FPLBootstrapResponse> {
     return this.fetchWithCache('bootstrap', () => this.provider.getBootstrapStatic<FPLBootstrapResponse>());
   }
@@ -225,11 +273,26 @@ export class FPLApiService {
     );
   }
 
+  getCacheStats(): {
+    entries: number;
+    evictions: number;
+    inFlight: number;
+    hits: number;
+    misses: number;
+    staleServed: number;
+    coalesced: number;
+    revalidations: number;
+  } {
+    return { entries: this.cache.size, evictions: this.cache.getStats().evictions, inFlight: this.inFlight.size, ...this.cacheStats };
+  }
+
   clearCache(): void {
     this.cache.clear();
+    this.inFlight.clear();
   }
 
   clearCacheEntry(key: string): void {
     this.cache.delete(key);
+    this.inFlight.delete(key);
   }
 }
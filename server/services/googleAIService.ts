@@ -3,6 +3,8 @@
  * Provides access to Gemini models via Google AI API
  */
 
+import { callSignal } from './requestDeadline';
+
 interface GoogleAIMessage {
   role: 'user' | 'model';
   parts: Array<{ text: string }>;
@@ -26,7 +28,7 @@ interface GoogleAIResponse {
 export class GoogleAIService {
   private static instance: GoogleAIService;
   private apiKey: string;
-  private baseUrl = 'https://generativelanguage.googleapis.com/v1beta/models';
+  private baseUrl = process.env.GOOGLE_AI_BASE_URL || 'https://generativelanguage.googleapis.com/v1beta/models';
 
   // Use Gemini 1.5 Flash for speed and cost-effectiveness
   private model = 'gemini-1.5-flash';
@@ -51,12 +53,14 @@ export class GoogleAIService {
       model?: string;
       maxTokens?: number;
       temperature?: number;
+      signal?: AbortSignal;
     } = {}
   ): Promise<string> {
     const {
       model = this.model,
       maxTokens = 1000,
-      temperature = 0.7
+      temperature = 0.7,
+      signal
     } = options;
 
     // Convert messages to Google AI format
@@ -99,7 +103,8 @@ export class GoogleAIService {
               threshold: 'BLOCK_MEDIUM_AND_ABOVE'
             }
           ]
-        })
+        }),
+        signal
       });
 
       if (!response.ok) {
@@ -135,6 +140,7 @@ export class GoogleAIService {
       temperature?: number;
       timeoutMs?: number;
       liteFallbackMessages?: Array<{ role: string; content: string }>;
+      signal?: AbortSignal;
     } = {}
   ): Promise<string> {
     const {
@@ -143,23 +149,23 @@ export class GoogleAIService {
       temperature = 0.7,
       timeoutMs = 25000,
       liteFallbackMessages,
+      signal,
     } = options;
 
     const callOnce = async (msgs: Array<{ role: string; content: string }>) => {
-      const controller = new AbortController();
-      const timer = setTimeout(() => controller.abort(), timeoutMs);
+      const call = callSignal(timeoutMs, signal);
       try {
-        return await this.generateCompletion(msgs, { model, maxTokens, temperature });
+        return await this.generateCompletion(msgs, { model, maxTokens, temperature, signal: call.signal });
       } catch (error) {
         console.warn('⚠️ [GOOGLE AI] API call failed:', error);
         return '';
       } finally {
-        clearTimeout(timer);
+        call.cancel();
       }
     };
 
     let content = await callOnce(messages);
-    if (!content && liteFallbackMessages?.length) {
+    if (!content && liteFallbackMessages?.length && !signal?.aborted) {
       console.log('🔄 [GOOGLE AI] Trying lite fallback');
       content = await callOnce(liteFallbackMessages);
     }
@@ -183,7 +189,8 @@ export class GoogleAIService {
       recommendations?: any[];
       liveFPLData?: any;
     },
-    conversationHistory: Array<{ role: string; content: string }> = []
+    conversationHistory: Array<{ role: string; content: string }> = [],
+    options: { signal?: AbortSignal } = {}
   ): Promise<string> {
     const systemPrompt = this.buildFPLSystemPrompt(fplContext);
 
@@ -197,7 +204,8 @@ export class GoogleAIService {
       model: this.model,
       temperature: 0.1, // Lower temperature for more deterministic responses
       maxTokens: 800, // Shorter for free tier
-      timeoutMs: 30000
+      timeoutMs: 30000,
+      signal: options.signal
     });
 
     let cleaned = this.sanitizeFinalContent(rawAnswer);
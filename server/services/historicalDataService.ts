@@ -7,6 +7,7 @@
 
 import { FPLApiService } from './fplApi';
 import { HistoricalPlayerData, MLModelPerformance } from '@shared/schema';
+import { LruCache, type LruCacheStats } from './lruCache';
 
 interface HistoricalDataProvider {
   fetchPlayerHistory(playerId: number, seasons: string[]): Promise<HistoricalPlayerData[]>;
@@ -67,9 +68,11 @@ class MockHistoricalDataProvider implements HistoricalDataProvider {
 export class HistoricalDataService {
   private static instance: HistoricalDataService;
   private provider: HistoricalDataProvider;
-  private cache = new Map<string, HistoricalPlayerData[]>();
-  private cacheExpiry = new Map<string, number>();
   private readonly CACHE_DURATION = 24 * 60 * 60 * 1000; // 24 hours
+  private cache = new LruCache<HistoricalPlayerData[]>('historical-data', {
+    ttlMs: this.CACHE_DURATION,
+    maxEntries: 5000
+  });
 
   private constructor() {
     // Use mock provider for development, real provider in production
@@ -93,12 +96,10 @@ export class HistoricalDataService {
       const cacheKey = `${playerId}_${seasons.join(',')}`;
       
       // Check cache first
-      if (this.isCacheValid(cacheKey)) {
-        const cached = this.cache.get(cacheKey);
-        if (cached) {
-          results.set(playerId, cached);
-          continue;
-        }
+      const cached = this.cache.get(cacheKey);
+      if (cached) {
+        results.set(playerId, cached);
+        continue;
       }
 
       try {
@@ -109,7 +110,6 @@ export class HistoricalDataService {
         
         // Cache the results
         this.cache.set(cacheKey, processedHistory);
-        this.cacheExpiry.set(cacheKey, Date.now() + this.CACHE_DURATION);
         
         results.set(playerId, processedHistory);
       } catch (error) {
@@ -277,23 +277,18 @@ export class HistoricalDataService {
     ];
   }
 
-  /**
-   * Check if cached data is still valid
-   */
-  private isCacheValid(key: string): boolean {
-    const expiry = this.cacheExpiry.get(key);
-    return expiry ? Date.now() < expiry : false;
-  }
-
   /**
    * Clear all cached data
    */
   public clearCache(): void {
     this.cache.clear();
-    this.cacheExpiry.clear();
     console.log('Historical data cache cleared');
   }
 
+  public getCacheStats(): LruCacheStats {
+    return this.cache.getStats();
+  }
+
   /**
    * Get provider information for debugging
    */
@@ -3,6 +3,8 @@
  * Provides access to free-tier AI models via HuggingFace Inference API
  */
 
+import { callSignal } from './requestDeadline';
+
 interface HuggingFaceMessage {
   role: 'system' | 'user' | 'assistant';
   content: string;
@@ -16,7 +18,7 @@ interface HuggingFaceResponse {
 export class HuggingFaceService {
   private static instance: HuggingFaceService;
   private apiKey: string;
-  private baseUrl = 'https://api-inference.huggingface.co/models';
+  private baseUrl = process.env.HUGGINGFACE_BASE_URL || 'https://api-inference.huggingface.co/models';
 
   // Free tier compatible model - using a model that exists in HF Inference API
   private model = 'google/flan-t5-base';
@@ -41,12 +43,14 @@ export class HuggingFaceService {
       model?: string;
       maxTokens?: number;
       temperature?: number;
+      signal?: AbortSignal;
     } = {}
   ): Promise<string> {
     const {
       model = this.model,
       maxTokens = 1000,
-      temperature = 0.7
+      temperature = 0.7,
+      signal
     } = options;
 
     // Format messages into a single prompt
@@ -72,7 +76,8 @@ export class HuggingFaceService {
             return_full_text: false,
             do_sample: true
           }
-        })
+        }),
+        signal
       });
 
       if (!response.ok) {
@@ -104,6 +109,7 @@ export class HuggingFaceService {
       temperature?: number;
       timeoutMs?: number;
       liteFallbackMessages?: HuggingFaceMessage[];
+      signal?: AbortSignal;
     } = {}
   ): Promise<string> {
     const {
@@ -112,23 +118,23 @@ export class HuggingFaceService {
       temperature = 0.7,
       timeoutMs = 25000, // HuggingFace can be slower
       liteFallbackMessages,
+      signal,
     } = options;
 
     const callOnce = async (msgs: HuggingFaceMessage[]) => {
-      const controller = new AbortController();
-      const timer = setTimeout(() => controller.abort(), timeoutMs);
+      const call = callSignal(timeoutMs, signal);
       try {
-        return await this.generateCompletion(msgs, { model, maxTokens, temperature });
+        return await this.generateCompletion(msgs, { model, maxTokens, temperature, signal: call.signal });
       } catch (error) {
         console.warn('⚠️ [HUGGINGFACE] API call failed:', error);
         return '';
       } finally {
-        clearTimeout(timer);
+        call.cancel();
       }
     };
 
     let content = await callOnce(messages);
-    if (!content && liteFallbackMessages?.length) {
+    if (!content && liteFallbackMessages?.length && !signal?.aborted) {
       console.log('🔄 [HUGGINGFACE] Trying lite fallback');
       content = await callOnce(liteFallbackMessages);
     }
@@ -152,7 +158,8 @@ export class HuggingFaceService {
       recommendations?: any[];
       liveFPLData?: any;
     },
-    conversationHistory: HuggingFaceMessage[] = []
+    conversationHistory: HuggingFaceMessage[] = [],
+    options: { signal?: AbortSignal } = {}
   ): Promise<string> {
     const systemPrompt = this.buildFPLSystemPrompt(fplContext);
 
@@ -166,7 +173,8 @@ export class HuggingFaceService {
       model: this.model,
       temperature: 0.6,
       maxTokens: 800, // Shorter for free tier
-      timeoutMs: 30000
+      timeoutMs: 30000,
+      signal: options.signal
     });
 
     let cleaned = this.sanitizeFinalContent(rawAnswer);
@@ -0,0 +1,88 @@
+import { describe, expect, it } from "vitest";
+import { IntentMatcher, KeywordAutomaton } from "./intentMatcher";
+
+// The keyword regexes NaturalLanguageProcessor ran before the rules were compiled
+const regexRules = {
+  comparison: (q: string) => /(\bvs\b|\bversus\b|\bcompare\b|\bpick\b|\bchoose\b|\bbetween\b)/i.test(q),
+  transfer: (q: string) => /(?:transfer|buy|sell|bring\s+in|bring\s+out|replace|swap|change|worth\s+a?\s+hit)\b/i.test(q),
+  fixture: (q: string) => /(fixtures?|fdr|difficulty|upcoming|schedule|gameweek|gw(?:\s+\d+)?)\b/i.test(q),
+  squadAnalysis: (q: string) =>
+    /(?:analyze|analysis|review|check|evaluate)\s*(?:my|squad|team)\b/i.test(q) ||
+    /(?:squad|team)\s*(?:analyze|analysis|review|check|evaluate)\b/i.test(q) ||
+    /(?:what|how)\s+(?:do\s+you\s+)?(?:think|feel)\s+about\s+.+?\s+in\s+my\s+(team|squad)/i.test(q) ||
+    /(?:is|should)\s+.+?\s+(?:good|worth|worthwhile|worth\s+keeping)\s+(?:in|for)\s+my\s+(team|squad)/i.test(q) ||
+    /(?:my\s+team|my\s+squad).*\w+/i.test(q),
+  playerSpecific: (q: string) =>
+    /(?:what|should|do|about|worth|advice|opinion|thoughts?|recommendation)\b/i.test(q) &&
+    /(?:keeping|holding|selling|starting|benching|captaining|transferring|dropping)\b/i.test(q),
+  playerAction: (q: string) =>
+    /(?:what\s+(?:should\s+)?(?:i|do)\s+(?:do\s+)?(?:with|about))\b/i.test(q) ||
+    /(?:should\s+i\s+(?:keep|sell|start|bench|captain|transfer|drop))\b/i.test(q) ||
+    /(?:is\s+.+?\s+worth\s+(?:keeping|holding|starting))\b/i.test(q) ||
+    /(?:advice\s+(?:on|about|for))\b/i.test(q) ||
+    /(?:thoughts?\s+(?:on|about))\b/i.test(q) ||
+    /(?:blanking|performing|disappointing|underperforming)\b/i.test(q),
+  explicitChip: (q: string) => /(?:wildcard|bench boost|triple captain|free hit|chip)\b/i.test(q),
+  chips: (q: string) => q.match(/(?:wildcard|bench boost|triple captain|free hit|wc|bb|tc|fh|chip)/gi) ?? [],
+  positions: (q: string) => q.match(/(?:goalkeeper|defender|midfielder|forward|gk|def|mid|fwd)/gi) ?? [],
+  budgets: (q: string) => (q.match(/(?:£|budget|money|cost)\s*(\d+(?:\.\d+)?)/gi) ?? []).map(m => parseFloat(m.match(/\d+(?:\.\d+)?/)![0])),
+  gameweeks: (q: string) => (q.match(/(?:gameweek|gw)\s*(\d+)/gi) ?? []).map(m => parseInt(m.match(/\d+/)![0]))
+};
+
+const queries = [
+  'analyze my squad with emphasis on bench depth ahead of gameweek 9',
+  'how does my team look',
+  'my team',
+  'teamcheck please',
+  'what do you think about salah in my team',
+  'what think about in my team in my squad',
+  'is haaland worth keeping for my squad',
+  'this season is palmer worthwhile in my teams',
+  'is saka worth holding',
+  'should i captain salah or haaland vs son',
+  'compare palmer versus saka between gw 12 and gw13',
+  'should i make transfers or transfer out watkins',
+  'is it worth a hit to bring in isak',
+  'when should i use my triple captain chips',
+  'who should i watch in the match',
+  'best midfielder and defender fixtures for gw 5 gameweek 6 gwx 7',
+  'budget 8 forward with cost 6 or money',
+  'what should i do with trent',
+  'thoughts on the fdr schedule upcoming',
+  'advice for benching gabriel as he is underperforming',
+  'wcbb tchip fhx',
+  'xg and xa differential punt with high ownership'
+];
+
+describe('IntentMatcher', () => {
+  it('finds overlapping phrases in one pass and honours word boundaries', () => {
+    const automaton = new KeywordAutomaton([
+      { phrase: 'he', tag: 'a' },
+      { phrase: 'she', tag: 'a' },
+      { phrase: 'hers', tag: 'b', wordEnd: true },
+      { phrase: 'his', tag: 'b', wordStart: true }
+    ]);
+    const hits = automaton.scan('ushers this his');
+
+    expect(hits.map(hit => [hit.phrase, hit.start, hit.end])).toEqual([
+      ['she', 1, 4], ['he', 2, 4], ['hers', 2, 6], ['his', 12, 15]
+    ]);
+  });
+
+  it('agrees with the keyword regexes it replaced', () => {
+    const matcher = new IntentMatcher([{ keywords: ['in', 'out', 'help'] }], ['xg', 'xa', 'punt', 'ownership']);
+
+    for (const query of queries) {
+      const match = matcher.match(query);
+      const flags = ['comparison', 'transfer', 'fixture', 'squadAnalysis', 'playerSpecific', 'playerAction', 'explicitChip'] as const;
+      for (const flag of flags) {
+        expect([query, flag, match[flag]]).toEqual([query, flag, regexRules[flag](query)]);
+      }
+      expect(match.chips.map(hit => hit.phrase)).toEqual(regexRules.chips(query));
+      expect(match.positions.map(hit => hit.phrase)).toEqual(regexRules.positions(query));
+      expect(match.budgets).toEqual(regexRules.budgets(query));
+      expect(match.gameweeks).toEqual(regexRules.gameweeks(query));
+    }
+    expect(Array.from(matcher.match(queries[queries.length - 1]).terms).sort()).toEqual(['ownership', 'punt', 'xa', 'xg']);
+  });
+});
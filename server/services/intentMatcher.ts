@@ -0,0 +1,334 @@
+/**
+ * Compiled keyword matcher for NaturalLanguageProcessor's intent rules.
+ *
+ * The rules used to test a dozen keyword regexes against every query, most of
+ * them two or three times (classification, intent confidence, the explicit
+ * keyword check), plus one substring scan per FPL term. Here every keyword and
+ * phrase is compiled once into an Aho–Corasick automaton, so a single pass over
+ * the normalized query finds all of them with their spans and the rules just
+ * read the result. The phrase table reproduces the regexes it replaced,
+ * including where they do and do not require word boundaries.
+ *
+ * Input must come from NaturalLanguageProcessor.normalizeQuery: lower case,
+ * punctuation removed and single spaces, which is what lets `\s+` in the old
+ * regexes become one literal space here.
+ */
+
+export interface KeywordSpec {
+  phrase: string;
+  tag: string;
+  wordStart?: boolean; // phrase must not be preceded by a word character (`\b` before it)
+  wordEnd?: boolean; // phrase must not be followed by a word character (`\b` after it)
+}
+
+export interface KeywordHit {
+  tag: string;
+  phrase: string;
+  start: number;
+  end: number; // exclusive
+  rank: number; // position of the phrase within its tag, i.e. its place in the regex alternation
+}
+
+function isWordChar(code: number): boolean {
+  return (code >= 48 && code <= 57) || (code >= 65 && code <= 90) || (code >= 97 && code <= 122) || code === 95;
+}
+
+/**
+ * Aho–Corasick automaton over literal phrases, reporting every occurrence (overlapping ones included).
+ * The fail links are folded into a dense transition table, so scanning costs one array read per character.
+ */
+export class KeywordAutomaton {
+  private readonly specs: Array<KeywordSpec & { rank: number }>;
+  private readonly classOf = new Map<number, number>(); // character code -> column; 0 is every other character
+  private readonly asciiClass = new Int32Array(128); // classOf for the common case
+  private readonly columns: number;
+  private readonly transitions: Int32Array;
+  private readonly outputStart: Int32Array; // phrases ending at node n: outputs[outputStart[n] .. outputStart[n + 1])
+  private readonly outputs: Int32Array;
+
+  constructor(specs: KeywordSpec[]) {
+    const ranks = new Map<string, number>();
+    this.specs = specs.map(spec => {
+      const rank = ranks.get(spec.tag) ?? 0;
+      ranks.set(spec.tag, rank + 1);
+      return { ...spec, rank };
+    });
+
+    // Trie of all phrases
+    const children: Array<Map<number, number>> = [new Map()];
+    const ending: number[][] = [[]];
+    this.specs.forEach((spec, index) => {
+      let node = 0;
+      for (let i = 0; i < spec.phrase.length; i++) {
+        const code = spec.phrase.charCodeAt(i);
+        if (!this.classOf.has(code)) this.classOf.set(code, this.classOf.size + 1);
+        const column = this.classOf.get(code)!;
+        let child = children[node].get(column);
+        if (child === undefined) {
+          child = children.length;
+          children.push(new Map());
+          ending.push([]);
+          children[node].set(column, child);
+        }
+        node = child;
+      }
+      ending[node].push(index);
+    });
+
+    this.classOf.forEach((column, code) => { if (code < 128) this.asciiClass[code] = column; });
+
+    // Breadth-first, so a node's fail target is complete before the node itself
+    this.columns = this.classOf.size + 1;
+    this.transitions = new Int32Array(children.length * this.columns);
+    const fail = new Int32Array(children.length);
+    const outputs: number[][] = ending.map(list => [...list]);
+    const queue: number[] = [0];
+    for (let head = 0; head < queue.length; head++) {
+      const node = queue[head];
+      for (let column = 0; column < this.columns; column++) {
+        const child = children[node].get(column);
+        if (child === undefined) {
+          this.transitions[node * this.columns + column] = node === 0 ? 0 : this.transitions[fail[node] * this.columns + column];
+        } else {
+          this.transitions[node * this.columns + column] = child;
+          fail[child] = node === 0 ? 0 : this.transitions[fail[node] * this.columns + column];
+          outputs[child].push(...outputs[fail[child]]);
+          queue.push(child);
+        }
+      }
+    }
+
+    this.outputStart = new Int32Array(children.length + 1);
+    outputs.forEach((list, node) => { this.outputStart[node + 1] = this.outputStart[node] + list.length; });
+    this.outputs = Int32Array.from(outputs.flat());
+  }
+
+  get size(): number {
+    return this.specs.length;
+  }
+
+  spec(index: number): KeywordSpec & { rank: number } {
+    return this.specs[index];
+  }
+
+  /** Call ``visit`` with the spec index and span of every occurrence that satisfies its boundary requirements. */
+  forEachHit(text: string, visit: (index: number, start: number, end: number) => void): void {
+    let node = 0;
+    for (let i = 0; i < text.length; i++) {
+      const code = text.charCodeAt(i);
+      const column = code < 128 ? this.asciiClass[code] : this.classOf.get(code) ?? 0;
+      node = this.transitions[node * this.columns + column];
+      for (let out = this.outputStart[node]; out < this.outputStart[node + 1]; out++) {
+        const index = this.outputs[out];
+        const spec = this.specs[index];
+        const start = i + 1 - spec.phrase.length;
+        const end = i + 1;
+        if (spec.wordStart && start > 0 && isWordChar(text.charCodeAt(start - 1))) continue;
+        if (spec.wordEnd && end < text.length && isWordChar(text.charCodeAt(end))) continue;
+        visit(index, start, end);
+      }
+    }
+  }
+
+  /** All occurrences in ``text``, in order of end position. */
+  scan(text: string): KeywordHit[] {
+    const hits: KeywordHit[] = [];
+    this.forEachHit(text, (index, start, end) => {
+      const { tag, phrase, rank } = this.specs[index];
+      hits.push({ tag, phrase, start, end, rank });
+    });
+    return hits;
+  }
+}
+
+/** Every concatenation of one choice from each part, e.g. phrases(['a ', ''], ['b']) -> ['a b', 'b']. */
+function phrases(...parts: string[][]): string[] {
+  return parts.reduce<string[]>((prefixes, choices) => prefixes.flatMap(prefix => choices.map(choice => prefix + choice)), ['']);
+}
+
+function specs(tag: Tag, list: string[], bounds: Pick<KeywordSpec, 'wordStart' | 'wordEnd'> = {}): KeywordSpec[] {
+  return list.map(phrase => ({ phrase, tag, ...bounds }));
+}
+
+// Entity tags come last, after the rule tags whose hits only need their extent recorded
+const TAGS = [
+  'comparison', 'transfer', 'fixture', 'squadReview', 'squadOpinionOpen', 'squadOpinionClose', 'squadWorthOpen',
+  'squadWorthClose', 'myTeam', 'adviceQuestion', 'adviceAction', 'playerAction', 'playerWorthOpen', 'playerWorthClose',
+  'explicitChip', 'term', 'chip', 'position', 'budget', 'gameweek'
+] as const;
+type Tag = typeof TAGS[number];
+const TAG = Object.fromEntries(TAGS.map((tag, id) => [tag, id])) as Record<Tag, number>;
+
+const SQUAD_VERBS = ['analyze', 'analysis', 'review', 'check', 'evaluate'];
+
+// One entry per keyword regex of the intent rules; comments give the regex each group stands for
+const RULE_KEYWORDS: KeywordSpec[] = [
+  // /(\bvs\b|\bversus\b|\bcompare\b|\bpick\b|\bchoose\b|\bbetween\b)/
+  ...specs('comparison', ['vs', 'versus', 'compare', 'pick', 'choose', 'between'], { wordStart: true, wordEnd: true }),
+  // /(?:transfer|buy|sell|bring\s+in|bring\s+out|replace|swap|change|worth\s+a?\s+hit)\b/
+  ...specs('transfer', ['transfer', 'buy', 'sell', 'bring in', 'bring out', 'replace', 'swap', 'change', 'worth a hit'], { wordEnd: true }),
+  // /(fixtures?|fdr|difficulty|upcoming|schedule|gameweek|gw(?:\s+\d+)?)\b/
+  ...specs('fixture', ['fixture', 'fixtures', 'fdr', 'difficulty', 'upcoming', 'schedule', 'gameweek', 'gw'], { wordEnd: true }),
+  // /(?:analyze|...|evaluate)\s*(?:my|squad|team)\b/ and /(?:squad|team)\s*(?:analyze|...|evaluate)\b/
+  ...specs('squadReview', [
+    ...phrases(SQUAD_VERBS, ['', ' '], ['my', 'squad', 'team']),
+    ...phrases(['squad', 'team'], ['', ' '], SQUAD_VERBS)
+  ], { wordEnd: true }),
+  // /(?:what|how)\s+(?:do\s+you\s+)?(?:think|feel)\s+about\s+.+?\s+in\s+my\s+(team|squad)/
+  ...specs('squadOpinionOpen', phrases(['what ', 'how '], ['', 'do you '], ['think ', 'feel '], ['about '])),
+  ...specs('squadOpinionClose', [' in my team', ' in my squad']),
+  // /(?:is|should)\s+.+?\s+(?:good|worth|worthwhile|worth\s+keeping)\s+(?:in|for)\s+my\s+(team|squad)/
+  ...specs('squadWorthOpen', ['is ', 'should ']),
+  ...specs('squadWorthClose', phrases([' good', ' worth', ' worthwhile', ' worth keeping'], [' in', ' for'], [' my '], ['team', 'squad'])),
+  // /(?:my\s+team|my\s+squad).*\w+/
+  ...specs('myTeam', ['my team', 'my squad']),
+  // /(?:what|should|do|about|worth|advice|opinion|thoughts?|recommendation)\b/ and
+  // /(?:keeping|holding|selling|starting|benching|captaining|transferring|dropping)\b/
+  ...specs('adviceQuestion', ['what', 'should', 'do', 'about', 'worth', 'advice', 'opinion', 'thought', 'thoughts', 'recommendation'], { wordEnd: true }),
+  ...specs('adviceAction', ['keeping', 'holding', 'selling', 'starting', 'benching', 'captaining', 'transferring', 'dropping'], { wordEnd: true }),
+  // /(?:what\s+(?:should\s+)?(?:i|do)\s+(?:do\s+)?(?:with|about))\b/, /(?:should\s+i\s+(?:keep|...|drop))\b/,
+  // /(?:advice\s+(?:on|about|for))\b/, /(?:thoughts?\s+(?:on|about))\b/ and
+  // /(?:blanking|performing|disappointing|underperforming)\b/
+  ...specs('playerAction', [
+    ...phrases(['what '], ['', 'should '], ['i ', 'do '], ['', 'do '], ['with', 'about']),
+    ...phrases(['should i '], ['keep', 'sell', 'start', 'bench', 'captain', 'transfer', 'drop']),
+    ...phrases(['advice '], ['on', 'about', 'for']),
+    ...phrases(['thought ', 'thoughts '], ['on', 'about']),
+    'blanking', 'performing', 'disappointing', 'underperforming'
+  ], { wordEnd: true }),
+  // /(?:is\s+.+?\s+worth\s+(?:keeping|holding|starting))\b/
+  ...specs('playerWorthOpen', ['is ']),
+  ...specs('playerWorthClose', [' worth keeping', ' worth holding', ' worth starting'], { wordEnd: true }),
+  // /(?:wildcard|bench boost|triple captain|free hit|chip)\b/
+  ...specs('explicitChip', ['wildcard', 'bench boost', 'triple captain', 'free hit', 'chip'], { wordEnd: true }),
+  // Entity keywords, matched like the global regexes: leftmost first, earlier alternatives win, no overlaps
+  ...specs('chip', ['wildcard', 'bench boost', 'triple captain', 'free hit', 'wc', 'bb', 'tc', 'fh', 'chip']),
+  ...specs('position', ['goalkeeper', 'defender', 'midfielder', 'forward', 'gk', 'def', 'mid', 'fwd']),
+  ...specs('budget', ['£', 'budget', 'money', 'cost']),
+  ...specs('gameweek', ['gameweek', 'gw'])
+];
+
+export interface IntentMatch {
+  query: string;
+  comparison: boolean;
+  transfer: boolean;
+  fixture: boolean;
+  squadAnalysis: boolean;
+  playerSpecific: boolean;
+  playerAction: boolean;
+  explicitChip: boolean;
+  chips: KeywordHit[];
+  positions: KeywordHit[];
+  budgets: number[];
+  gameweeks: number[];
+  terms: Set<string>; // pattern keywords and FPL terms found anywhere in the query
+}
+
+export class IntentMatcher {
+  private readonly automaton: KeywordAutomaton;
+  private readonly tagOf: Int32Array; // spec index -> tag id
+  // Per tag, where its earliest hit ends and its latest hit starts; reset by every match()
+  private readonly firstEnd = new Int32Array(TAGS.length);
+  private readonly lastStart = new Int32Array(TAGS.length);
+
+  constructor(patterns: Array<{ keywords: string[] }>, terms: Iterable<string>) {
+    const substrings = new Set<string>([...patterns.flatMap(pattern => pattern.keywords), ...Array.from(terms)]);
+    const keywords = [...RULE_KEYWORDS, ...specs('term', Array.from(substrings))];
+    this.automaton = new KeywordAutomaton(keywords);
+    this.tagOf = Int32Array.from(keywords, keyword => TAG[keyword.tag as Tag]);
+  }
+
+  get phraseCount(): number {
+    return this.automaton.size;
+  }
+
+  /** Scan a normalized query once and evaluate every keyword rule against the hits. */
+  match(query: string): IntentMatch {
+    const { firstEnd, lastStart } = this;
+    firstEnd.fill(0x7fffffff);
+    lastStart.fill(-1);
+    const entityHits: KeywordHit[] = [];
+    const terms = new Set<string>();
+
+    this.automaton.forEachHit(query, (index, start, end) => {
+      const tag = this.tagOf[index];
+      if (end < firstEnd[tag]) firstEnd[tag] = end;
+      if (start > lastStart[tag]) lastStart[tag] = start;
+      if (tag === TAG.term) {
+        terms.add(this.automaton.spec(index).phrase);
+      } else if (tag >= TAG.chip) {
+        const { phrase, rank } = this.automaton.spec(index);
+        entityHits.push({ tag: TAGS[tag], phrase, start, end, rank });
+      }
+    });
+
+    const found = (tag: Tag) => lastStart[TAG[tag]] >= 0;
+    // `open .+? close`: some closing phrase starts at least one character after an opening phrase ends
+    const spanned = (open: Tag, close: Tag) => found(open) && found(close) && lastStart[TAG[close]] >= firstEnd[TAG[open]] + 1;
+    // `my team.*\w+`: a word character anywhere after the earliest "my team" / "my squad"
+    const myTeamFollowedByWord = () => {
+      for (let i = found('myTeam') ? firstEnd[TAG.myTeam] : query.length; i < query.length; i++) {
+        if (isWordChar(query.charCodeAt(i))) return true;
+      }
+      return false;
+    };
+    const entities = (tag: Tag) => entityHits.filter(hit => hit.tag === tag);
+
+    return {
+      query,
+      comparison: found('comparison'),
+      transfer: found('transfer'),
+      fixture: found('fixture'),
+      squadAnalysis: found('squadReview') ||
+        spanned('squadOpinionOpen', 'squadOpinionClose') ||
+        spanned('squadWorthOpen', 'squadWorthClose') ||
+        myTeamFollowedByWord(),
+      playerSpecific: found('adviceQuestion') && found('adviceAction'),
+      playerAction: found('playerAction') || spanned('playerWorthOpen', 'playerWorthClose'),
+      explicitChip: found('explicitChip'),
+      chips: leftmost(entities('chip')).map(({ hit }) => hit),
+      positions: leftmost(entities('position')).map(({ hit }) => hit),
+      budgets: leftmost(entities('budget'), hit => readNumber(query, hit.end, true)).map(({ value }) => value),
+      gameweeks: leftmost(entities('gameweek'), hit => readNumber(query, hit.end, false)).map(({ value }) => value),
+      terms
+    };
+  }
+}
+
+/**
+ * The matches a global regex over the group's alternation would return: scanning left to right, the
+ * first alternative that matches at a position wins and the next match starts after it. ``tail``
+ * extends a hit the way a regex continues after the keyword, returning undefined when it does not match.
+ */
+function leftmost(
+  group: KeywordHit[],
+  tail: (hit: KeywordHit) => { value: number; end: number } | undefined = hit => ({ value: 0, end: hit.end })
+): Array<{ hit: KeywordHit; value: number }> {
+  if (group.length === 0) return [];
+  const ordered = [...group].sort((a, b) => a.start - b.start || a.rank - b.rank);
+  const matches: Array<{ hit: KeywordHit; value: number }> = [];
+  let consumed = 0;
+  for (const hit of ordered) {
+    if (hit.start < consumed) continue;
+    const extended = tail(hit);
+    if (!extended) continue;
+    matches.push({ hit, value: extended.value });
+    consumed = extended.end;
+  }
+  return matches;
+}
+
+// `\s*(\d+)` or `\s*(\d+(?:\.\d+)?)` after a keyword
+function readNumber(text: string, from: number, decimals: boolean): { value: number; end: number } | undefined {
+  let i = from;
+  while (i < text.length && /\s/.test(text[i])) i++;
+  const digitsFrom = i;
+  while (i < text.length && text.charCodeAt(i) >= 48 && text.charCodeAt(i) <= 57) i++;
+  if (i === digitsFrom) return undefined;
+  if (decimals && text[i] === '.' && i + 1 < text.length && text.charCodeAt(i + 1) >= 48 && text.charCodeAt(i + 1) <= 57) {
+    i += 2;
+    while (i < text.length && text.charCodeAt(i) >= 48 && text.charCodeAt(i) <= 57) i++;
+  }
+  const value = decimals ? parseFloat(text.slice(digitsFrom, i)) : parseInt(text.slice(digitsFrom, i), 10);
+  return { value, end: i };
+}
@@ -0,0 +1,60 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+import { readSSEData } from "./llmStream";
+import { OllamaService } from "./ollamaService";
+import { OpenRouterService } from "./openRouterService";
+
+// A response body delivered in the given pieces, split wherever the test chooses
+function bodyOf(pieces: string[]): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream({
+    start(controller) {
+      for (const piece of pieces) controller.enqueue(encoder.encode(piece));
+      controller.close();
+    }
+  });
+}
+
+async function collect<T>(source: AsyncIterable<T>): Promise<T[]> {
+  const items: T[] = [];
+  for await (const item of source) items.push(item);
+  return items;
+}
+
+describe('LLM streaming', () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it('reassembles server-sent events split across chunks', async () => {
+    const events = await collect(readSSEData(bodyOf(['data: {"a"', ':1}\r\n\r\n: keep-alive\n\ndata: line one\ndata: line two\n', '\ndata: [DONE]'])));
+    expect(events).toEqual(['{"a":1}', 'line one\nline two', '[DONE]']);
+  });
+
+  it('hands tokens to onToken as Ollama and OpenRouter stream them', async () => {
+    vi.spyOn(console, 'log').mockImplementation(() => {});
+    const fetchSpy = vi.spyOn(globalThis, 'fetch');
+
+    fetchSpy.mockResolvedValueOnce(new Response(bodyOf([
+      '{"message":{"role":"assistant","content":"Bench "},"done":false}\n{"message":{"role":"assistant","con',
+      'tent":"boost"},"done":false}\n{"message":{"role":"assistant","content":""},"done":true}\n'
+    ])));
+    const ollamaTokens: string[] = [];
+    const ollama = new OllamaService({ model: 'stub', baseUrl: 'http://llm.test' });
+    const ollamaText = await ollama.generateFPLResponse('Chip?', { intent: 'chip_strategy' }, [], { onToken: token => ollamaTokens.push(token) });
+
+    expect(ollamaTokens).toEqual(['Bench ', 'boost']);
+    expect(ollamaText).toBe('Bench boost');
+    expect(JSON.parse((fetchSpy.mock.calls[0][1] as any).body).stream).toBe(true);
+
+    const delta = (content: string) => `data: ${JSON.stringify({ choices: [{ index: 0, delta: { content } }] })}\n\n`;
+    fetchSpy.mockResolvedValueOnce(new Response(bodyOf([delta('Hold '), delta('the wildcard'), 'data: [DONE]\n\n'])));
+    const openRouterTokens: string[] = [];
+    const openRouterText = await OpenRouterService.getInstance().generateCompletionSafe(
+      [{ role: 'user', content: 'Wildcard?' }],
+      { onToken: token => openRouterTokens.push(token) }
+    );
+
+    expect(openRouterTokens).toEqual(['Hold ', 'the wildcard']);
+    expect(openRouterText).toBe('Hold the wildcard');
+  });
+});
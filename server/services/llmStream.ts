@@ -0,0 +1,51 @@
+/**
+ * Readers for the streaming wire formats our LLM providers speak: server-sent
+ * events (OpenAI-compatible, used by OpenRouter) and newline-delimited JSON
+ * (Ollama). Both yield as soon as a complete line has arrived.
+ */
+
+export type TokenHandler = (token: string) => void;
+
+/** Complete lines from a response body, without their line endings. */
+export async function* readLines(body: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      let newline: number;
+      while ((newline = buffered.indexOf('\n')) >= 0) {
+        yield buffered.slice(0, newline).replace(/\r$/, '');
+        buffered = buffered.slice(newline + 1);
+      }
+    }
+    buffered += decoder.decode();
+    if (buffered.length > 0) yield buffered.replace(/\r$/, '');
+  } finally {
+    reader.releaseLock();
+  }
+}
+
+/** ``data:`` payloads of a server-sent event stream; multi-line data is joined with newlines. */
+export async function* readSSEData(body: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  let data: string[] = [];
+  for await (const line of readLines(body)) {
+    if (line === '') {
+      if (data.length) yield data.join('\n');
+      data = [];
+    } else if (line.startsWith('data:')) {
+      data.push(line.slice(5).replace(/^ /, ''));
+    }
+  }
+  if (data.length) yield data.join('\n');
+}
+
+/** Parsed objects of a newline-delimited JSON stream; blank lines are skipped. */
+export async function* readNDJSON<T = any>(body: ReadableStream<Uint8Array>): AsyncGenerator<T> {
+  for await (const line of readLines(body)) {
+    if (line.trim()) yield JSON.parse(line) as T;
+  }
+}
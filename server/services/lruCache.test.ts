@@ -0,0 +1,40 @@
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import { LruCache, getLruCacheStats } from "./lruCache";
+
+describe('LruCache', () => {
+  let now = 0;
+
+  beforeEach(() => {
+    vi.restoreAllMocks();
+    now = 0;
+    vi.spyOn(Date, 'now').mockImplementation(() => now);
+  });
+
+  it('evicts the least recently used entry once past the entry bound', () => {
+    const cache = new LruCache<number>('test-entries', { ttlMs: 1000, maxEntries: 2 });
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('c')).toBe(3);
+    expect(getLruCacheStats()['test-entries']).toMatchObject({ entries: 2, hits: 3, misses: 1, evictions: 1 });
+  });
+
+  it('bounds total bytes and expires entries by namespace or per-entry TTL', () => {
+    const cache = new LruCache<string>('test-bytes', { ttlMs: 1000, maxBytes: 10, sizeOf: value => value.length });
+    cache.set('short', 'aaaa');
+    cache.set('long', 'bbbbbbbb', 5000);
+
+    expect(cache.get('short')).toBeUndefined();
+    expect(cache.getStats()).toMatchObject({ entries: 1, bytes: 8, evictions: 1 });
+
+    cache.set('tiny', 'c');
+    now = 2000;
+    expect(cache.get('tiny')).toBeUndefined();
+    expect(cache.get('long')).toBe('bbbbbbbb');
+    expect(cache.getStats()).toMatchObject({ entries: 1, bytes: 8, expirations: 1 });
+  });
+});
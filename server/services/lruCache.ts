@@ -0,0 +1,158 @@
+/**
+ * Size-bounded LRU cache shared by the service-level caches.
+ *
+ * Each cache is a namespace with its own TTL and an entry and/or byte bound;
+ * inserting past a bound evicts the least recently used entries. Expired
+ * entries are dropped when read. Every cache registers itself by namespace so
+ * /api/debug/stats can report hits, misses, evictions and sizes for all of them.
+ */
+
+export interface LruCacheOptions<V> {
+  ttlMs: number; // default lifetime of an entry
+  maxEntries?: number;
+  maxBytes?: number; // needs sizeOf, or falls back to the JSON length of each value
+  sizeOf?: (value: V) => number;
+}
+
+export interface LruCacheStats {
+  namespace: string;
+  entries: number;
+  bytes: number;
+  maxEntries: number | null;
+  maxBytes: number | null;
+  ttlMs: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+}
+
+interface LruEntry<V> {
+  value: V;
+  storedAt: number;
+  expiresAt: number;
+  bytes: number;
+}
+
+const registry = new Map<string, LruCache<any>>();
+
+function jsonSize(value: unknown): number {
+  try {
+    return JSON.stringify(value)?.length ?? 0;
+  } catch {
+    return 0;
+  }
+}
+
+export class LruCache<V> {
+  private readonly entries = new Map<string, LruEntry<V>>();
+  private readonly counters = { hits: 0, misses: 0, evictions: 0, expirations: 0 };
+  private bytes = 0;
+  private readonly ttlMs: number;
+  private readonly maxEntries: number | null;
+  private readonly maxBytes: number | null;
+  private readonly sizeOf: ((value: V) => number) | null;
+
+  constructor(readonly namespace: string, options: LruCacheOptions<V>) {
+    this.ttlMs = options.ttlMs;
+    this.maxEntries = options.maxEntries !== undefined ? Math.max(1, options.maxEntries) : null;
+    this.maxBytes = options.maxBytes !== undefined ? Math.max(1, options.maxBytes) : null;
+    this.sizeOf = options.sizeOf ?? (this.maxBytes !== null ? jsonSize : null);
+    // The latest cache for a namespace is the one reported
+    registry.set(namespace, this);
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: string): V | undefined {
+    return this.getEntry(key)?.value;
+  }
+
+  /** Like ``get``, but also returns when the value was stored, for callers with their own freshness rules. */
+  getEntry(key: string): { value: V; storedAt: number } | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.counters.misses++;
+      return undefined;
+    }
+    if (Date.now() >= entry.expiresAt) {
+      this.remove(key, entry);
+      this.counters.expirations++;
+      this.counters.misses++;
+      return undefined;
+    }
+    // Re-insert to mark as most recently used
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.counters.hits++;
+    return { value: entry.value, storedAt: entry.storedAt };
+  }
+
+  has(key: string): boolean {
+    const entry = this.entries.get(key);
+    return entry !== undefined && Date.now() < entry.expiresAt;
+  }
+
+  /** Store ``value``; ``ttlMs`` overrides the namespace TTL for this entry. */
+  set(key: string, value: V, ttlMs: number = this.ttlMs): void {
+    const existing = this.entries.get(key);
+    if (existing) this.remove(key, existing);
+
+    const now = Date.now();
+    const entry: LruEntry<V> = { value, storedAt: now, expiresAt: now + ttlMs, bytes: this.sizeOf ? this.sizeOf(value) : 0 };
+    this.entries.set(key, entry);
+    this.bytes += entry.bytes;
+
+    // The entry just stored is kept even if it alone exceeds the byte bound
+    while (this.entries.size > 1 && this.overLimit()) {
+      const [oldestKey, oldest] = this.entries.entries().next().value as [string, LruEntry<V>];
+      this.remove(oldestKey, oldest);
+      this.counters.evictions++;
+    }
+  }
+
+  delete(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.remove(key, entry);
+    return true;
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  getStats(): LruCacheStats {
+    return {
+      namespace: this.namespace,
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxEntries: this.maxEntries,
+      maxBytes: this.maxBytes,
+      ttlMs: this.ttlMs,
+      ...this.counters
+    };
+  }
+
+  private overLimit(): boolean {
+    return (this.maxEntries !== null && this.entries.size > this.maxEntries)
+      || (this.maxBytes !== null && this.bytes > this.maxBytes);
+  }
+
+  private remove(key: string, entry: LruEntry<V>): void {
+    this.entries.delete(key);
+    this.bytes -= entry.bytes;
+  }
+}
+
+/** Stats for every registered namespace, keyed by namespace. */
+export function getLruCacheStats(): Record<string, LruCacheStats> {
+  const stats: Record<string, LruCacheStats> = {};
+  registry.forEach((cache, namespace) => {
+    stats[namespace] = cache.getStats();
+  });
+  return stats;
+}
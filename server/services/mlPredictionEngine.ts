@@ -11,6 +11,7 @@ import { OddsService } from './oddsService';
 import { OpenFPLEngine } from './openFPLEngine';
 import { MonteCarloEngine } from './monteCarloEngine';
 import { MLPrediction, MLModelPerformance, ProcessedPlayer } from '@shared/schema';
+import { LruCache, type LruCacheStats } from './lruCache';
 
 interface MLModel {
   predict(features: number[]): { prediction: number; confidence: number };
@@ -120,9 +121,12 @@ export class MLPredictionEngine {
   private oddsService: OddsService;
   private openFPLEngine: OpenFPLEngine;
   private monteCarloEngine: MonteCarloEngine;
-  private cache = new Map<string, MLPrediction>();
-  private cacheExpiry = new Map<string, number>();
   private readonly CACHE_DURATION = 30 * 60 * 1000; // 30 minutes for enhanced predictions
+  // Keys carry a 30 minute bucket, so old buckets age out through the LRU bound as well as the TTL
+  private cache = new LruCache<MLPrediction>('ml-predictions', {
+    ttlMs: this.CACHE_DURATION,
+    maxEntries: 5000
+  });
 
   private constructor() {
     this.model = new EnsembleModel(); // Use ensemble for better accuracy
@@ -158,12 +162,10 @@ export class MLPredictionEngine {
       const cacheKey = `${player.id}_${gameweeks}_${Date.now() - (Date.now() % (30 * 60 * 1000))}`; // 30min cache buckets
       
       // Check cache first
-      if (this.isCacheValid(cacheKey)) {
-        const cached = this.cache.get(cacheKey);
-        if (cached) {
-          predictions.push(cached);
-          continue;
-        }
+      const cached = this.cache.get(cacheKey);
+      if (cached) {
+        predictions.push(cached);
+        continue;
       }
 
       try {
@@ -171,7 +173,6 @@ export class MLPredictionEngine {
         
         // Cache the prediction
         this.cache.set(cacheKey, prediction);
-        this.cacheExpiry.set(cacheKey, Date.now() + this.CACHE_DURATION);
         
         predictions.push(prediction);
       } catch (error) {
@@ -505,23 +506,18 @@ export class MLPredictionEngine {
     // 5. Replace current model if performance improves
   }
 
-  /**
-   * Check if cached prediction is still valid
-   */
-  private isCacheValid(key: string): boolean {
-    const expiry = this.cacheExpiry.get(key);
-    return expiry ? Date.now() < expiry : false;
-  }
-
   /**
    * Clear prediction cache
    */
   public clearCache(): void {
     this.cache.clear();
-    this.cacheExpiry.clear();
     console.log('ML prediction cache cleared');
   }
 
+  public getCacheStats(): LruCacheStats {
+    return this.cache.getStats();
+  }
+
   /**
    * Get engine information for debugging
    */
@@ -1,5 +1,7 @@
 import { describe, expect, it } from "vitest";
 import { MonteCarloEngine } from "./monteCarloEngine";
+import { SeededRandom } from "./seededRandom";
+import { matchDistribution, simulateMatches } from "./simulationKernels";
 
 function resetSingleton() {
   Reflect.set(MonteCarloEngine as unknown as Record<string, unknown>, 'instance', undefined);
@@ -21,4 +23,63 @@ describe('MonteCarloEngine statistics', () => {
     expect(stats.floorProbability).toBeGreaterThanOrEqual(0);
     expect(stats.runs).toBe(engine.getSimulationRuns());
   });
+
+  it('replays identical runs from the same seeded stream', () => {
+    const setup = {
+      playerId: 1,
+      position: 'MID',
+      minutesProbability: 0.8,
+      expectedMinutes: 80,
+      events: [
+        { type: 'goal', probability: 1, points: 1, bonusMultiplier: 0 },
+        { type: 'goal', probability: 0.3, points: 5, bonusMultiplier: 1.8 },
+        { type: 'assist', probability: 0.25, points: 3, bonusMultiplier: 1.5 },
+      ],
+    };
+
+    const first = Array.from(simulateMatches(setup, 200, SeededRandom.derive(7, 1)));
+    expect(Array.from(simulateMatches(setup, 200, SeededRandom.derive(7, 1)))).toEqual(first);
+    expect(Array.from(simulateMatches(setup, 200, SeededRandom.derive(8, 1)))).not.toEqual(first);
+  });
+});
+
+describe('MonteCarloEngine exact distribution', () => {
+  it('applies the minutes gate and bonus tiers exactly', () => {
+    const distribution = matchDistribution({
+      minutesProbability: 0.5,
+      events: [
+        { probability: 1, points: 1, bonusMultiplier: 0 },
+        { probability: 0.5, points: 4, bonusMultiplier: 2 },
+      ],
+    });
+
+    // Benched 0.5; played without the event 0.25 -> 1 pt; with it, bonus haul 8 -> 40% chance of +2
+    expect(Array.from(distribution.points)).toEqual([0, 1, 5, 7]);
+    const probabilities = Array.from(distribution.probabilities);
+    [0.5, 0.25, 0.15, 0.1].forEach((expected, i) => expect(probabilities[i]).toBeCloseTo(expected, 12));
+  });
+
+  it('agrees with sampled runs and reports exact statistics', () => {
+    resetSingleton();
+    const engine = MonteCarloEngine.getInstance() as unknown as { calculateStatistics(id: number, source: unknown): any };
+    const setup = {
+      minutesProbability: 0.8,
+      events: [
+        { probability: 1, points: 2, bonusMultiplier: 0 },
+        { probability: 0.3, points: 5, bonusMultiplier: 1.8 },
+        { probability: 0.25, points: 3, bonusMultiplier: 1.5 },
+        { probability: 0.15, points: -1, bonusMultiplier: 0 },
+      ],
+    };
+    const distribution = matchDistribution(setup);
+    const exact = engine.calculateStatistics(1, distribution);
+    const sampled = simulateMatches(setup, 200_000, SeededRandom.derive(3, 1));
+    const sampledMean = sampled.reduce((sum, value) => sum + value, 0) / sampled.length;
+
+    expect(distribution.probabilities.reduce((sum, p) => sum + p, 0)).toBeCloseTo(1, 12);
+    expect(Math.abs(exact.expectedPoints - sampledMean)).toBeLessThan(0.03);
+    expect(exact.method).toBe('exact');
+    expect(exact.mode).toBe(2);
+    expect(exact.simulations).toHaveLength(engine.calculateStatistics(1, [1, 2]).runs);
+  });
 });
@@ -5,8 +5,13 @@
  * to generate distributions of potential outcomes for each player
  */
 
-import { ProcessedPlayer, PlayerAdvanced, MatchOdds } from '@shared/schema';
+import { ProcessedPlayer, PlayerAdvanced, MatchOdds, PlayerSimulation, SimulatedDistribution } from '@shared/schema';
 import { OpenFPLEngine } from './openFPLEngine';
+import { SeededRandom } from './seededRandom';
+import { matchDistribution, type PointsDistribution, type RandomState } from './simulationKernels';
+import { SimulationQueueFullError, SimulationWorkerPool } from './simulationWorkerPool';
+import { SimulationCache, simulationInputHash, type SimulationCacheStats } from './simulationCache';
+import { DataRepository } from './repositories/dataRepository';
 
 interface SimulationEvent {
   type: 'goal' | 'assist' | 'clean_sheet' | 'yellow_card' | 'red_card' | 'own_goal' | 'penalty_miss' | 'penalty_save' | 'save';
@@ -23,7 +28,7 @@ interface PlayerSimulationSetup {
   events: SimulationEvent[];
 }
 
-interface SimulationResult {
+export interface SimulationResult {
   playerId: number;
   simulations: number[];
   expectedPoints: number;
@@ -44,12 +49,23 @@ interface SimulationResult {
   consistency: number; // Coefficient of variation inverse
   coefficientOfVariation?: number;
   runs: number;
+  method?: 'exact' | 'sampled'; // exact: closed-form distribution; sampled: Monte Carlo runs
+  seed?: number; // Seed the runs were drawn with, if any (sampled only)
+  inputHash?: string; // Fingerprint of the inputs, used as the cache key
+  distribution?: SimulatedDistribution;
 }
 
 export class MonteCarloEngine {
   private static instance: MonteCarloEngine;
   private openFPLEngine: OpenFPLEngine;
   private readonly SIMULATION_RUNS = 1000; // Reduced for performance, still statistically meaningful
+  // The exact distribution is the default; MONTE_CARLO_METHOD=sampled restores random runs
+  private readonly method: 'exact' | 'sampled' = process.env.MONTE_CARLO_METHOD === 'sampled' ? 'sampled' : 'exact';
+  // SIMULATION_CACHE_SIZE=0 turns off the memory tier; SIMULATION_CACHE_DB=false keeps results out of player_simulations
+  private readonly cache = new SimulationCache(
+    Number(process.env.SIMULATION_CACHE_SIZE ?? 2000),
+    process.env.SIMULATION_CACHE_DB === 'false' ? null : () => DataRepository.getInstance()
+  );
   
   private constructor() {
     this.openFPLEngine = OpenFPLEngine.getInstance();
@@ -62,27 +78,25 @@ export class MonteCarloEngine {
     return MonteCarloEngine.instance;
   }
 
+  /**
+   * ``persist: false`` keeps a fresh result out of player_simulations, for callers that write the row
+   * themselves (SimulationService); it is still cached in memory.
+   */
   async simulatePlayer(
     player: ProcessedPlayer,
     fixtures: any[],
     advancedStats?: PlayerAdvanced,
-    odds?: MatchOdds[]
+    odds?: MatchOdds[],
+    seed?: number,
+    options: { persist?: boolean } = {}
   ): Promise<SimulationResult> {
     try {
-      // Get baseline prediction from OpenFPL
-      const baselinePrediction = await this.openFPLEngine.predictPlayer(player, fixtures, advancedStats, odds);
-      
-      // Set up simulation parameters
-      const setup = this.setupPlayerSimulation(player, baselinePrediction, advancedStats, odds);
-      
-      // Run Monte Carlo simulations
-      const simulations = this.runSimulations(setup);
-      
-      // Calculate statistics
-      const result = this.calculateStatistics(player.id, simulations);
-      
+      const setup = await this.preparePlayerSimulation(player, fixtures, advancedStats, odds);
+      const [result] = await this.evaluateSetups([setup], seed, options.persist ?? true);
       return result;
     } catch (error) {
+      // Backpressure, not a failure: the caller answers 503 rather than serving made-up numbers
+      if (error instanceof SimulationQueueFullError) throw error;
       console.error(`Monte Carlo simulation error for player ${player.id}:`, error);
       
       // Fallback to deterministic result
@@ -90,6 +104,75 @@ export class MonteCarloEngine {
     }
   }
 
+  private async preparePlayerSimulation(
+    player: ProcessedPlayer,
+    fixtures: any[],
+    advancedStats?: PlayerAdvanced,
+    odds?: MatchOdds[]
+  ): Promise<PlayerSimulationSetup> {
+    // Get baseline prediction from OpenFPL
+    const baselinePrediction = await this.openFPLEngine.predictPlayer(player, fixtures, advancedStats, odds);
+    
+    // Set up simulation parameters
+    return this.setupPlayerSimulation(player, baselinePrediction, advancedStats, odds);
+  }
+
+  // Seeded streams are keyed by player so batches stay reproducible
+  private streamState(playerId: number, seed?: number): RandomState | null {
+    return seed !== undefined ? SeededRandom.derive(seed, playerId).getState() : null;
+  }
+
+  // Serve unchanged inputs from the cache and only simulate the rest
+  private async evaluateSetups(setups: PlayerSimulationSetup[], seed?: number, persist = true): Promise<SimulationResult[]> {
+    const hashes = setups.map(setup => simulationInputHash(setup, {
+      playerId: setup.playerId,
+      method: this.method,
+      runs: this.SIMULATION_RUNS,
+      seed
+    }));
+    const cached = await this.cache.lookup(
+      setups.map((setup, index) => ({ playerId: setup.playerId, inputHash: hashes[index] })),
+      stored => this.restoreResult(stored)
+    );
+
+    // Identical inputs within the batch are computed once
+    const missing = new Map<string, PlayerSimulationSetup>();
+    setups.forEach((setup, index) => {
+      if (!cached[index] && !missing.has(hashes[index])) missing.set(hashes[index], setup);
+    });
+    const computed = await this.computeResults(Array.from(missing.values()), seed);
+    const fresh = new Map<string, SimulationResult>();
+    Array.from(missing.keys()).forEach((inputHash, index) => {
+      const result = { ...computed[index], inputHash };
+      void this.cache.store(result, persist);
+      fresh.set(inputHash, result);
+    });
+
+    // Shared entries are re-labelled for the player that asked
+    return setups.map((setup, index) => ({ ...(cached[index] ?? fresh.get(hashes[index])!), playerId: setup.playerId }));
+  }
+
+  private async computeResults(setups: PlayerSimulationSetup[], seed?: number): Promise<SimulationResult[]> {
+    if (setups.length === 0) return [];
+    if (this.method === 'exact') {
+      // Events are independent, so the whole distribution comes from convolution with no sampling
+      return setups.map(setup => this.calculateStatistics(setup.playerId, matchDistribution(setup)));
+    }
+
+    // Run Monte Carlo simulations on the worker pool (small jobs stay inline)
+    const runs = this.SIMULATION_RUNS;
+    const { totals } = await SimulationWorkerPool.getInstance().execute({
+      kind: 'matches',
+      setups,
+      runs,
+      states: setups.map(setup => this.streamState(setup.playerId, seed))
+    });
+    return setups.map((setup, index) => {
+      const result = this.calculateStatistics(setup.playerId, Array.from(totals.subarray(index * runs, (index + 1) * runs)));
+      return seed !== undefined ? { ...result, seed } : result;
+    });
+  }
+
   private setupPlayerSimulation(
     player: ProcessedPlayer,
     baseline: any,
@@ -329,90 +412,66 @@ export class MonteCarloEngine {
     });
   }
 
-  private runSimulations(setup: PlayerSimulationSetup): number[] {
-    const results: number[] = [];
-    
-    for (let i = 0; i < this.SIMULATION_RUNS; i++) {
-      results.push(this.simulateSingleMatch(setup));
-    }
-    
-    return results;
-  }
-
-  private simulateSingleMatch(setup: PlayerSimulationSetup): number {
-    // First, determine if player starts
-    if (Math.random() > setup.minutesProbability) {
-      return 0; // Player doesn't play
-    }
-
-    let totalPoints = 0;
-    let bonusPoints = 0;
-
-    // Simulate each event
-    for (const event of setup.events) {
-      if (Math.random() < event.probability) {
-        totalPoints += event.points;
-        
-        // Calculate bonus potential
-        if (event.bonusMultiplier && event.bonusMultiplier > 0) {
-          bonusPoints += event.points * (event.bonusMultiplier || 0);
-        }
-      }
-    }
-
-    // Add bonus points (simplified bonus calculation)
-    const bonusProb = Math.min(0.4, bonusPoints / 15); // Higher performance = higher bonus chance
-    if (Math.random() < bonusProb) {
-      const bonusValue = bonusPoints > 10 ? 3 : bonusPoints > 6 ? 2 : 1;
-      totalPoints += bonusValue;
-    }
-
-    return Math.max(0, totalPoints);
+  private restoreResult(stored: PlayerSimulation & { distribution: SimulatedDistribution }): SimulationResult {
+    const distribution = {
+      points: Float64Array.from(stored.distribution.points),
+      probabilities: Float64Array.from(stored.distribution.probabilities)
+    };
+    return {
+      ...this.calculateStatistics(stored.playerId, distribution),
+      method: stored.distribution.method,
+      inputHash: stored.inputHash
+    };
   }
 
-  private calculateStatistics(playerId: number, simulations: number[]): SimulationResult {
-    // Sort simulations for percentile calculations
-    const sorted = [...simulations].sort((a, b) => a - b);
-    const n = sorted.length;
+  private calculateStatistics(playerId: number, source: number[] | PointsDistribution): SimulationResult {
+    // Samples become an empirical distribution, so sampled and exact results share one code path
+    const distribution = Array.isArray(source) ? this.empiricalDistribution(source) : source;
+    const simulations = Array.isArray(source) ? source : this.quantileSample(distribution, this.SIMULATION_RUNS);
+    const { points, probabilities } = distribution;
     
     // Basic statistics
-    const sum = simulations.reduce((a, b) => a + b, 0);
-    const expectedPoints = sum / n;
-    const median = this.calculatePercentile(sorted, 50);
-    
-    // Mode (most common score)
-    const mode = this.calculateMode(simulations);
+    let expectedPoints = 0;
+    let mode = 0;
+    for (let i = 0; i < points.length; i++) {
+      expectedPoints += points[i] * probabilities[i];
+      if (probabilities[i] > probabilities[mode]) mode = i;
+    }
+    const median = this.quantile(distribution, 0.5);
     
     // Standard deviation
-    const variance = simulations.reduce((acc, points) => acc + Math.pow(points - expectedPoints, 2), 0) / n;
+    let variance = 0;
+    for (let i = 0; i < points.length; i++) {
+      variance += probabilities[i] * Math.pow(points[i] - expectedPoints, 2);
+    }
     const standardDeviation = Math.sqrt(variance);
     
     // Percentiles
     const percentiles = {
-      p10: this.calculatePercentile(sorted, 10),
-      p25: this.calculatePercentile(sorted, 25),
-      p50: this.calculatePercentile(sorted, 50),
-      p75: this.calculatePercentile(sorted, 75),
-      p90: this.calculatePercentile(sorted, 90)
+      p10: this.quantile(distribution, 0.1),
+      p25: this.quantile(distribution, 0.25),
+      p50: median,
+      p75: this.quantile(distribution, 0.75),
+      p90: this.quantile(distribution, 0.9)
     };
     
     // Probability calculations
-    const haulingProbability = simulations.filter(p => p >= 10).length / n;
-    const ceilingProbability = simulations.filter(p => p >= 15).length / n;
-    const floorProbability = simulations.filter(p => p <= 2).length / n;
+    const haulingProbability = this.probabilityWhere(distribution, p => p >= 10);
+    const ceilingProbability = this.probabilityWhere(distribution, p => p >= 15);
+    const floorProbability = this.probabilityWhere(distribution, p => p <= 2);
     
     // Captain expected value (2x points)
     const captainEV = expectedPoints * 2;
     
     // Consistency (inverse of coefficient of variation)
-    const consistency = expectedPoints > 0 ? 1 / (standardDeviation / expectedPoints) : 0;
+    const consistency = expectedPoints > 0 && standardDeviation > 0 ? 1 / (standardDeviation / expectedPoints) : 0;
     
     return {
       playerId,
       simulations,
       expectedPoints: Math.round(expectedPoints * 100) / 100,
       median: Math.round(median * 100) / 100,
-      mode,
+      mode: Math.round(points[mode] ?? 0),
       standardDeviation: Math.round(standardDeviation * 100) / 100,
       percentiles: {
         p10: Math.round(percentiles.p10 * 100) / 100,
@@ -426,36 +485,49 @@ export class MonteCarloEngine {
       floorProbability: Math.round(floorProbability * 1000) / 1000,
       captainEV: Math.round(captainEV * 100) / 100,
       consistency: Math.round(consistency * 100) / 100,
-      runs: this.SIMULATION_RUNS
+      runs: this.SIMULATION_RUNS,
+      method: Array.isArray(source) ? 'sampled' : 'exact',
+      distribution: {
+        method: Array.isArray(source) ? 'sampled' : 'exact',
+        points: Array.from(points),
+        probabilities: Array.from(probabilities)
+      }
     };
   }
 
-  private calculatePercentile(sortedArray: number[], percentile: number): number {
-    const index = (percentile / 100) * (sortedArray.length - 1);
-    const lower = Math.floor(index);
-    const upper = Math.ceil(index);
-    const weight = index % 1;
-    
-    if (upper >= sortedArray.length) return sortedArray[sortedArray.length - 1];
-    
-    return sortedArray[lower] * (1 - weight) + sortedArray[upper] * weight;
+  private empiricalDistribution(simulations: number[]): PointsDistribution {
+    const counts = new Map<number, number>();
+    for (const points of simulations) {
+      counts.set(points, (counts.get(points) ?? 0) + 1);
+    }
+    const support = Array.from(counts.keys()).sort((a, b) => a - b);
+    return {
+      points: Float64Array.from(support),
+      probabilities: Float64Array.from(support, points => counts.get(points)! / simulations.length)
+    };
   }
 
-  private calculateMode(simulations: number[]): number {
-    const frequency: Record<number, number> = {};
-    let maxFreq = 0;
-    let mode = 0;
-    
-    for (const points of simulations) {
-      const rounded = Math.round(points);
-      frequency[rounded] = (frequency[rounded] || 0) + 1;
-      if (frequency[rounded] > maxFreq) {
-        maxFreq = frequency[rounded];
-        mode = rounded;
-      }
+  // Smallest score whose cumulative probability reaches q
+  private quantile(distribution: PointsDistribution, q: number): number {
+    let cumulative = 0;
+    for (let i = 0; i < distribution.points.length; i++) {
+      cumulative += distribution.probabilities[i];
+      if (cumulative >= q - 1e-12) return distribution.points[i];
     }
-    
-    return mode;
+    return distribution.points[distribution.points.length - 1] ?? 0;
+  }
+
+  private probabilityWhere(distribution: PointsDistribution, predicate: (points: number) => boolean): number {
+    let probability = 0;
+    distribution.points.forEach((points, i) => {
+      if (predicate(points)) probability += distribution.probabilities[i];
+    });
+    return probability;
+  }
+
+  // Evenly spaced quantiles stand in for raw runs, keeping the simulations field for existing consumers
+  private quantileSample(distribution: PointsDistribution, size: number): number[] {
+    return Array.from({ length: size }, (_, i) => this.quantile(distribution, (i + 0.5) / size));
   }
 
   private createFallbackResult(playerId: number, expectedPoints: number): SimulationResult {
@@ -487,7 +559,8 @@ export class MonteCarloEngine {
     players: ProcessedPlayer[],
     fixtures: any[],
     advancedStats?: Map<number, PlayerAdvanced>,
-    odds?: MatchOdds[]
+    odds?: MatchOdds[],
+    seed?: number
   ): Promise<Map<number, SimulationResult>> {
     const results = new Map<number, SimulationResult>();
     
@@ -496,22 +569,31 @@ export class MonteCarloEngine {
     for (let i = 0; i < players.length; i += batchSize) {
       const batch = players.slice(i, i + batchSize);
       
-      const batchPromises = batch.map(async (player) => {
-        const playerStats = advancedStats?.get(player.id);
-        const result = await this.simulatePlayer(player, fixtures, playerStats, odds);
-        return { playerId: player.id, result };
-      });
-      
-      const batchResults = await Promise.all(batchPromises);
+      const setups = await Promise.all(batch.map(async (player) => {
+        try {
+          return await this.preparePlayerSimulation(player, fixtures, advancedStats?.get(player.id), odds);
+        } catch (error) {
+          console.error(`Monte Carlo simulation error for player ${player.id}:`, error);
+          results.set(player.id, this.createFallbackResult(player.id, 3.0));
+          return null;
+        }
+      }));
+      const ready = setups.filter((setup): setup is PlayerSimulationSetup => setup !== null);
+      if (ready.length === 0) continue;
       
-      for (const { playerId, result } of batchResults) {
-        results.set(playerId, result);
+      // One evaluation per batch, so sampled batches are worth shipping to a worker
+      for (const result of await this.evaluateSetups(ready, seed)) {
+        results.set(result.playerId, result);
       }
     }
     
     return results;
   }
 
+  getCacheStats(): SimulationCacheStats {
+    return this.cache.getStats();
+  }
+
   getSimulationRuns(): number {
     return this.SIMULATION_RUNS;
   }
@@ -521,7 +603,9 @@ export class MonteCarloEngine {
     return {
       version: 'MonteCarloEngine-v1.0',
       simulationRuns: this.SIMULATION_RUNS,
-      methodology: 'Event-based probabilistic simulation',
+      methodology: this.method === 'exact'
+        ? 'Event-based exact distribution (convolution of independent events)'
+        : 'Event-based probabilistic simulation',
       eventTypes: ['goals', 'assists', 'clean_sheets', 'cards', 'bonus_points'],
       lastUpdated: new Date().toISOString()
     };
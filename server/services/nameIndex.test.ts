@@ -0,0 +1,45 @@
+import { describe, expect, it } from "vitest";
+import { NameIndex, TrigramIndex, withinEditDistance } from "./nameIndex";
+
+function editDistance(a: string, b: string): number {
+  const rows = Array.from({ length: a.length + 1 }, (_, i) => [i, ...Array(b.length).fill(0)]);
+  for (let j = 1; j <= b.length; j++) rows[0][j] = j;
+  for (let i = 1; i <= a.length; i++) {
+    for (let j = 1; j <= b.length; j++) {
+      rows[i][j] = Math.min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1));
+    }
+  }
+  return rows[a.length][b.length];
+}
+
+describe('NameIndex', () => {
+  it('finds exactly the terms within the edit distance', () => {
+    const terms = ['salah', 'salas', 'sala', 'palmer', 'palmar', 'haaland', 'halland', 'aaaa', 'aaaaa', 'alexander'];
+    const index = new TrigramIndex(1);
+    terms.forEach(term => index.add(term));
+
+    for (const word of ['salah', 'sallah', 'slah', 'palmre', 'haland', 'aaa', 'aaaaaa', 'alexandre', 'xyz']) {
+      expect([word, index.search(word).sort()]).toEqual([word, terms.filter(term => editDistance(word, term) <= 1).sort()]);
+      for (const term of terms) {
+        for (const k of [0, 1, 2]) expect(withinEditDistance(word, term, k)).toBe(editDistance(word, term) <= k);
+      }
+    }
+  });
+
+  it('matches names on word boundaries, ignoring accents, and misspelt multi-word names', () => {
+    const mbappe = { web_name: 'Mbappé' };
+    const salah = { web_name: 'M.Salah' };
+    const trent = { web_name: 'Alexander-Arnold' };
+    const dictionary = new Map([
+      ['mbappé', mbappe], ['kylian mbappé', mbappe],
+      ['m.salah', salah], ['salah', salah], ['mohamed salah', salah],
+      ['alexander-arnold', trent], ['trent alexander-arnold', trent], ['trent', trent]
+    ]);
+    const index = new NameIndex(dictionary, { accentInsensitive: true, fuzzyParts: true });
+
+    expect(index.match('trent or mbappe')).toEqual([mbappe, trent]);
+    expect(index.match('salahs form')).toEqual([]);
+    expect(index.match('mohammed sallah', ['mohammed', 'sallah'])).toEqual([salah]);
+    expect(index.match('mohammed is fine', ['mohammed', 'fine'])).toEqual([]);
+  });
+});
@@ -0,0 +1,208 @@
+/**
+ * Prebuilt indexes for NaturalLanguageProcessor's player and team lookups.
+ *
+ * Entity extraction used to walk the whole dictionary (about four name variants
+ * for each of ~700 players) for every query, building two word-boundary regexes
+ * per entry and running a full Levenshtein matrix for the fuzzy pass. NameIndex
+ * is built once when the dictionaries load. Exact names go into the same
+ * Aho–Corasick automaton the intent keywords use, so one scan of the query finds
+ * all of them. Parts of multi-word names go into a trigram inverted index, which
+ * narrows a query word down to the few parts that could be one edit away before
+ * a banded edit-distance check confirms them.
+ */
+
+import { KeywordAutomaton } from "./intentMatcher";
+
+const PAD = '\u0002'; // never occurs in a query, so padded trigrams only match at word edges
+const WORD_EDGES = /^\w[\s\S]*\w$|^\w$/;
+
+function stripAccents(text: string): string {
+  return text.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+}
+
+/**
+ * Whether the edit distance between ``a`` and ``b`` is at most ``maxDistance``. Only the diagonal band
+ * the answer can lie in is computed, and it stops as soon as a whole row is over the limit.
+ */
+export function withinEditDistance(a: string, b: string, maxDistance: number): boolean {
+  if (a === b) return true;
+  if (Math.abs(a.length - b.length) > maxDistance || maxDistance <= 0) return false;
+
+  const over = maxDistance + 1;
+  let previous = new Int32Array(b.length + 1);
+  let current = new Int32Array(b.length + 1);
+  for (let j = 0; j <= b.length; j++) previous[j] = Math.min(j, over);
+
+  for (let i = 1; i <= a.length; i++) {
+    const from = Math.max(1, i - maxDistance);
+    const to = Math.min(b.length, i + maxDistance);
+    current[from - 1] = from === 1 ? Math.min(i, over) : over;
+    let rowMin = current[from - 1];
+    for (let j = from; j <= to; j++) {
+      const substitution = previous[j - 1] + (a.charCodeAt(i - 1) === b.charCodeAt(j - 1) ? 0 : 1);
+      const value = Math.min(substitution, previous[j] + 1, current[j - 1] + 1, over);
+      current[j] = value;
+      if (value < rowMin) rowMin = value;
+    }
+    if (to < b.length) current[to + 1] = over; // outside the band for the next row
+    if (rowMin > maxDistance) return false;
+    [previous, current] = [current, previous];
+  }
+  return previous[b.length] <= maxDistance;
+}
+
+/**
+ * Trigram inverted index over short terms for "within k edits" lookups. Terms are padded so every
+ * character sits in three trigrams; one edit then changes at most three of them, so a term within
+ * ``k`` edits of the query shares at least ``max(len) + 2 - 3k`` trigrams (counted with repeats)
+ * and only terms passing that count are checked with withinEditDistance.
+ */
+export class TrigramIndex {
+  private readonly terms: string[] = [];
+  private readonly ids = new Map<string, number>();
+  private readonly postings = new Map<string, number[]>();
+
+  constructor(private readonly maxDistance: number = 1) {}
+
+  get size(): number {
+    return this.terms.length;
+  }
+
+  add(term: string): void {
+    if (this.ids.has(term)) return;
+    const id = this.terms.length;
+    this.terms.push(term);
+    this.ids.set(term, id);
+    for (const gram of TrigramIndex.grams(term)) {
+      const list = this.postings.get(gram);
+      if (list) list.push(id);
+      else this.postings.set(gram, [id]);
+    }
+  }
+
+  /** Indexed terms within ``maxDistance`` edits of ``word``. */
+  search(word: string): string[] {
+    const k = this.maxDistance;
+    if (word.length + 2 - 3 * k <= 0) {
+      // Too short for the count filter to prune anything
+      return this.terms.filter(term => withinEditDistance(word, term, k));
+    }
+
+    const shared = new Map<number, number>();
+    for (const gram of TrigramIndex.grams(word)) {
+      for (const id of this.postings.get(gram) ?? []) shared.set(id, (shared.get(id) ?? 0) + 1);
+    }
+    const found: string[] = [];
+    shared.forEach((count, id) => {
+      const term = this.terms[id];
+      if (count >= Math.max(word.length, term.length) + 2 - 3 * k && withinEditDistance(word, term, k)) found.push(term);
+    });
+    return found;
+  }
+
+  // Padded trigrams, each tagged with its occurrence number so shared counts respect repeats
+  private static grams(term: string): string[] {
+    const padded = PAD + PAD + term + PAD + PAD;
+    const seen = new Map<string, number>();
+    const grams: string[] = [];
+    for (let i = 0; i + 3 <= padded.length; i++) {
+      const gram = padded.slice(i, i + 3);
+      const occurrence = (seen.get(gram) ?? 0) + 1;
+      seen.set(gram, occurrence);
+      grams.push(`${gram}${occurrence}`);
+    }
+    return grams;
+  }
+}
+
+export interface NameIndexOptions {
+  accentInsensitive?: boolean; // also match names with their accents stripped
+  fuzzyParts?: boolean; // index the parts of multi-word names for match(query, words)
+}
+
+/**
+ * Dictionary of lower-case names (several may map to one value) answering, for a normalized query,
+ * which entries it mentions. Results come back in dictionary order, as the linear scan returned them.
+ */
+export class NameIndex<T> {
+  private readonly entries: Array<[string, T]>;
+  private readonly automaton: KeywordAutomaton;
+  private readonly phraseEntry: number[] = []; // automaton phrase -> entry
+  private readonly phraseStripped: boolean[] = []; // whether the phrase is a name with its accents stripped
+  private readonly irregular: Array<{ id: number; pattern: RegExp; stripped: boolean }> = [];
+  private readonly parts = new TrigramIndex(1);
+  private readonly entriesByPart = new Map<string, number[]>();
+
+  constructor(dictionary: Map<string, T>, private readonly options: NameIndexOptions = {}) {
+    this.entries = Array.from(dictionary.entries());
+    const names: Array<{ phrase: string; tag: string; wordStart: boolean; wordEnd: boolean }> = [];
+
+    this.entries.forEach(([name], id) => {
+      const variants: Array<[string, boolean]> = [[name, false]];
+      if (options.accentInsensitive) variants.push([stripAccents(name), true]);
+      for (const [variant, stripped] of variants) {
+        if (WORD_EDGES.test(variant)) {
+          names.push({ phrase: variant, tag: 'name', wordStart: true, wordEnd: true });
+          this.phraseEntry.push(id);
+          this.phraseStripped.push(stripped);
+        } else {
+          // \b next to a non-word character means something else; keep the regex for these few
+          const escaped = variant.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+          this.irregular.push({ id, pattern: new RegExp(`\\b${escaped}\\b`, 'i'), stripped });
+        }
+      }
+
+      const nameParts = name.split(' ');
+      if (options.fuzzyParts && nameParts.length > 1) {
+        for (const part of nameParts) {
+          if (part.length < 4) continue;
+          this.parts.add(part);
+          const list = this.entriesByPart.get(part);
+          if (list) list.push(id);
+          else this.entriesByPart.set(part, [id]);
+        }
+      }
+    });
+    this.automaton = new KeywordAutomaton(names);
+  }
+
+  get size(): number {
+    return this.entries.length;
+  }
+
+  /**
+   * Entries whose name occurs in ``query`` on word boundaries, plus, when ``words`` are given, multi-word
+   * names with at least two parts (of 4+ letters) within one edit of one of those words.
+   */
+  match(query: string, words?: string[]): T[] {
+    const matched = new Set<number>();
+    const stripped = this.options.accentInsensitive ? stripAccents(query).toLowerCase() : query;
+
+    // The raw names are looked for in the query and the stripped ones in the stripped query
+    this.automaton.forEachHit(query, index => {
+      if (!this.phraseStripped[index] || stripped === query) matched.add(this.phraseEntry[index]);
+    });
+    if (stripped !== query) {
+      this.automaton.forEachHit(stripped, index => {
+        if (this.phraseStripped[index]) matched.add(this.phraseEntry[index]);
+      });
+    }
+    for (const { id, pattern, stripped: isStripped } of this.irregular) {
+      if (pattern.test(isStripped ? stripped : query)) matched.add(id);
+    }
+
+    if (words && this.options.fuzzyParts) {
+      const nearParts = new Set<string>();
+      for (const word of new Set(words)) {
+        if (word.length >= 4) this.parts.search(word).forEach(part => nearParts.add(part));
+      }
+      const partCounts = new Map<number, number>();
+      nearParts.forEach(part => {
+        for (const id of this.entriesByPart.get(part) ?? []) partCounts.set(id, (partCounts.get(id) ?? 0) + 1);
+      });
+      partCounts.forEach((count, id) => { if (count >= 2) matched.add(id); });
+    }
+
+    return Array.from(matched).sort((a, b) => a - b).map(id => this.entries[id][1]);
+  }
+}
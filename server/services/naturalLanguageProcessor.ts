@@ -7,6 +7,8 @@
 
 import { QueryIntent, FPLConcept, FPLPlayer, FPLTeam } from '@shared/schema';
 import { FPLApiService } from './fplApi';
+import { IntentMatcher, type IntentMatch } from './intentMatcher';
+import { NameIndex } from './nameIndex';
 
 // Simple keyword-based NLP for demonstration (would use proper NLP library in production)
 interface KeywordPattern {
@@ -29,12 +31,16 @@ export class NaturalLanguageProcessor {
   private fplTerms: Map<string, string> = new Map();
   private playerDictionary: Map<string, FPLPlayer> = new Map();
   private teamDictionary: Map<string, FPLTeam> = new Map();
+  private playerIndex: NameIndex<FPLPlayer> = new NameIndex(new Map());
+  private teamIndex: NameIndex<FPLTeam> = new NameIndex(new Map());
+  private intentMatcher: IntentMatcher;
   private isLoaded: boolean = false;
   private readyPromise: Promise<void>;
 
   private constructor() {
     this.initializePatterns();
     this.initializeFPLTerms();
+    this.intentMatcher = new IntentMatcher(this.patterns, this.fplTerms.keys());
     this.readyPromise = this.loadDictionaries(); // Load real FPL data on startup
   }
 
@@ -53,15 +59,18 @@ export class NaturalLanguageProcessor {
     await this.readyPromise;
     
     const normalizedQuery = this.normalizeQuery(query);
+
+    // One pass over the query finds every keyword the rules below look at
+    const keywords = this.intentMatcher.match(normalizedQuery);
     
     // Intent classification
-    const intent = this.classifyIntent(normalizedQuery);
+    const intent = this.classifyIntent(normalizedQuery, keywords);
     
     // Entity extraction
-    const entities = this.extractEntities(normalizedQuery, intent);
+    const entities = this.extractEntities(normalizedQuery, intent, keywords);
     
     // Confidence calculation
-    const confidence = this.calculateConfidence(normalizedQuery, intent, entities);
+    const confidence = this.calculateConfidence(normalizedQuery, intent, entities, keywords);
 
     return {
       type: intent,
@@ -86,11 +95,9 @@ export class NaturalLanguageProcessor {
   /**
    * Classify the intent using rule-based approach with precedence
    */
-  private classifyIntent(query: string): QueryIntent['type'] {
-    const words = query.split(' ');
-    
+  private classifyIntent(query: string, keywords: IntentMatch): QueryIntent['type'] {
     // Pre-extract entities for rule evaluation
-    const tempEntities = this.extractEntitiesForRules(query);
+    const tempEntities = this.extractEntitiesForRules(query, keywords);
     
     // Rule 1: Chips present -> chip_strategy
     if (tempEntities.chips && tempEntities.chips.length > 0) {
@@ -98,39 +105,39 @@ export class NaturalLanguageProcessor {
     }
     
     // Rule 2: Player comparison - requires high-confidence player matches AND explicit comparison keywords
-    if (tempEntities.players && tempEntities.players.length >= 2 && this.hasComparisonKeywords(query)) {
+    if (tempEntities.players && tempEntities.players.length >= 2 && keywords.comparison) {
       return 'player_comparison';
     }
     
     // Rule 3: Player-specific questions - single player with specific question patterns
     if (tempEntities.players && tempEntities.players.length === 1) {
-      if (this.hasPlayerSpecificKeywords(query)) {
+      if (keywords.playerSpecific) {
         return 'player_advice';
       }
       // Also detect questions about what to do with a specific player
-      if (this.hasPlayerActionKeywords(query)) {
+      if (keywords.playerAction) {
         return 'player_advice';
       }
     }
     
     // Rule 4: Transfer suggestions - transfer verbs OR budget + player/position
-    if (this.hasTransferKeywords(query) ||
+    if (keywords.transfer ||
         (tempEntities.budget && (tempEntities.players?.length || tempEntities.positions?.length))) {
       return 'transfer_suggestions';
     }
     
     // Rule 5: Fixture analysis - fixture-related keywords
-    if (this.hasFixtureKeywords(query)) {
+    if (keywords.fixture) {
       return 'fixture_analysis';
     }
     
     // Rule 6: Multiple players without comparison -> squad analysis
-    if (tempEntities.players && tempEntities.players.length > 1 && !this.hasComparisonKeywords(query)) {
+    if (tempEntities.players && tempEntities.players.length > 1 && !keywords.comparison) {
       return 'squad_analysis';
     }
     
     // Rule 7: Squad analysis - analyze/review squad/team keywords
-    if (this.hasSquadAnalysisKeywords(query)) {
+    if (keywords.squadAnalysis) {
       return 'squad_analysis';
     }
     
@@ -141,36 +148,18 @@ export class NaturalLanguageProcessor {
   /**
    * Extract entities for rule evaluation (simplified version)
    */
-  private extractEntitiesForRules(query: string): Partial<QueryIntent['entities']> {
+  private extractEntitiesForRules(query: string, keywords: IntentMatch): Partial<QueryIntent['entities']> {
     const entities: Partial<QueryIntent['entities']> = {};
     
     // Quick chip detection (include generic "chip" keyword)
-    const chipMatches = query.match(/(?:wildcard|bench boost|triple captain|free hit|wc|bb|tc|fh|chip)/gi);
-    if (chipMatches) {
-      entities.chips = chipMatches.map(c => this.normalizeChipName(c));
+    if (keywords.chips.length > 0) {
+      entities.chips = keywords.chips.map(c => this.normalizeChipName(c.phrase));
     }
     
     // Enhanced player detection with better handling of multiple players and special characters
     if (this.isLoaded) {
-      const players: string[] = [];
-      // Normalize query for better matching (handle special characters)
-      const normalizedQuery = query.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
-      
-      Array.from(this.playerDictionary.entries()).forEach(([playerName, player]) => {
-        const normalizedPlayerName = playerName.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-        
-        // Check for exact match with word boundaries
-        const escapedName = normalizedPlayerName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-        if (new RegExp(`\\b${escapedName}\\b`, 'i').test(normalizedQuery)) {
-          players.push(player.web_name);
-        }
-        
-        // Also check original query for exact matches (in case normalization affects real names)
-        const originalEscapedName = playerName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-        if (new RegExp(`\\b${originalEscapedName}\\b`, 'i').test(query)) {
-          players.push(player.web_name);
-        }
-      });
+      // Exact word-boundary matches, with and without accents (handle special characters)
+      const players = this.playerIndex.match(query).map(player => player.web_name);
       
       if (players.length > 0) {
         entities.players = Array.from(new Set(players));
@@ -178,31 +167,18 @@ export class NaturalLanguageProcessor {
     }
     
     // Quick budget detection
-    const budgetMatches = query.match(/(?:£|budget|money|cost)\s*(\d+(?:\.\d+)?)/gi);
-    if (budgetMatches) {
-      const amounts = budgetMatches.map(match => {
-        const num = match.match(/\d+(?:\.\d+)?/);
-        return num ? parseFloat(num[0]) : 0;
-      });
-      entities.budget = Math.max(...amounts);
+    if (keywords.budgets.length > 0) {
+      entities.budget = Math.max(...keywords.budgets);
     }
     
     // Quick position detection
-    const positionMatches = query.match(/(?:goalkeeper|defender|midfielder|forward|gk|def|mid|fwd)/gi);
-    if (positionMatches) {
-      entities.positions = positionMatches.map(p => this.normalizePosition(p));
+    if (keywords.positions.length > 0) {
+      entities.positions = keywords.positions.map(p => this.normalizePosition(p.phrase));
     }
     
     return entities;
   }
 
-  /**
-   * Check for comparison keywords (stricter)
-   */
-  private hasComparisonKeywords(query: string): boolean {
-    return /(\bvs\b|\bversus\b|\bcompare\b|\bpick\b|\bchoose\b|\bbetween\b)/i.test(query);
-  }
-
   /**
    * Check for multiple noun-like tokens (rough heuristic)
    */
@@ -214,63 +190,11 @@ export class NaturalLanguageProcessor {
     return nounLike.length >= 2;
   }
 
-  /**
-   * Check for transfer-related keywords
-   */
-  private hasTransferKeywords(query: string): boolean {
-    return /(?:transfer|buy|sell|bring\s+in|bring\s+out|replace|swap|change|worth\s+a?\s+hit)\b/i.test(query);
-  }
-
-  /**
-   * Check for fixture-related keywords (improved)
-   */
-  private hasFixtureKeywords(query: string): boolean {
-    return /(fixtures?|fdr|difficulty|upcoming|schedule|gameweek|gw(?:\s+\d+)?)\b/i.test(query);
-  }
-
-  /**
-   * Check for squad analysis keywords
-   */
-  private hasSquadAnalysisKeywords(query: string): boolean {
-    return /(?:analyze|analysis|review|check|evaluate)\s*(?:my|squad|team)\b/i.test(query) ||
-           /(?:squad|team)\s*(?:analyze|analysis|review|check|evaluate)\b/i.test(query) ||
-           /(?:what|how)\s+(?:do\s+you\s+)?(?:think|feel)\s+about\s+.+?\s+in\s+my\s+(team|squad)/i.test(query) ||
-           /(?:is|should)\s+.+?\s+(?:good|worth|worthwhile|worth\s+keeping)\s+(?:in|for)\s+my\s+(team|squad)/i.test(query) ||
-           /(?:my\s+team|my\s+squad).*\w+/i.test(query);
-  }
-
-  /**
-   * Check for player-specific advisory keywords
-   */
-  private hasPlayerSpecificKeywords(query: string): boolean {
-    return /(?:what|should|do|about|worth|advice|opinion|thoughts?|recommendation)\b/i.test(query) &&
-           /(?:keeping|holding|selling|starting|benching|captaining|transferring|dropping)\b/i.test(query);
-  }
-
-  /**
-   * Check for player action keywords indicating user wants advice on specific player
-   */
-  private hasPlayerActionKeywords(query: string): boolean {
-    return /(?:what\s+(?:should\s+)?(?:i|do)\s+(?:do\s+)?(?:with|about))\b/i.test(query) ||
-           /(?:should\s+i\s+(?:keep|sell|start|bench|captain|transfer|drop))\b/i.test(query) ||
-           /(?:is\s+.+?\s+worth\s+(?:keeping|holding|starting))\b/i.test(query) ||
-           /(?:advice\s+(?:on|about|for))\b/i.test(query) ||
-           /(?:thoughts?\s+(?:on|about))\b/i.test(query) ||
-           /(?:blanking|performing|disappointing|underperforming)\b/i.test(query);
-  }
-
   /**
    * Calculate pattern matching score
    */
-  private calculatePatternScore(query: string, pattern: KeywordPattern): number {
-    const words = query.split(' ');
-    let matches = 0;
-
-    for (const keyword of pattern.keywords) {
-      if (words.includes(keyword) || query.includes(keyword)) {
-        matches++;
-      }
-    }
+  private calculatePatternScore(keywords: IntentMatch, pattern: KeywordPattern): number {
+    const matches = pattern.keywords.filter(keyword => keywords.terms.has(keyword)).length;
 
     return (matches / pattern.keywords.length) * pattern.confidence;
   }
@@ -312,6 +236,8 @@ export class NaturalLanguageProcessor {
         }
       }
       
+      this.playerIndex = new NameIndex(this.playerDictionary, { accentInsensitive: true, fuzzyParts: true });
+      this.teamIndex = new NameIndex(this.teamDictionary);
       this.isLoaded = true;
     } catch (error) {
       console.warn('Failed to load FPL dictionaries, using fallback:', error);
@@ -328,120 +254,46 @@ export class NaturalLanguageProcessor {
     'and', 'or', 'but', 'is', 'was', 'be', 'have', 'has', 'do', 'does', 'did', 'get', 'got'
   ]);
 
-  /**
-   * Simple fuzzy string matching for entity recognition
-   */
-  private fuzzyMatch(query: string, target: string, maxDistance: number = 1): boolean {
-    if (query === target) return true;
-    if (query.length < 4 || target.length < 4) return false; // Require minimum length for fuzzy
-    if (Math.abs(query.length - target.length) > maxDistance) return false;
-    
-    // Simple Levenshtein distance calculation
-    const matrix: number[][] = [];
-    for (let i = 0; i <= query.length; i++) {
-      matrix[i] = [i];
-    }
-    for (let j = 0; j <= target.length; j++) {
-      matrix[0][j] = j;
-    }
-    
-    for (let i = 1; i <= query.length; i++) {
-      for (let j = 1; j <= target.length; j++) {
-        const cost = query[i - 1] === target[j - 1] ? 0 : 1;
-        matrix[i][j] = Math.min(
-          matrix[i - 1][j] + 1,
-          matrix[i][j - 1] + 1,
-          matrix[i - 1][j - 1] + cost
-        );
-      }
-    }
-    
-    return matrix[query.length][target.length] <= maxDistance;
-  }
-
   /**
    * Extract entities from the query using dynamic dictionaries with improved precision
    */
-  private extractEntities(query: string, intent: QueryIntent['type']): QueryIntent['entities'] {
+  private extractEntities(query: string, intent: QueryIntent['type'], keywords: IntentMatch): QueryIntent['entities'] {
     const entities: QueryIntent['entities'] = {};
     const words = query.split(' ').map(w => w.toLowerCase());
     const filteredWords = words.filter(word => !this.stopwords.has(word) && word.length >= 3);
 
-    // Enhanced player extraction with better handling of multiple players and special characters
-    const players: string[] = [];
-    
-    // Normalize query for better matching (handle special characters like Mbappé)
-    const normalizedQuery = query.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
-    
-    Array.from(this.playerDictionary.entries()).forEach(([playerName, player]) => {
-      const nameParts = playerName.split(' ');
-      const normalizedPlayerName = playerName.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-      
-      // Exact word boundary match (case insensitive) on both original and normalized
-      const escapedOriginal = playerName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-      const escapedNormalized = normalizedPlayerName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-      
-      if (new RegExp(`\\b${escapedOriginal}\\b`, 'i').test(query) || 
-          new RegExp(`\\b${escapedNormalized}\\b`, 'i').test(normalizedQuery)) {
-        players.push(player.web_name);
-      }
-      // Multi-token fuzzy match only if both parts match approximately
-      else if (nameParts.length > 1) {
-        const matchingParts = nameParts.filter(part => 
-          part.length >= 4 && 
-          filteredWords.some(word => word.length >= 4 && this.fuzzyMatch(word, part))
-        );
-        if (matchingParts.length >= 2) {
-          players.push(player.web_name);
-        }
-      }
-    });
+    // Enhanced player extraction: exact word-boundary matches (accents ignored, e.g. Mbappé), plus
+    // multi-token names where at least two parts are within one edit of words in the query
+    const players = this.playerIndex.match(query, filteredWords).map(player => player.web_name);
     
     if (players.length > 0) {
       entities.players = Array.from(new Set(players));
     }
 
     // Extract team names using exact matching only (no fuzzy for teams)
-    const teams: string[] = [];
-    Array.from(this.teamDictionary.entries()).forEach(([teamName, team]) => {
-      // Only exact word boundary matches for teams
-      if (new RegExp(`\\b${teamName.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}\\b`, 'i').test(query)) {
-        teams.push(team.short_name);
-      }
-    });
+    const teams = this.teamIndex.match(query).map(team => team.short_name);
     if (teams.length > 0) {
       entities.teams = Array.from(new Set(teams));
     }
 
     // Extract gameweeks
-    const gameweekMatches = query.match(/(?:gameweek|gw)\s*(\d+)/gi);
-    if (gameweekMatches) {
-      entities.gameweeks = gameweekMatches.map(match => {
-        const num = match.match(/\d+/);
-        return num ? parseInt(num[0]) : 0;
-      }).filter(n => n > 0);
+    if (keywords.gameweeks.length > 0) {
+      entities.gameweeks = keywords.gameweeks.filter(n => n > 0);
     }
 
     // Extract chips with better synonyms (include generic "chip" for consistency)
-    const chipMatches = query.match(/(?:wildcard|bench boost|triple captain|free hit|wc|bb|tc|fh|chip)/gi);
-    if (chipMatches) {
-      entities.chips = Array.from(new Set(chipMatches.map(c => this.normalizeChipName(c))));
+    if (keywords.chips.length > 0) {
+      entities.chips = Array.from(new Set(keywords.chips.map(c => this.normalizeChipName(c.phrase))));
     }
 
     // Extract positions
-    const positionMatches = query.match(/(?:goalkeeper|defender|midfielder|forward|gk|def|mid|fwd)/gi);
-    if (positionMatches) {
-      entities.positions = Array.from(new Set(positionMatches.map(p => this.normalizePosition(p))));
+    if (keywords.positions.length > 0) {
+      entities.positions = Array.from(new Set(keywords.positions.map(p => this.normalizePosition(p.phrase))));
     }
 
     // Extract budget
-    const budgetMatches = query.match(/(?:£|budget|money|cost)\s*(\d+(?:\.\d+)?)/gi);
-    if (budgetMatches) {
-      const amounts = budgetMatches.map(match => {
-        const num = match.match(/\d+(?:\.\d+)?/);
-        return num ? parseFloat(num[0]) : 0;
-      });
-      entities.budget = Math.max(...amounts);
+    if (keywords.budgets.length > 0) {
+      entities.budget = Math.max(...keywords.budgets);
     }
 
     return entities;
@@ -493,29 +345,29 @@ export class NaturalLanguageProcessor {
   /**
    * Calculate intent-specific confidence score
    */
-  private calculateIntentConfidence(query: string, intent: QueryIntent['type']): number {
+  private calculateIntentConfidence(query: string, intent: QueryIntent['type'], keywords: IntentMatch): number {
     const words = query.split(' ');
     let confidence = 30; // Base confidence
 
     // Intent-specific confidence boosts
     switch (intent) {
       case 'chip_strategy':
-        if (this.hasExplicitChipKeywords(query)) confidence += 40;
+        if (keywords.explicitChip) confidence += 40;
         break;
       case 'player_comparison':
-        if (this.hasComparisonKeywords(query)) confidence += 30;
+        if (keywords.comparison) confidence += 30;
         break;
       case 'player_advice':
-        if (this.hasPlayerSpecificKeywords(query) || this.hasPlayerActionKeywords(query)) confidence += 45;
+        if (keywords.playerSpecific || keywords.playerAction) confidence += 45;
         break;
       case 'transfer_suggestions':
-        if (this.hasTransferKeywords(query)) confidence += 35;
+        if (keywords.transfer) confidence += 35;
         break;
       case 'fixture_analysis':
-        if (this.hasFixtureKeywords(query)) confidence += 35;
+        if (keywords.fixture) confidence += 35;
         break;
       case 'squad_analysis':
-        if (this.hasSquadAnalysisKeywords(query)) confidence += 40;
+        if (keywords.squadAnalysis) confidence += 40;
         break;
       case 'general_advice':
         confidence += 10; // Lower confidence for general catch-all
@@ -523,7 +375,7 @@ export class NaturalLanguageProcessor {
     }
 
     // Boost for FPL-specific terms
-    const fplTermCount = Array.from(this.fplTerms.keys()).filter(term => query.includes(term)).length;
+    const fplTermCount = Array.from(this.fplTerms.keys()).filter(term => keywords.terms.has(term)).length;
     confidence += fplTermCount * 8;
 
     // Penalize very short or very long queries
@@ -533,23 +385,21 @@ export class NaturalLanguageProcessor {
     return Math.max(20, Math.min(95, confidence));
   }
 
-  /**
-   * Check for explicit chip keywords
-   */
-  private hasExplicitChipKeywords(query: string): boolean {
-    return /(?:wildcard|bench boost|triple captain|free hit|chip)\b/i.test(query);
-  }
-
   /**
    * Calculate overall confidence score for the interpretation with dynamic weighting
    */
-  private calculateConfidence(query: string, intent: QueryIntent['type'], entities: QueryIntent['entities']): number {
+  private calculateConfidence(
+    query: string,
+    intent: QueryIntent['type'],
+    entities: QueryIntent['entities'],
+    keywords: IntentMatch
+  ): number {
     const entityConfidence = this.calculateEntityConfidence(entities);
-    const intentConfidence = this.calculateIntentConfidence(query, intent);
+    const intentConfidence = this.calculateIntentConfidence(query, intent, keywords);
     
     // Dynamic weighting: if no entities but clear intent keywords, prioritize intent
     const entityCount = Object.values(entities).filter(v => v && (Array.isArray(v) ? v.length > 0 : v > 0)).length;
-    const hasExplicitIntentKeywords = this.hasExplicitIntentKeywords(query, intent);
+    const hasExplicitIntentKeywords = this.hasExplicitIntentKeywords(keywords, intent);
     
     let intentWeight = 0.6;
     let entityWeight = 0.4;
@@ -567,14 +417,14 @@ export class NaturalLanguageProcessor {
   /**
    * Check if query has explicit intent keywords for the given intent type
    */
-  private hasExplicitIntentKeywords(query: string, intent: QueryIntent['type']): boolean {
+  private hasExplicitIntentKeywords(keywords: IntentMatch, intent: QueryIntent['type']): boolean {
     switch (intent) {
-      case 'squad_analysis': return this.hasSquadAnalysisKeywords(query);
-      case 'chip_strategy': return this.hasExplicitChipKeywords(query);
-      case 'player_comparison': return this.hasComparisonKeywords(query);
-      case 'player_advice': return this.hasPlayerSpecificKeywords(query) || this.hasPlayerActionKeywords(query);
-      case 'transfer_suggestions': return this.hasTransferKeywords(query);
-      case 'fixture_analysis': return this.hasFixtureKeywords(query);
+      case 'squad_analysis': return keywords.squadAnalysis;
+      case 'chip_strategy': return keywords.explicitChip;
+      case 'player_comparison': return keywords.comparison;
+      case 'player_advice': return keywords.playerSpecific || keywords.playerAction;
+      case 'transfer_suggestions': return keywords.transfer;
+      case 'fixture_analysis': return keywords.fixture;
       default: return false;
     }
   }
@@ -717,11 +567,13 @@ export class NaturalLanguageProcessor {
    */
   public getProcessorInfo(): {
     patternCount: number;
+    keywordCount: number;
     termCount: number;
     version: string;
   } {
     return {
       patternCount: this.patterns.length,
+      keywordCount: this.intentMatcher.phraseCount,
       termCount: this.fplTerms.size,
       version: 'v3.0-nlp'
     };
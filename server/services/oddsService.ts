@@ -1,5 +1,6 @@
 import { MatchOdds, TeamStrength } from "@shared/schema";
 import TheOddsAPI from 'the-odds-api';
+import { LruCache } from './lruCache';
 
 // Provider interface for different odds APIs
 export interface IOddsProvider {
@@ -55,8 +56,11 @@ class MockOddsProvider implements IOddsProvider {
 class TheOddsAPIProvider implements IOddsProvider {
   name = "theoddsapi";
   private api: any;
-  private cache = new Map<string, any>();
-  private cacheExpiry = 5 * 60 * 1000; // 5 minutes for odds
+  // Keys are 10-minute buckets, so only the current few ever matter
+  private cache = new LruCache<any>('odds-api', {
+    ttlMs: 5 * 60 * 1000, // 5 minutes for odds
+    maxEntries: 8
+  });
 
   constructor(apiKey: string) {
     this.api = new TheOddsAPI(apiKey);
@@ -66,12 +70,8 @@ class TheOddsAPIProvider implements IOddsProvider {
     try {
       // Get Premier League odds (cache by 10-minute buckets)
       const cacheKey = `epl_odds_${Math.floor(Date.now() / (10 * 60 * 1000))}`;
-      const cached = this.cache.get(cacheKey);
-      
-      let oddsData;
-      if (cached && (Date.now() - cached.timestamp) < this.cacheExpiry) {
-        oddsData = cached.data;
-      } else {
+      let oddsData = this.cache.get(cacheKey);
+      if (!oddsData) {
         const response = await this.api.getOdds({
           sport: 'soccer_epl',
           regions: 'uk',
@@ -80,7 +80,7 @@ class TheOddsAPIProvider implements IOddsProvider {
           dateFormat: 'iso'
         });
         oddsData = response.data || response;
-        this.cache.set(cacheKey, { data: oddsData, timestamp: Date.now() });
+        this.cache.set(cacheKey, oddsData);
       }
 
       // Find match by fixture ID (map to team names if possible)
@@ -1,4 +1,6 @@
 import { BaseAIService } from './baseAIService';
+import { callSignal } from './requestDeadline';
+import { readNDJSON, type TokenHandler } from './llmStream';
 
 export interface OllamaConfig {
   model: string;
@@ -53,7 +55,7 @@ export class OllamaService extends BaseAIService {
     };
   }
 
-  async generateCompletion(prompt: string, options: { temperature?: number; maxTokens?: number } = {}): Promise<string> {
+  async generateCompletion(prompt: string, options: { temperature?: number; maxTokens?: number; timeoutMs?: number; signal?: AbortSignal } = {}): Promise<string> {
     try {
       const messages: OllamaMessage[] = [
         {
@@ -76,7 +78,7 @@ export class OllamaService extends BaseAIService {
 
       console.log(`🤖 [OLLAMA] Making API call to ${this.config.model}...`);
 
-      const response = await this.makeRequest(request);
+      const response = await this.makeRequest(request, options);
       const result = response.message.content;
 
       console.log(`✅ [OLLAMA] Response received (${result.length} chars)`);
@@ -91,7 +93,8 @@ export class OllamaService extends BaseAIService {
   async generateFPLResponse(
     userQuery: string,
     fplContext: any,
-    conversationHistory: Array<{ role: string; content: string }> = []
+    conversationHistory: Array<{ role: string; content: string }> = [],
+    options: { signal?: AbortSignal; onToken?: TokenHandler } = {}
   ): Promise<string> {
     try {
       // Build system prompt from FPL context
@@ -115,7 +118,7 @@ export class OllamaService extends BaseAIService {
       const request: OllamaRequest = {
         model: this.config.model,
         messages,
-        stream: false,
+        stream: !!options.onToken,
         options: {
           temperature: this.config.temperature,
           num_predict: this.config.maxTokens,
@@ -126,8 +129,9 @@ export class OllamaService extends BaseAIService {
 
       console.log(`🤖 [OLLAMA] Making FPL API call to ${this.config.model}...`);
 
-      const response = await this.makeRequest(request);
-      const result = response.message.content;
+      const result = options.onToken
+        ? await this.makeStreamingRequest(request, options.onToken, options)
+        : (await this.makeRequest(request, options)).message.content;
 
       console.log(`✅ [OLLAMA] FPL Response received (${result.length} chars)`);
 
@@ -138,25 +142,71 @@ export class OllamaService extends BaseAIService {
     }
   }
 
-  private async makeRequest(request: OllamaRequest): Promise<OllamaResponse> {
+  private async makeRequest(request: OllamaRequest, options: { timeoutMs?: number; signal?: AbortSignal } = {}): Promise<OllamaResponse> {
     const url = `${this.config.baseUrl}/api/chat`;
+    const call = callSignal(options.timeoutMs ?? this.config.timeout!, options.signal);
+
+    try {
+      const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(request),
+        signal: call.signal
+      });
 
-    const response = await fetch(url, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify(request),
-      signal: AbortSignal.timeout(this.config.timeout!)
-    });
-
-    if (!response.ok) {
-      const errorText = await response.text();
-      throw new Error(`Ollama API error ${response.status}: ${errorText}`);
+      if (!response.ok) {
+        const errorText = await response.text();
+        throw new Error(`Ollama API error ${response.status}: ${errorText}`);
+      }
+
+      const data: OllamaResponse = await response.json();
+      return data;
+    } finally {
+      call.cancel();
     }
+  }
+
+  /**
+   * Send a ``stream: true`` chat request, passing each content chunk to ``onToken``; resolves with the full text
+   */
+  private async makeStreamingRequest(request: OllamaRequest, onToken: TokenHandler, options: { timeoutMs?: number; signal?: AbortSignal } = {}): Promise<string> {
+    const url = `${this.config.baseUrl}/api/chat`;
+    const call = callSignal(options.timeoutMs ?? this.config.timeout!, options.signal);
+
+    try {
+      const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ...request, stream: true }),
+        signal: call.signal
+      });
 
-    const data: OllamaResponse = await response.json();
-    return data;
+      if (!response.ok || !response.body) {
+        const errorText = await response.text();
+        throw new Error(`Ollama API error ${response.status}: ${errorText}`);
+      }
+
+      let content = '';
+      for await (const chunk of readNDJSON<OllamaResponse & { error?: string }>(response.body)) {
+        call.touch(); // the timeout bounds the gap between chunks, not the whole generation
+        if (chunk.error) {
+          throw new Error(`Ollama stream error: ${chunk.error}`);
+        }
+        const delta = chunk.message?.content;
+        if (delta) {
+          content += delta;
+          onToken(delta);
+        }
+        if (chunk.done) break;
+      }
+      return content;
+    } finally {
+      call.cancel();
+    }
   }
 
   async isHealthy(): Promise<boolean> {
@@ -175,7 +225,7 @@ export class OllamaService extends BaseAIService {
     return true; // Ollama is configured if the service is running
   }
 
-  async generateCompletionSafe(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }> }): Promise<string> {
+  async generateCompletionSafe(messages: Array<{ role: string; content: string }>, options?: { model?: string; maxTokens?: number; temperature?: number; timeoutMs?: number; liteFallbackMessages?: Array<{ role: string; content: string }>; signal?: AbortSignal }): Promise<string> {
     try {
       return await this.generateCompletion(messages.map(m => m.content).join('\n'), options);
     } catch (error) {
@@ -184,7 +234,7 @@ export class OllamaService extends BaseAIService {
     }
   }
 
-  async generateFPLStructuredResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>): Promise<any> {
+  async generateFPLStructuredResponse(userQuery: string, fplContext: any, conversationHistory?: Array<{ role: string; content: string }>, options?: { signal?: AbortSignal }): Promise<any> {
     // Ollama doesn't support structured output like some APIs
     // Return null to use free-form fallback
     return null;
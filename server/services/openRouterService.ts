@@ -3,6 +3,9 @@
  * Provides access to Qwen3 Coder and other models via OpenRouter API
  */
 
+import { callSignal } from './requestDeadline';
+import { readSSEData, type TokenHandler } from './llmStream';
+
 interface OpenRouterMessage {
   role: string;
   content: string | null;
@@ -51,7 +54,7 @@ interface StructuredFPLResponse {
 export class OpenRouterService {
   private static instance: OpenRouterService;
   private apiKey: string;
-  private baseUrl = 'https://openrouter.ai/api/v1';
+  private baseUrl = process.env.OPENROUTER_BASE_URL || 'https://openrouter.ai/api/v1';
   private defaultModel = 'mistralai/mistral-7b-instruct:free'; // Faster model for better performance
   private structuredModel = 'qwen/qwen3-30b-a3b:free'; // More capable model for structured responses
 
@@ -77,13 +80,19 @@ export class OpenRouterService {
       maxTokens?: number;
       temperature?: number;
       stream?: boolean;
+      signal?: AbortSignal;
+      onToken?: TokenHandler;
+      onChunk?: () => void; // every stream event, with or without content
     } = {}
   ): Promise<string> {
     const {
       model = this.defaultModel,
       maxTokens = 1000,
       temperature = 0.7,
-      stream = false
+      onToken,
+      stream = !!onToken,
+      signal,
+      onChunk
     } = options;
 
     try {
@@ -101,7 +110,8 @@ export class OpenRouterService {
           max_tokens: maxTokens,
           temperature,
           stream
-        })
+        }),
+        signal
       });
 
       if (!response.ok) {
@@ -110,6 +120,14 @@ export class OpenRouterService {
         throw new Error(`OpenRouter API error: ${response.status} - ${errorData}`);
       }
 
+      if (stream && response.body) {
+        const streamed = await this.readStreamedContent(response.body, onToken, onChunk);
+        if (streamed.trim().length === 0) {
+          throw new Error('OpenRouter stream ended without content');
+        }
+        return streamed;
+      }
+
       const data: OpenRouterResponse = await response.json();
       
       if (!data.choices || data.choices.length === 0) {
@@ -139,7 +157,34 @@ export class OpenRouterService {
   }
 
   /**
-   * Safe completion with timeout + lite fallback messages
+   * Collect the content deltas of a streamed completion, passing each to ``onToken`` as it arrives
+   */
+  private async readStreamedContent(body: ReadableStream<Uint8Array>, onToken?: TokenHandler, onChunk?: () => void): Promise<string> {
+    let content = '';
+    for await (const data of readSSEData(body)) {
+      onChunk?.();
+      if (data === '[DONE]') break;
+      let chunk: any;
+      try {
+        chunk = JSON.parse(data);
+      } catch {
+        continue; // keep-alive comments and partial provider notices
+      }
+      if (chunk.error) {
+        throw new Error(`OpenRouter stream error: ${chunk.error.message || JSON.stringify(chunk.error)}`);
+      }
+      const delta: string | undefined = chunk.choices?.[0]?.delta?.content;
+      if (delta) {
+        content += delta;
+        onToken?.(delta);
+      }
+    }
+    return content;
+  }
+
+  /**
+   * Safe completion with timeout + lite fallback messages. A streamed call times out on silence between
+   * chunks, and once it has emitted a token it is never retried: the client already shows those tokens.
    */
   async generateCompletionSafe(
     messages: LLMMessage[],
@@ -150,31 +195,43 @@ export class OpenRouterService {
       stream?: boolean;
       timeoutMs?: number;
       liteFallbackMessages?: LLMMessage[];
+      signal?: AbortSignal;
+      onToken?: TokenHandler;
     } = {}
   ): Promise<string> {
     const {
       model = undefined,
       maxTokens = 1000,
       temperature = 0.7,
-      stream = false,
+      onToken,
+      stream = !!onToken,
       timeoutMs = 20000,
       liteFallbackMessages,
+      signal,
     } = options;
 
+    let emitted = '';
+    const forward = onToken && ((token: string) => {
+      emitted += token;
+      onToken(token);
+    });
     const callOnce = async (msgs: LLMMessage[]) => {
-      const controller = new AbortController();
-      const timer = setTimeout(() => controller.abort(), timeoutMs);
+      const call = callSignal(timeoutMs, signal);
       try {
-        return await this.generateCompletion(msgs, { model, maxTokens, temperature, stream });
+        return await this.generateCompletion(msgs, { model, maxTokens, temperature, stream, signal: call.signal, onToken: forward, onChunk: call.touch });
       } catch (_err) {
         return '';
       } finally {
-        clearTimeout(timer);
+        call.cancel();
       }
     };
 
     let content = await callOnce(messages);
-    if (!content && liteFallbackMessages?.length) {
+    // A stream that broke off part-way keeps what it sent rather than appending a second answer to it
+    if (!content && emitted.trim()) {
+      content = emitted;
+    }
+    if (!content && !emitted && liteFallbackMessages?.length && !signal?.aborted) {
       content = await callOnce(liteFallbackMessages);
     }
     if (!content) {
@@ -196,7 +253,8 @@ export class OpenRouterService {
       recommendations?: any[];
       liveFPLData?: any;
     },
-    conversationHistory: LLMMessage[] = []
+    conversationHistory: LLMMessage[] = [],
+    options: { signal?: AbortSignal; onToken?: TokenHandler } = {}
   ): Promise<string> {
     const systemPrompt = this.buildFPLSystemPrompt(fplContext);
     const litePrompt = this.toLitePrompt(systemPrompt);
@@ -213,6 +271,8 @@ export class OpenRouterService {
       temperature: 0.5,
       maxTokens: 1100,
       timeoutMs: 20000,
+      signal: options.signal,
+      onToken: options.onToken,
       liteFallbackMessages: [
         { role: 'system', content: litePrompt },
         ...conversationHistory.slice(-2),
@@ -227,7 +287,10 @@ export class OpenRouterService {
       return cleaned;
     }
 
-    const structured = await this.generateFPLStructuredResponse(userQuery, fplContext, conversationHistory);
+    // Out of budget: go straight to the rule-based summary rather than start another call
+    const structured = options.signal?.aborted
+      ? null
+      : await this.generateFPLStructuredResponse(userQuery, fplContext, conversationHistory, { signal: options.signal });
     if (structured) {
       return this.formatStructuredToText(structured, fplContext);
     }
@@ -321,7 +384,8 @@ Entities: ${JSON.stringify(entities)}`;
   async generateFPLStructuredResponse(
     userQuery: string,
     fplContext: any,
-    conversationHistory: LLMMessage[] = []
+    conversationHistory: LLMMessage[] = [],
+    options: { signal?: AbortSignal } = {}
   ): Promise<StructuredFPLResponse | null> {
     const { system, user } = this.buildStructuredPrompt(fplContext, userQuery);
     const messages: LLMMessage[] = [
@@ -329,7 +393,7 @@ Entities: ${JSON.stringify(entities)}`;
       ...conversationHistory.slice(-2),
       { role: 'user', content: user }
     ];
-    const raw = await this.generateCompletionSafe(messages, { model: this.structuredModel, maxTokens: 800, timeoutMs: 15000, temperature: 0.2 });
+    const raw = await this.generateCompletionSafe(messages, { model: this.structuredModel, maxTokens: 800, timeoutMs: 15000, temperature: 0.2, signal: options.signal });
     const json = this.tryParseJsonBlock(raw);
     if (!json) return null;
     if (typeof json.recommendation !== 'string' || !Array.isArray(json.playersUsed) || !Array.isArray(json.fixturesUsed)) return null;
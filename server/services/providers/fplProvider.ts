@@ -1,9 +1,10 @@
 import { HttpProviderAdapter } from "./httpProvider";
 
 export class FPLProvider extends HttpProviderAdapter {
-  constructor(config?: { timeoutMs?: number; retries?: number }) {
+  constructor(config?: { baseUrl?: string; timeoutMs?: number; retries?: number }) {
     super('fpl-api', {
-      baseUrl: 'https://fantasy.premierleague.com/api',
+      // FPL_API_BASE_URL points benchmarks at a local stand-in (scripts/fpl_fixture_server.py)
+      baseUrl: config?.baseUrl ?? process.env.FPL_API_BASE_URL ?? 'https://fantasy.premierleague.com/api',
       timeoutMs: config?.timeoutMs ?? parseInt(process.env.FPL_FETCH_TIMEOUT_MS || '15000', 10),
       retries: config?.retries ?? parseInt(process.env.FPL_FETCH_RETRIES || '2', 10),
       defaultHeaders: {
@@ -324,6 +324,8 @@ export class DataRepository {
         ceilingProbability: simulation.ceilingProbability,
         captainEv: simulation.captainEV,
         coefficientOfVariation: simulation.coefficientOfVariation ?? null,
+        inputHash: simulation.inputHash ?? null,
+        distribution: simulation.distribution ?? null,
       })
       .onConflictDoUpdate({
         target: playerSimulations.playerId,
@@ -342,6 +344,8 @@ export class DataRepository {
           ceilingProbability: sql`excluded.ceiling_probability`,
           captainEv: sql`excluded.captain_ev`,
           coefficientOfVariation: sql`excluded.coefficient_variation`,
+          inputHash: sql`excluded.input_hash`,
+          distribution: sql`excluded.distribution`,
         },
       });
   }
@@ -655,6 +659,8 @@ export class DataRepository {
       ceilingProbability: row.ceilingProbability,
       captainEV: row.captainEv,
       coefficientOfVariation: row.coefficientOfVariation ?? undefined,
+      inputHash: row.inputHash ?? undefined,
+      distribution: row.distribution ?? undefined,
     };
   }
 
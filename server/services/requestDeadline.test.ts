@@ -0,0 +1,88 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+import { RequestDeadline, callSignal } from "./requestDeadline";
+import { OpenRouterService } from "./openRouterService";
+
+// Stands in for an upstream that never answers: settles only when its signal aborts
+function hangingFetch(signals: AbortSignal[]) {
+  return (_url: any, init?: any) => new Promise<Response>((_resolve, reject) => {
+    const signal: AbortSignal = init.signal;
+    signals.push(signal);
+    if (signal.aborted) reject(signal.reason);
+    signal.addEventListener('abort', () => reject(signal.reason), { once: true });
+  });
+}
+
+// An SSE stream sending one content delta every ``intervalMs``, then going silent until its signal aborts
+function tricklingFetch(tokens: string[], intervalMs: number) {
+  return (_url: any, init?: any) => {
+    const signal: AbortSignal = init.signal;
+    const encoder = new TextEncoder();
+    const body = new ReadableStream<Uint8Array>({
+      start(controller) {
+        signal.addEventListener('abort', () => controller.error(signal.reason), { once: true });
+        tokens.forEach((content, index) => setTimeout(() => {
+          if (!signal.aborted) controller.enqueue(encoder.encode(`data: ${JSON.stringify({ choices: [{ index: 0, delta: { content } }] })}\n\n`));
+        }, intervalMs * (index + 1)));
+      }
+    });
+    return Promise.resolve(new Response(body));
+  };
+}
+
+describe('request deadlines', () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it('aborts a call on its own timeout or on the parent deadline, whichever is first', async () => {
+    const deadline = new RequestDeadline(20);
+    const short = callSignal(5, deadline.signal);
+    const long = callSignal(10_000, deadline.signal);
+
+    await new Promise(resolve => setTimeout(resolve, 10));
+    expect(short.signal.aborted).toBe(true);
+    expect(long.signal.aborted).toBe(false);
+
+    await new Promise(resolve => setTimeout(resolve, 20));
+    expect(deadline.expired).toBe(true);
+    expect(long.signal.aborted).toBe(true);
+    expect(callSignal(10_000, deadline.signal).signal.aborted).toBe(true);
+    short.cancel();
+    long.cancel();
+  });
+
+  it('passes the deadline through to the upstream fetch and skips the lite retry once it has passed', async () => {
+    const signals: AbortSignal[] = [];
+    const fetchSpy = vi.spyOn(globalThis, 'fetch').mockImplementation(hangingFetch(signals) as any);
+    vi.spyOn(console, 'error').mockImplementation(() => {});
+    const deadline = new RequestDeadline(60_000);
+
+    const pending = OpenRouterService.getInstance().generateCompletionSafe(
+      [{ role: 'user', content: 'Who should I captain?' }],
+      { timeoutMs: 10_000, signal: deadline.signal, liteFallbackMessages: [{ role: 'user', content: 'Captain?' }] }
+    );
+    deadline.abort();
+    const content = await pending;
+
+    expect(fetchSpy).toHaveBeenCalledTimes(1);
+    expect(signals[0].aborted).toBe(true);
+    expect(content).toContain("couldn't form a complete answer");
+  });
+
+  it('times streams out on silence between chunks and never retries once tokens have been sent', async () => {
+    const tokens = ['Start ', 'Salah, ', 'bench ', 'the ', 'third ', 'defender'];
+    const fetchSpy = vi.spyOn(globalThis, 'fetch').mockImplementation(tricklingFetch(tokens, 10) as any);
+    vi.spyOn(console, 'error').mockImplementation(() => {});
+    const sent: string[] = [];
+
+    // 60ms of streaming against a 30ms timeout: only the final stall should end the call
+    const content = await OpenRouterService.getInstance().generateCompletionSafe(
+      [{ role: 'user', content: 'Who should I start?' }],
+      { timeoutMs: 30, onToken: token => sent.push(token), liteFallbackMessages: [{ role: 'user', content: 'Start?' }] }
+    );
+
+    expect(sent).toEqual(tokens);
+    expect(content).toBe(tokens.join(''));
+    expect(fetchSpy).toHaveBeenCalledTimes(1);
+  });
+});
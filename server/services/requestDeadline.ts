@@ -0,0 +1,82 @@
+/**
+ * End-to-end request deadlines for upstream LLM calls.
+ *
+ * A route creates one RequestDeadline per request; its signal is threaded
+ * through the copilot into each provider, which derives a per-call signal
+ * with ``callSignal`` so a call is aborted by whichever comes first: its own
+ * timeout, the request budget running out, or the client going away.
+ */
+
+export class DeadlineExceededError extends Error {
+  constructor(message = 'Request deadline exceeded') {
+    super(message);
+    this.name = 'DeadlineExceededError';
+  }
+}
+
+export class RequestDeadline {
+  private readonly controller = new AbortController();
+  private readonly timer: ReturnType<typeof setTimeout>;
+  readonly expiresAt: number;
+
+  constructor(budgetMs: number) {
+    this.expiresAt = Date.now() + budgetMs;
+    this.timer = setTimeout(() => this.abort(new DeadlineExceededError()), Math.max(0, budgetMs));
+  }
+
+  get signal(): AbortSignal {
+    return this.controller.signal;
+  }
+
+  get expired(): boolean {
+    return this.controller.signal.aborted;
+  }
+
+  remainingMs(): number {
+    return this.expired ? 0 : Math.max(0, this.expiresAt - Date.now());
+  }
+
+  /** Cancel outstanding calls early, e.g. when the client disconnects. */
+  abort(reason: Error = new DeadlineExceededError('Request cancelled')): void {
+    clearTimeout(this.timer);
+    if (!this.controller.signal.aborted) this.controller.abort(reason);
+  }
+
+  /** Release the timer once the request has been answered. */
+  dispose(): void {
+    clearTimeout(this.timer);
+  }
+}
+
+/**
+ * A signal for one upstream call that aborts after ``timeoutMs`` or when
+ * ``parent`` aborts. Streaming calls call ``touch`` on every chunk, which
+ * restarts the timer, so ``timeoutMs`` bounds the silence between chunks
+ * rather than the whole generation. Call ``cancel`` when the call settles so
+ * neither the timer nor the parent listener outlives it.
+ */
+export function callSignal(timeoutMs: number, parent?: AbortSignal): { signal: AbortSignal; touch: () => void; cancel: () => void } {
+  const controller = new AbortController();
+  if (parent?.aborted) {
+    controller.abort(parent.reason);
+    return { signal: controller.signal, touch: () => {}, cancel: () => {} };
+  }
+
+  const onParentAbort = () => controller.abort(parent!.reason);
+  const onTimeout = () => controller.abort(new DeadlineExceededError(`Upstream call timed out after ${timeoutMs}ms without progress`));
+  let timer = setTimeout(onTimeout, timeoutMs);
+  parent?.addEventListener('abort', onParentAbort, { once: true });
+
+  return {
+    signal: controller.signal,
+    touch: () => {
+      if (controller.signal.aborted) return;
+      clearTimeout(timer);
+      timer = setTimeout(onTimeout, timeoutMs);
+    },
+    cancel: () => {
+      clearTimeout(timer);
+      parent?.removeEventListener('abort', onParentAbort);
+    }
+  };
+}
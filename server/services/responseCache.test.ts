@@ -0,0 +1,56 @@
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import type { AICopilotResponse, QueryIntent } from "@shared/schema";
+import { ResponseCache } from "./responseCache";
+
+function intent(type: QueryIntent['type'], entities: QueryIntent['entities'] = {}): QueryIntent {
+  return { type, entities, confidence: 80, originalQuery: '', processedQuery: '' };
+}
+
+function answer(message: string): AICopilotResponse {
+  return {
+    message,
+    insights: [],
+    suggestions: [],
+    followUpQuestions: [],
+    conversationContext: { intent: intent('general_advice'), responseTime: 0, modelVersion: 'test' }
+  };
+}
+
+describe('ResponseCache', () => {
+  let now = 0;
+
+  beforeEach(() => {
+    vi.restoreAllMocks();
+    now = 0;
+    vi.spyOn(Date, 'now').mockImplementation(() => now);
+    vi.spyOn(console, 'log').mockImplementation(() => {});
+  });
+
+  it('shares answers across phrasings with the same intent, entities and team until the deadline', async () => {
+    const cache = new ResponseCache({ maxTtlMs: 60 * 60_000, nextDeadline: async () => 10 * 60_000 });
+    await cache.set(intent('player_comparison', { players: ['Salah', 'Palmer'], chips: [] }), '123', answer('Salah'));
+
+    expect(cache.get(intent('player_comparison', { players: ['palmer', ' SALAH', 'Salah'] }), '123')?.message).toBe('Salah');
+    expect(cache.get(intent('player_comparison', { players: ['Salah', 'Palmer'] }), '456')).toBeUndefined();
+    expect(cache.get(intent('transfer_suggestions', { players: ['Salah', 'Palmer'] }), '123')).toBeUndefined();
+
+    now = 10 * 60_000;
+    expect(cache.get(intent('player_comparison', { players: ['Salah', 'Palmer'] }), '123')).toBeUndefined();
+
+    // Too close to the deadline to be worth keeping
+    expect(await cache.set(intent('squad_analysis'), '123', answer('late'))).toBe(false);
+  });
+
+  it('retires every answer when the data snapshot changes, including ones still being computed', async () => {
+    const cache = new ResponseCache({ nextDeadline: async () => null });
+    await cache.set(intent('squad_analysis'), '123', answer('before refresh'));
+    const versionWhileAnswering = cache.version;
+
+    cache.invalidate('test refresh');
+
+    expect(cache.get(intent('squad_analysis'), '123')).toBeUndefined();
+    expect(await cache.set(intent('chip_strategy'), '123', answer('stale'), versionWhileAnswering)).toBe(false);
+    expect(cache.get(intent('chip_strategy'), '123')).toBeUndefined();
+    expect(cache.getStats()).toMatchObject({ snapshotVersion: 2, entries: 0, stores: 1, skipped: 1 });
+  });
+});
@@ -0,0 +1,145 @@
+/**
+ * Cache of finished co-pilot answers for repeated questions.
+ *
+ * Questions are keyed semantically rather than by wording: the intent type
+ * and entities NaturalLanguageProcessor extracted, the team asked about and
+ * the data snapshot version. "Analyze my squad" and "How does my team look?"
+ * therefore share an answer for the same team. Entries live until the next
+ * gameweek deadline (capped at RESPONSE_CACHE_MAX_TTL_MS, since managers
+ * change their squads in between), and every DataPipeline refresh that
+ * changes players, fixtures or stats starts a new snapshot version, which
+ * retires all earlier answers at once.
+ */
+
+import { createHash } from "crypto";
+import type { AICopilotResponse, QueryIntent } from "@shared/schema";
+import { FPLApiService } from "./fplApi";
+import { LruCache } from "./lruCache";
+
+export interface ResponseCacheOptions {
+  maxTtlMs?: number;
+  maxEntries?: number;
+  // ISO time or epoch ms of the next gameweek deadline
+  nextDeadline?: () => Promise<string | number | null>;
+}
+
+export interface ResponseCacheStats {
+  snapshotVersion: number;
+  entries: number;
+  hits: number;
+  misses: number;
+  stores: number;
+  skipped: number; // answers not stored: deadline too close, or the snapshot changed while answering
+}
+
+const DEFAULT_MAX_TTL_MS = parseInt(process.env.RESPONSE_CACHE_MAX_TTL_MS || String(30 * 60 * 1000), 10);
+const DEFAULT_MAX_ENTRIES = parseInt(process.env.RESPONSE_CACHE_MAX_ENTRIES || '2000', 10);
+const MIN_TTL_MS = 5_000;
+
+function normaliseValue(value: unknown): unknown {
+  if (typeof value === 'string') return value.trim().toLowerCase();
+  if (Array.isArray(value)) {
+    // Entity lists are sets: order and duplicates do not change the question
+    const items = value.map(normaliseValue).map(item => JSON.stringify(item));
+    return Array.from(new Set(items)).sort().map(item => JSON.parse(item));
+  }
+  return value;
+}
+
+/** Canonical form of an intent's entities; empty lists and unset fields are dropped. */
+export function normaliseEntities(entities: QueryIntent['entities']): Record<string, unknown> {
+  const normalised: Record<string, unknown> = {};
+  for (const key of Object.keys(entities ?? {}).sort()) {
+    const value = normaliseValue((entities as Record<string, unknown>)[key]);
+    if (value === undefined || value === null || (Array.isArray(value) && value.length === 0)) continue;
+    normalised[key] = value;
+  }
+  return normalised;
+}
+
+export class ResponseCache {
+  private static instance: ResponseCache;
+  private readonly cache: LruCache<AICopilotResponse>;
+  private readonly maxTtlMs: number;
+  private readonly nextDeadline: () => Promise<string | number | null>;
+  private snapshotVersion = 1;
+  private readonly counters = { hits: 0, misses: 0, stores: 0, skipped: 0 };
+
+  constructor(options: ResponseCacheOptions = {}) {
+    this.maxTtlMs = options.maxTtlMs ?? DEFAULT_MAX_TTL_MS;
+    this.nextDeadline = options.nextDeadline ?? (() => FPLApiService.getInstance().getNextDeadline());
+    this.cache = new LruCache<AICopilotResponse>('copilot-responses', {
+      ttlMs: this.maxTtlMs,
+      maxEntries: options.maxEntries ?? DEFAULT_MAX_ENTRIES
+    });
+  }
+
+  static getInstance(): ResponseCache {
+    if (!ResponseCache.instance) {
+      ResponseCache.instance = new ResponseCache();
+    }
+    return ResponseCache.instance;
+  }
+
+  get version(): number {
+    return this.snapshotVersion;
+  }
+
+  keyFor(intent: Pick<QueryIntent, 'type' | 'entities'>, teamId?: string): string {
+    const identity = JSON.stringify([intent.type, normaliseEntities(intent.entities), teamId ?? null, this.snapshotVersion]);
+    return createHash('sha1').update(identity).digest('hex');
+  }
+
+  get(intent: Pick<QueryIntent, 'type' | 'entities'>, teamId?: string): AICopilotResponse | undefined {
+    const cached = this.cache.get(this.keyFor(intent, teamId));
+    this.counters[cached ? 'hits' : 'misses']++;
+    return cached;
+  }
+
+  /**
+   * Store an answer until the next deadline; returns false when it was not stored. Pass the ``version``
+   * read before the answer was computed, so an answer built from data an invalidation has since retired
+   * is not filed under the new snapshot.
+   */
+  async set(
+    intent: Pick<QueryIntent, 'type' | 'entities'>,
+    teamId: string | undefined,
+    response: AICopilotResponse,
+    version: number = this.snapshotVersion
+  ): Promise<boolean> {
+    const ttlMs = await this.ttlUntilDeadline();
+    if (ttlMs < MIN_TTL_MS || version !== this.snapshotVersion) {
+      this.counters.skipped++;
+      return false;
+    }
+    this.cache.set(this.keyFor(intent, teamId), response, ttlMs);
+    this.counters.stores++;
+    return true;
+  }
+
+  /** Start a new data snapshot: every answer computed from older data is dropped. */
+  invalidate(reason: string): void {
+    this.snapshotVersion++;
+    this.cache.clear();
+    console.log(`[response-cache] Snapshot v${this.snapshotVersion} (${reason}); cached answers cleared`);
+  }
+
+  getStats(): ResponseCacheStats {
+    return {
+      snapshotVersion: this.snapshotVersion,
+      entries: this.cache.size,
+      ...this.counters
+    };
+  }
+
+  private async ttlUntilDeadline(): Promise<number> {
+    try {
+      const deadline = await this.nextDeadline();
+      const deadlineMs = typeof deadline === 'number' ? deadline : Date.parse(deadline ?? '');
+      if (!Number.isFinite(deadlineMs)) return this.maxTtlMs;
+      return Math.min(this.maxTtlMs, deadlineMs - Date.now());
+    } catch {
+      return this.maxTtlMs;
+    }
+  }
+}
@@ -7,6 +7,7 @@
 
 import { FPLApiService } from './fplApi';
 import { RivalAnalysis, CompetitiveIntelligence } from '@shared/schema';
+import { LruCache, type LruCacheStats } from './lruCache';
 
 interface RivalDataProvider {
   fetchManagerData(managerId: string): Promise<any>;
@@ -102,9 +103,12 @@ export class RivalAnalysisService {
   private static instance: RivalAnalysisService;
   private provider: RivalDataProvider;
   private fplApiService: FPLApiService;
-  private cache = new Map<string, RivalAnalysis>();
-  private cacheExpiry = new Map<string, number>();
   private readonly CACHE_DURATION = 30 * 60 * 1000; // 30 minutes
+  // One entry per analysed manager, so the entry bound is what keeps this from growing forever
+  private cache = new LruCache<RivalAnalysis | CompetitiveIntelligence>('rival-analysis', {
+    ttlMs: this.CACHE_DURATION,
+    maxEntries: 2000
+  });
 
   private constructor() {
     this.provider = new MockRivalDataProvider();
@@ -125,11 +129,9 @@ export class RivalAnalysisService {
     const cacheKey = `rival_${managerId}`;
     
     // Check cache first
-    if (this.isCacheValid(cacheKey)) {
-      const cached = this.cache.get(cacheKey);
-      if (cached) {
-        return cached;
-      }
+    const cached = this.cache.get(cacheKey);
+    if (cached) {
+      return cached as RivalAnalysis;
     }
 
     try {
@@ -152,7 +154,6 @@ export class RivalAnalysisService {
 
       // Cache the analysis
       this.cache.set(cacheKey, analysis);
-      this.cacheExpiry.set(cacheKey, Date.now() + this.CACHE_DURATION);
       
       return analysis;
     } catch (error) {
@@ -168,11 +169,9 @@ export class RivalAnalysisService {
     const cacheKey = 'competitive_intelligence';
     
     // Check cache first (longer cache for meta analysis)
-    if (this.isCacheValid(cacheKey, 60 * 60 * 1000)) { // 1 hour cache
-      const cached = this.cache.get(cacheKey) as any;
-      if (cached && cached.metaTrends) {
-        return cached as CompetitiveIntelligence;
-      }
+    const cached = this.cache.get(cacheKey) as CompetitiveIntelligence | undefined;
+    if (cached && cached.metaTrends) {
+      return cached;
     }
 
     try {
@@ -194,8 +193,7 @@ export class RivalAnalysisService {
       };
 
       // Cache the intelligence
-      this.cache.set(cacheKey, intelligence as any);
-      this.cacheExpiry.set(cacheKey, Date.now() + 60 * 60 * 1000);
+      this.cache.set(cacheKey, intelligence, 60 * 60 * 1000); // 1 hour cache
       
       return intelligence;
     } catch (error) {
@@ -366,24 +364,18 @@ export class RivalAnalysisService {
       .map(([gw]) => parseInt(gw));
   }
 
-  /**
-   * Check if cached data is still valid
-   */
-  private isCacheValid(key: string, customDuration?: number): boolean {
-    const expiry = this.cacheExpiry.get(key);
-    const duration = customDuration || this.CACHE_DURATION;
-    return expiry ? Date.now() < expiry : false;
-  }
-
   /**
    * Clear all cached data
    */
   public clearCache(): void {
     this.cache.clear();
-    this.cacheExpiry.clear();
     console.log('Rival analysis cache cleared');
   }
 
+  public getCacheStats(): LruCacheStats {
+    return this.cache.getStats();
+  }
+
   /**
    * Get provider information for debugging
    */
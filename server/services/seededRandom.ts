@@ -0,0 +1,126 @@
+/**
+ * Seedable pseudo-random numbers for the simulation engines.
+ *
+ * SeededRandom implements xoshiro128** (Blackman & Vigna): 128 bits of state,
+ * 32-bit integer arithmetic only, and a jump function that advances the
+ * stream by 2^64 draws. Splitting hands out consecutive jumped segments, so
+ * shards and workers get non-overlapping substreams of one seed.
+ */
+
+export interface RandomSource {
+  next(): number; // uniform in [0, 1)
+}
+
+export const defaultRandom: RandomSource = { next: () => Math.random() };
+
+const UINT32 = 4294967296;
+const JUMP = [0x8764000b, 0xf542d2d3, 0x6fa035c3, 0x77f2db5b];
+
+function rotl(x: number, k: number): number {
+  return (x << k) | (x >>> (32 - k));
+}
+
+// SplitMix32 step; used to expand seeds so nearby seeds give unrelated states
+function splitMix32(value: number): number {
+  let z = (value + 0x9e3779b9) | 0;
+  z = Math.imul(z ^ (z >>> 16), 0x21f0aaad);
+  z = Math.imul(z ^ (z >>> 15), 0x735a2d97);
+  return (z ^ (z >>> 15)) >>> 0;
+}
+
+function mixKey(hash: number, key: number): number {
+  const low = key >>> 0;
+  const high = Math.floor(key / UINT32) >>> 0;
+  return splitMix32(splitMix32(hash ^ low) ^ high);
+}
+
+export class SeededRandom implements RandomSource {
+  private s0: number;
+  private s1: number;
+  private s2: number;
+  private s3: number;
+
+  constructor(seed: number) {
+    let z = mixKey(0x6a09e667, seed);
+    this.s0 = z = splitMix32(z);
+    this.s1 = z = splitMix32(z);
+    this.s2 = z = splitMix32(z);
+    this.s3 = splitMix32(z);
+    if ((this.s0 | this.s1 | this.s2 | this.s3) === 0) {
+      this.s0 = 1; // the all-zero state is a fixed point
+    }
+  }
+
+  /**
+   * Stream for a seed plus identifying keys (player ID, gameweek, ...), so a
+   * player's draws do not depend on which other players share the batch.
+   */
+  static derive(seed: number, ...keys: number[]): SeededRandom {
+    return new SeededRandom(keys.reduce(mixKey, mixKey(0x3c6ef372, seed)));
+  }
+
+  nextUint32(): number {
+    const result = Math.imul(rotl(Math.imul(this.s1, 5), 7), 9) >>> 0;
+    const t = this.s1 << 9;
+    this.s2 ^= this.s0;
+    this.s3 ^= this.s1;
+    this.s1 ^= this.s2;
+    this.s0 ^= this.s3;
+    this.s2 ^= t;
+    this.s3 = rotl(this.s3, 11);
+    return result;
+  }
+
+  next(): number {
+    return this.nextUint32() / UINT32;
+  }
+
+  // Advance by 2^64 draws
+  jump(): void {
+    let s0 = 0;
+    let s1 = 0;
+    let s2 = 0;
+    let s3 = 0;
+    for (const word of JUMP) {
+      for (let bit = 0; bit < 32; bit++) {
+        if (word & (1 << bit)) {
+          s0 ^= this.s0;
+          s1 ^= this.s1;
+          s2 ^= this.s2;
+          s3 ^= this.s3;
+        }
+        this.nextUint32();
+      }
+    }
+    this.s0 = s0;
+    this.s1 = s1;
+    this.s2 = s2;
+    this.s3 = s3;
+  }
+
+  /** Return a generator for the current segment and move this one to the next. */
+  split(): SeededRandom {
+    const child = this.clone();
+    this.jump();
+    return child;
+  }
+
+  /** ``count`` non-overlapping substreams, e.g. one per shard or worker. */
+  streams(count: number): SeededRandom[] {
+    return Array.from({ length: count }, () => this.split());
+  }
+
+  clone(): SeededRandom {
+    const copy = Object.create(SeededRandom.prototype) as SeededRandom;
+    copy.setState(this.getState());
+    return copy;
+  }
+
+  getState(): [number, number, number, number] {
+    return [this.s0, this.s1, this.s2, this.s3];
+  }
+
+  setState(state: readonly number[]): void {
+    [this.s0, this.s1, this.s2, this.s3] = state.map(word => word | 0);
+  }
+}
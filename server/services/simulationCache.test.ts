@@ -0,0 +1,103 @@
+import { describe, expect, it, vi } from "vitest";
+import type { PlayerSimulation } from "@shared/schema";
+import type { DataRepository } from "./repositories/dataRepository";
+import type { SimulationResult } from "./monteCarloEngine";
+import { SimulationCache, simulationInputHash, toPlayerSimulation } from "./simulationCache";
+import { getLruCacheStats } from "./lruCache";
+
+const setup = {
+  minutesProbability: 0.8,
+  events: [
+    { probability: 1, points: 2, bonusMultiplier: 0 },
+    { probability: 0.3, points: 5, bonusMultiplier: 1.8 },
+  ],
+};
+
+function makeResult(playerId: number, inputHash: string): SimulationResult {
+  return {
+    playerId,
+    simulations: [2, 7],
+    expectedPoints: 3.5,
+    median: 2,
+    mode: 2,
+    standardDeviation: 2.3,
+    percentiles: { p10: 0, p25: 2, p50: 2, p75: 7, p90: 7 },
+    haulingProbability: 0,
+    ceilingProbability: 0,
+    floorProbability: 0.6,
+    captainEV: 7,
+    consistency: 1.5,
+    runs: 1000,
+    method: 'exact',
+    inputHash,
+    distribution: { method: 'exact', points: [0, 2, 7], probabilities: [0.2, 0.56, 0.24] },
+  };
+}
+
+describe('simulationInputHash', () => {
+  it('changes with the events and only tracks seed and runs for sampled runs', () => {
+    const exact = simulationInputHash(setup, { playerId: 1, method: 'exact', runs: 1000, seed: 1 });
+
+    expect(simulationInputHash(setup, { playerId: 2, method: 'exact', runs: 50, seed: 2 })).toBe(exact);
+    expect(simulationInputHash({ ...setup, minutesProbability: 0.7 }, { playerId: 1, method: 'exact', runs: 1000 })).not.toBe(exact);
+
+    const sampled = simulationInputHash(setup, { playerId: 1, method: 'sampled', runs: 1000, seed: 1 });
+    expect(sampled).not.toBe(exact);
+    expect(simulationInputHash(setup, { playerId: 1, method: 'sampled', runs: 1000, seed: 2 })).not.toBe(sampled);
+    expect(simulationInputHash(setup, { playerId: 2, method: 'sampled', runs: 1000, seed: 1 })).not.toBe(sampled);
+    expect(simulationInputHash(setup, { playerId: 1, method: 'sampled', runs: 500, seed: 1 })).not.toBe(sampled);
+  });
+});
+
+describe('SimulationCache', () => {
+  it('serves repeats from memory and evicts the least recently used entry', async () => {
+    const cache = new SimulationCache(2, null);
+    const restore = vi.fn();
+    await cache.store(makeResult(1, 'a'));
+    await cache.store(makeResult(2, 'b'));
+
+    await cache.lookup([{ playerId: 1, inputHash: 'a' }], restore);
+    await cache.store(makeResult(3, 'c'));
+
+    const [a, b, c] = await cache.lookup(
+      [{ playerId: 1, inputHash: 'a' }, { playerId: 2, inputHash: 'b' }, { playerId: 3, inputHash: 'c' }],
+      restore
+    );
+    expect(a?.playerId).toBe(1);
+    expect(b).toBeNull();
+    expect(c?.playerId).toBe(3);
+    expect(cache.getStats()).toMatchObject({ entries: 2, memoryHits: 3, misses: 1, evictions: 1 });
+    expect(getLruCacheStats().simulations).toMatchObject({ entries: 2, maxEntries: 2, hits: 3, evictions: 1 });
+  });
+
+  it('falls back to stored rows whose fingerprint still matches', async () => {
+    const stored: PlayerSimulation[] = [
+      toPlayerSimulation(makeResult(1, 'current')),
+      toPlayerSimulation(makeResult(2, 'outdated')),
+    ];
+    const repository = {
+      getPlayerSimulations: vi.fn(async () => stored),
+      upsertPlayerSimulation: vi.fn(async () => undefined),
+    } as unknown as DataRepository;
+    const cache = new SimulationCache(10, () => repository);
+    const restore = vi.fn((row: PlayerSimulation) => makeResult(row.playerId, row.inputHash!));
+
+    const [first, second] = await cache.lookup(
+      [{ playerId: 1, inputHash: 'current' }, { playerId: 2, inputHash: 'fresh' }],
+      restore
+    );
+
+    expect(first?.playerId).toBe(1);
+    expect(second).toBeNull();
+    expect(restore).toHaveBeenCalledTimes(1);
+    expect(cache.getStats()).toMatchObject({ databaseHits: 1, misses: 1, entries: 1 });
+
+    await cache.store(makeResult(2, 'fresh'));
+    expect(repository.upsertPlayerSimulation).toHaveBeenCalledWith(expect.objectContaining({ playerId: 2, inputHash: 'fresh' }));
+
+    // A caller that persists the row itself only has the result kept in memory
+    await cache.store(makeResult(3, 'caller-owned'), false);
+    expect(repository.upsertPlayerSimulation).toHaveBeenCalledTimes(1);
+    expect((await cache.lookup([{ playerId: 3, inputHash: 'caller-owned' }], restore))[0]?.playerId).toBe(3);
+  });
+});
@@ -0,0 +1,154 @@
+/**
+ * Content-addressed cache for per-player simulation results.
+ *
+ * Results are keyed by a fingerprint of everything that determines them (the
+ * event setup, minutes probability and, for sampled runs, seed and run count),
+ * so unchanged players are never re-simulated. Two tiers: an in-process LRU
+ * (the 'simulations' LruCache namespace), and the player_simulations table, whose row records the fingerprint and the
+ * distribution it was computed from.
+ */
+
+import { createHash } from "crypto";
+import type { PlayerSimulation, SimulatedDistribution } from "@shared/schema";
+import type { MatchSetup } from "./simulationKernels";
+import type { SimulationResult } from "./monteCarloEngine";
+import { DataRepository } from "./repositories/dataRepository";
+import { LruCache } from "./lruCache";
+
+// Bump when the event model or statistics change so stale fingerprints stop matching
+export const SIMULATION_MODEL_VERSION = 1;
+
+export interface SimulationFingerprintOptions {
+  playerId: number;
+  method: 'exact' | 'sampled';
+  runs: number;
+  seed?: number;
+}
+
+export interface SimulationCacheStats {
+  entries: number;
+  maxEntries: number;
+  memoryHits: number;
+  databaseHits: number;
+  misses: number;
+  evictions: number;
+}
+
+export function simulationInputHash(setup: MatchSetup, options: SimulationFingerprintOptions): string {
+  const sampled = options.method === 'sampled';
+  const payload = {
+    version: SIMULATION_MODEL_VERSION,
+    method: options.method,
+    // Exact distributions do not depend on the run count or seed, so leave them out and share entries
+    runs: sampled ? options.runs : null,
+    // Seeded streams are derived per player, so the player is part of a seeded sample's identity
+    seed: sampled && options.seed !== undefined ? [options.seed, options.playerId] : null,
+    minutesProbability: setup.minutesProbability,
+    events: setup.events.map(event => [event.probability, event.points, event.bonusMultiplier ?? 0])
+  };
+  return createHash('sha256').update(JSON.stringify(payload)).digest('hex');
+}
+
+export function toPlayerSimulation(result: SimulationResult, generatedAt = new Date().toISOString()): PlayerSimulation {
+  return {
+    playerId: result.playerId,
+    generatedAt,
+    runs: result.runs,
+    meanPoints: result.expectedPoints,
+    medianPoints: result.median,
+    p10: result.percentiles.p10,
+    p25: result.percentiles.p25,
+    p75: result.percentiles.p75,
+    p90: result.percentiles.p90,
+    standardDeviation: result.standardDeviation,
+    haulProbability: result.haulingProbability,
+    floorProbability: result.floorProbability,
+    ceilingProbability: result.ceilingProbability,
+    captainEV: result.captainEV,
+    coefficientOfVariation: result.coefficientOfVariation,
+    inputHash: result.inputHash,
+    distribution: result.distribution,
+  };
+}
+
+export class SimulationCache {
+  private readonly memory: LruCache<SimulationResult> | null;
+  private readonly maxEntries: number;
+  private readonly counters = { databaseHits: 0, misses: 0 };
+
+  constructor(maxEntries: number, private readonly repository: (() => DataRepository) | null) {
+    this.maxEntries = Math.max(0, maxEntries);
+    // Entries are keyed by their inputs, so they never go stale and only the entry bound evicts them
+    this.memory = this.maxEntries > 0
+      ? new LruCache<SimulationResult>('simulations', { ttlMs: Number.POSITIVE_INFINITY, maxEntries: this.maxEntries })
+      : null;
+  }
+
+  /**
+   * Resolve each (playerId, inputHash) pair from memory, then from the
+   * database in one query; ``restore`` turns a stored row back into a
+   * result. Unresolved entries come back as null.
+   */
+  async lookup(
+    requests: Array<{ playerId: number; inputHash: string }>,
+    restore: (stored: PlayerSimulation & { distribution: SimulatedDistribution }) => SimulationResult
+  ): Promise<Array<SimulationResult | null>> {
+    const results = requests.map(request => this.get(request.inputHash));
+    const pending = requests.filter((_, index) => results[index] === null);
+
+    if (pending.length > 0 && this.repository) {
+      try {
+        const rows = await this.repository().getPlayerSimulations(pending.map(request => request.playerId));
+        const byHash = new Map(rows.filter(row => row.inputHash && row.distribution).map(row => [row.inputHash!, row]));
+        requests.forEach((request, index) => {
+          const row = results[index] === null ? byHash.get(request.inputHash) : undefined;
+          if (!row) return;
+          const restored = restore(row as PlayerSimulation & { distribution: SimulatedDistribution });
+          this.remember(request.inputHash, restored);
+          this.counters.databaseHits++;
+          results[index] = restored;
+        });
+      } catch (error) {
+        console.warn('Simulation cache lookup failed:', error instanceof Error ? error.message : error);
+      }
+    }
+
+    this.counters.misses += results.filter(result => result === null).length;
+    return results;
+  }
+
+  /** Keep ``result`` in memory and, unless ``writeThrough`` is off, write it to player_simulations. */
+  async store(result: SimulationResult, writeThrough = true): Promise<void> {
+    if (!result.inputHash) return;
+    this.remember(result.inputHash, result);
+    if (!this.repository || !writeThrough) return;
+    try {
+      await this.repository().upsertPlayerSimulation(toPlayerSimulation(result));
+    } catch (error) {
+      console.warn('Simulation cache write failed:', error instanceof Error ? error.message : error);
+    }
+  }
+
+  clear(): void {
+    this.memory?.clear();
+  }
+
+  getStats(): SimulationCacheStats {
+    const memory = this.memory?.getStats();
+    return {
+      entries: memory?.entries ?? 0,
+      maxEntries: this.maxEntries,
+      memoryHits: memory?.hits ?? 0,
+      ...this.counters,
+      evictions: memory?.evictions ?? 0
+    };
+  }
+
+  private get(inputHash: string): SimulationResult | null {
+    return this.memory?.get(inputHash) ?? null;
+  }
+
+  private remember(inputHash: string, result: SimulationResult): void {
+    this.memory?.set(inputHash, result);
+  }
+}
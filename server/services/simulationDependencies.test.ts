@@ -0,0 +1,72 @@
+import { describe, expect, it, vi } from "vitest";
+import type { MatchOdds } from "@shared/schema";
+import { DependencyTracker, sourceKey } from "./simulationDependencies";
+
+const odds = (fixtureId: number, homeCleanSheet: number): MatchOdds => ({
+  fixtureId,
+  homeWin: 2.1,
+  draw: 3.4,
+  awayWin: 3.6,
+  btts: 1.9,
+  over25Goals: 1.8,
+  under25Goals: 2.0,
+  homeCleanSheet,
+  awayCleanSheet: 4.0,
+  homeGoalsOver15: 2.2,
+  awayGoalsOver15: 3.1,
+  lastUpdated: new Date().toISOString(),
+});
+
+describe('DependencyTracker', () => {
+  it('reuses results until one of their own sources changes', async () => {
+    const tracker = new DependencyTracker();
+    tracker.observeOdds([odds(10, 3.0), odds(11, 3.0)]);
+    const compute = vi.fn(async () => Math.random());
+
+    const a = await tracker.memoize('sim:1', [sourceKey('odds', 10)], compute);
+    const b = await tracker.memoize('sim:2', [sourceKey('odds', 11)], compute);
+    expect(await tracker.memoize('sim:1', [sourceKey('odds', 10)], compute)).toBe(a);
+
+    // A new fetch timestamp alone is not a change; a moved line is
+    const { changed, invalidated } = tracker.observeOdds([odds(10, 2.5), { ...odds(11, 3.0), lastUpdated: 'later' }]);
+    expect(changed).toEqual([10]);
+    expect(invalidated).toBe(1);
+
+    expect(await tracker.memoize('sim:1', [sourceKey('odds', 10)], compute)).not.toBe(a);
+    expect(await tracker.memoize('sim:2', [sourceKey('odds', 11)], compute)).toBe(b);
+    expect(tracker.getStats()).toMatchObject({ entries: 2, hits: 2, misses: 3, invalidated: 1 });
+  });
+
+  it('treats disappearing inputs as changes', async () => {
+    const tracker = new DependencyTracker();
+    const compute = vi.fn(() => 'value');
+
+    // Computed before the player's stats were ever seen, then stats arrive
+    await tracker.memoize('projection:7', [sourceKey('advancedStats', 7)], compute);
+    expect(tracker.observeAdvancedStats([], [7]).invalidated).toBe(1);
+
+    await tracker.memoize('projection:7', [sourceKey('advancedStats', 7)], compute);
+    expect(tracker.observeOdds([], [7]).changed).toEqual([]);
+    tracker.observeOdds([odds(7, 3.0)]);
+    await tracker.memoize('odds-view:7', [sourceKey('odds', 7)], compute);
+    expect(tracker.observeOdds([], [7]).changed).toEqual([7]);
+    expect(compute).toHaveBeenCalledTimes(3);
+  });
+
+  it('does not keep a result whose sources changed while it was being computed', async () => {
+    const tracker = new DependencyTracker();
+    tracker.observeOdds([odds(10, 3.0)]);
+    let finish: (value: string) => void = () => {};
+    const pending = tracker.memoize('sim:10', [sourceKey('odds', 10)], () => new Promise<string>(resolve => { finish = resolve; }));
+
+    // A refresh lands while the simulation is still running on the old line
+    tracker.observeOdds([odds(10, 2.5)]);
+    finish('computed from 3.0');
+    expect(await pending).toBe('computed from 3.0');
+
+    const compute = vi.fn(() => 'computed from 2.5');
+    expect(await tracker.memoize('sim:10', [sourceKey('odds', 10)], compute)).toBe('computed from 2.5');
+    expect(await tracker.memoize('sim:10', [sourceKey('odds', 10)], compute)).toBe('computed from 2.5');
+    expect(compute).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,193 @@
+/**
+ * Dependency tracking for player projections and simulations.
+ *
+ * Every input a projection or simulation reads (a player's bootstrap fields,
+ * their advanced stats, a fixture, a fixture's odds) is a source with a
+ * content fingerprint. Memoised results remember the fingerprints they were
+ * computed from; when a refresh observes new source contents, only the
+ * results that depend on a changed source are dropped.
+ */
+
+import { createHash } from "crypto";
+import type { FPLFixture, FPLPlayer, MatchOdds, PlayerAdvanced } from "@shared/schema";
+
+export type DependencySource = 'bootstrap' | 'advancedStats' | 'fixture' | 'odds';
+
+// What a pipeline refresh changed; odds are observed when analyses fetch them
+export interface RefreshDelta {
+  bootstrap: number[];
+  advancedStats: number[];
+  fixtures: number[];
+  invalidated: number; // memoised results dropped because a source changed
+}
+
+export interface DependencyTrackerStats {
+  sources: number;
+  entries: number;
+  hits: number;
+  misses: number;
+  invalidated: number;
+}
+
+interface TrackedEntry {
+  value: unknown;
+  sources: Map<string, string | undefined>; // source key -> fingerprint at compute time
+}
+
+// Only fields that feed projections are fingerprinted. Raw API payloads carry extra churn (transfers,
+// ownership, live fixture stats) and the stored copies carry fewer fields, so both must hash alike.
+const BOOTSTRAP_FIELDS = ['web_name', 'element_type', 'team', 'now_cost', 'total_points', 'status', 'chance_of_playing_next_round'] as const;
+const FIXTURE_FIELDS = ['event', 'team_h', 'team_a', 'team_h_difficulty', 'team_a_difficulty', 'finished', 'started'] as const;
+const STATS_FIELDS = ['xG', 'xA', 'xMins', 'role', 'volatility', 'formTrend', 'fixtureAdjustedXG', 'fixtureAdjustedXA'] as const;
+const ODDS_FIELDS = [
+  'homeWin', 'draw', 'awayWin', 'btts', 'over25Goals', 'under25Goals',
+  'homeCleanSheet', 'awayCleanSheet', 'homeGoalsOver15', 'awayGoalsOver15'
+] as const;
+
+function pick<T, K extends keyof T>(value: T | undefined, fields: readonly K[]): unknown[] | null {
+  return value ? fields.map(field => value[field] ?? null) : null;
+}
+
+export function sourceKey(source: DependencySource, id: number): string {
+  return `${source}:${id}`;
+}
+
+function fingerprint(value: unknown): string {
+  return createHash('sha1').update(JSON.stringify(value) ?? '').digest('hex');
+}
+
+export class DependencyTracker {
+  private static instance: DependencyTracker;
+  private readonly fingerprints = new Map<string, string>();
+  private readonly dependents = new Map<string, Set<string>>();
+  private readonly entries = new Map<string, TrackedEntry>();
+  private readonly counters = { hits: 0, misses: 0, invalidated: 0 };
+
+  constructor(private readonly maxEntries: number = 5000) {}
+
+  static getInstance(): DependencyTracker {
+    if (!DependencyTracker.instance) {
+      DependencyTracker.instance = new DependencyTracker();
+    }
+    return DependencyTracker.instance;
+  }
+
+  /**
+   * Record the latest contents of some sources. Returns the IDs whose content
+   * changed and drops every memoised result that depended on them.
+   */
+  observe<T>(source: DependencySource, records: Array<[number, T]>): { changed: number[]; invalidated: number } {
+    const changed: number[] = [];
+    let invalidated = 0;
+    for (const [id, value] of records) {
+      const key = sourceKey(source, id);
+      const next = fingerprint(value);
+      const previous = this.fingerprints.get(key);
+      if (previous === next) continue;
+      this.fingerprints.set(key, next);
+      // A first sighting is not a change; nothing can have been computed from it yet
+      if (previous === undefined && !this.dependents.has(key)) continue;
+      changed.push(id);
+      invalidated += this.invalidate(key);
+    }
+    return { changed, invalidated };
+  }
+
+  observePlayers(players: FPLPlayer[]) {
+    return this.observe('bootstrap', players.map(player => [player.id, pick(player, BOOTSTRAP_FIELDS)]));
+  }
+
+  observeFixtures(fixtures: FPLFixture[]) {
+    return this.observe('fixture', fixtures.map(fixture => [fixture.id, pick(fixture, FIXTURE_FIELDS)]));
+  }
+
+  /** ``playerIds`` without a stat line are observed as missing, so losing stats counts as a change. */
+  observeAdvancedStats(stats: PlayerAdvanced[], playerIds: number[] = []) {
+    const byPlayer = new Map(stats.map(stat => [stat.playerId, stat]));
+    const ids = Array.from(new Set([...byPlayer.keys(), ...playerIds]));
+    return this.observe('advancedStats', ids.map(id => [id, pick(byPlayer.get(id), STATS_FIELDS)]));
+  }
+
+  /** As for stats: ``fixtureIds`` without odds are observed as missing. */
+  observeOdds(odds: MatchOdds[], fixtureIds: number[] = []) {
+    const byFixture = new Map(odds.map(entry => [entry.fixtureId, entry]));
+    const ids = Array.from(new Set([...byFixture.keys(), ...fixtureIds]));
+    return this.observe('odds', ids.map(id => [id, pick(byFixture.get(id), ODDS_FIELDS)]));
+  }
+
+  /**
+   * Return the memoised value for ``key`` if none of its dependencies
+   * changed since it was computed, otherwise compute and record it against
+   * the fingerprints read before computing. A value whose sources change
+   * while it is being computed is returned but not kept.
+   */
+  async memoize<T>(key: string, dependencies: string[], compute: () => Promise<T> | T): Promise<T> {
+    const sources = Array.from(new Set(dependencies));
+    const entry = this.entries.get(key);
+    if (entry && this.isCurrent(entry, sources)) {
+      this.counters.hits++;
+      // Re-insert to mark as most recently used
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      return entry.value as T;
+    }
+
+    this.counters.misses++;
+    const snapshot = new Map(sources.map(source => [source, this.fingerprints.get(source)]));
+    const value = await compute();
+    // An observe() while compute was pending could not invalidate an entry that did not exist yet
+    if (sources.some(source => snapshot.get(source) !== this.fingerprints.get(source))) {
+      return value;
+    }
+    this.remove(key);
+    this.entries.set(key, { value, sources: snapshot });
+    sources.forEach(source => {
+      const set = this.dependents.get(source) ?? new Set<string>();
+      set.add(key);
+      this.dependents.set(source, set);
+    });
+    while (this.entries.size > this.maxEntries) {
+      this.remove(this.entries.keys().next().value as string);
+    }
+    return value;
+  }
+
+  getStats(): DependencyTrackerStats {
+    return { sources: this.fingerprints.size, entries: this.entries.size, ...this.counters };
+  }
+
+  clear(): void {
+    this.fingerprints.clear();
+    this.dependents.clear();
+    this.entries.clear();
+  }
+
+  private isCurrent(entry: TrackedEntry, sources: string[]): boolean {
+    if (entry.sources.size !== sources.length) return false;
+    return sources.every(source => entry.sources.has(source) && entry.sources.get(source) === this.fingerprints.get(source));
+  }
+
+  private invalidate(source: string): number {
+    const keys = this.dependents.get(source);
+    if (!keys) return 0;
+    let removed = 0;
+    Array.from(keys).forEach(key => {
+      if (this.remove(key)) removed++;
+    });
+    this.dependents.delete(source);
+    this.counters.invalidated += removed;
+    return removed;
+  }
+
+  private remove(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.entries.delete(key);
+    entry.sources.forEach((_, source) => {
+      const set = this.dependents.get(source);
+      set?.delete(key);
+      if (set && set.size === 0) this.dependents.delete(source);
+    });
+    return true;
+  }
+}
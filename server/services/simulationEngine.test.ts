@@ -0,0 +1,117 @@
+import { describe, expect, it } from "vitest";
+import type { ProcessedPlayer } from "@shared/schema";
+import { SimulationEngine, type GameweekFixture, type SimulationConfig } from "./simulationEngine";
+
+function makePlayer(id: number, overrides: Partial<ProcessedPlayer> = {}): ProcessedPlayer {
+  return {
+    id,
+    name: `Player ${id}`,
+    position: 'MID',
+    team: 'TST',
+    price: 6.0,
+    points: 150,
+    teamId: 1,
+    ...overrides,
+  };
+}
+
+const config: SimulationConfig = {
+  runs: 2000,
+  gameweeksToSimulate: [1, 2],
+  strategy: 'test-squad',
+  useOdds: false,
+  useAdvancedStats: false,
+};
+
+describe('SimulationEngine.simulateSquad', () => {
+  it('only sums fixtures that belong to squad players and have a match', async () => {
+    const engine = SimulationEngine.getInstance();
+    // Near-zero volatility makes every run equal to the expected points
+    const players = [makePlayer(1, { volatility: 1e-9 }), makePlayer(2, { volatility: 1e-9 })];
+    const fixtures: GameweekFixture[] = [
+      { playerId: 1, gameweek: 1, hasFixture: true, fdr: 2, isHome: true },
+      { playerId: 1, gameweek: 2, hasFixture: true, fdr: 2, isHome: true },
+      { playerId: 2, gameweek: 2, hasFixture: true, fdr: 2, isHome: true },
+      { playerId: 2, gameweek: 1, hasFixture: false, fdr: 2, isHome: true },
+      { playerId: 99, gameweek: 1, hasFixture: true, fdr: 2, isHome: true },
+    ];
+
+    const summary = await engine.simulateSquad(players, fixtures, config);
+
+    // 150 pts / 15 games = 10 per GW, FDR 2 at home = 1.1x -> 11 per fixture, three fixtures
+    expect(summary.meanTotalPoints).toBe(33);
+    expect(summary.p10TotalPoints).toBeCloseTo(33, 5);
+    expect(summary.p90TotalPoints).toBeCloseTo(33, 5);
+    expect(summary.runs).toBe(config.runs);
+  });
+
+  it('orders percentiles around the mean for a noisy squad', async () => {
+    const engine = SimulationEngine.getInstance();
+    const players = Array.from({ length: 15 }, (_, index) => makePlayer(index + 1, { points: 60 + index * 5 }));
+    const fixtures: GameweekFixture[] = players.flatMap(player =>
+      config.gameweeksToSimulate.map(gameweek => ({ playerId: player.id, gameweek, hasFixture: true, fdr: 3, isHome: gameweek === 1 }))
+    );
+
+    const summary = await engine.simulateSquad(players, fixtures, config);
+
+    expect(summary.p10TotalPoints).toBeLessThan(summary.meanTotalPoints);
+    expect(summary.p90TotalPoints).toBeGreaterThan(summary.meanTotalPoints);
+    expect(summary.confidenceInterval[0]).toBeLessThan(summary.confidenceInterval[1]);
+    expect(summary.successRate).toBeGreaterThan(30);
+    expect(summary.successRate).toBeLessThan(70);
+  });
+});
+
+describe('SimulationEngine.simulatePlayer', () => {
+  it('derives totals and gameweek extremes from one sample matrix', async () => {
+    const engine = SimulationEngine.getInstance();
+    const player = makePlayer(7);
+    const fixtures: GameweekFixture[] = [
+      { playerId: 7, gameweek: 1, hasFixture: true, fdr: 5, isHome: false },
+      { playerId: 7, gameweek: 2, hasFixture: true, fdr: 1, isHome: true },
+      { playerId: 7, gameweek: 2, hasFixture: true, fdr: 1, isHome: true },
+      { playerId: 7, gameweek: 3, hasFixture: false, fdr: 3, isHome: true },
+    ];
+
+    const outcome = await engine.simulatePlayer(player, fixtures, { ...config, gameweeksToSimulate: [1, 2, 3] });
+    const distribution = outcome.gameweekDistribution ?? [];
+
+    expect(distribution.map(entry => entry.gameweek)).toEqual([1, 2, 3]);
+    // The double gameweek at home to FDR 1 is best; the blank is worst
+    expect(outcome.bestGameweek).toBe(2);
+    expect(outcome.worstGameweek).toBe(3);
+    expect(distribution[2].meanPoints).toBe(0);
+    expect(distribution[2].blankProbability).toBe(100);
+
+    const summedMeans = distribution.reduce((sum, entry) => sum + entry.meanPoints, 0);
+    expect(Math.abs(summedMeans - outcome.meanPoints)).toBeLessThan(0.3);
+    expect(distribution[1].p10).toBeLessThanOrEqual(distribution[1].p50);
+    expect(distribution[1].p50).toBeLessThanOrEqual(distribution[1].p90);
+  });
+});
+
+describe('SimulationEngine seeding', () => {
+  const players = [makePlayer(1), makePlayer(2, { position: 'FWD' })];
+  const fixtures: GameweekFixture[] = players.flatMap(player =>
+    [1, 2].map(gameweek => ({ playerId: player.id, gameweek, hasFixture: true, fdr: 3, isHome: true }))
+  );
+
+  it('reproduces squad and player results for the same seed', async () => {
+    const engine = SimulationEngine.getInstance();
+    const seeded = { ...config, runs: 500, seed: 1234 };
+
+    const [first, second] = [await engine.simulateSquad(players, fixtures, seeded), await engine.simulateSquad(players, fixtures, seeded)];
+    expect({ ...first, lastUpdated: '' }).toEqual({ ...second, lastUpdated: '' });
+
+    const alone = await engine.simulatePlayer(players[1], fixtures, seeded);
+    await engine.simulatePlayer(players[0], fixtures, seeded);
+    expect(await engine.simulatePlayer(players[1], fixtures, seeded)).toEqual(alone);
+  });
+
+  it('draws different outcomes for different seeds', async () => {
+    const engine = SimulationEngine.getInstance();
+    const a = await engine.simulatePlayer(players[1], fixtures, { ...config, runs: 500, seed: 1 });
+    const b = await engine.simulatePlayer(players[1], fixtures, { ...config, runs: 500, seed: 2 });
+    expect(a.gameweekDistribution).not.toEqual(b.gameweekDistribution);
+  });
+});
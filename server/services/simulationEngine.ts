@@ -1,4 +1,7 @@
-import { PlayerSimOutcome, SimulationSummary, ProcessedPlayer, MatchOdds, PlayerAdvanced } from "@shared/schema";
+import { PlayerSimOutcome, PlayerGameweekDistribution, SimulationSummary, ProcessedPlayer, MatchOdds, PlayerAdvanced } from "@shared/schema";
+import { SeededRandom } from "./seededRandom";
+import { mergeShardResults, shardRuns, type SimulationTask } from "./simulationKernels";
+import { SimulationWorkerPool } from "./simulationWorkerPool";
 
 export interface SimulationConfig {
   runs: number; // Number of Monte Carlo runs
@@ -7,24 +10,29 @@ export interface SimulationConfig {
   targetThreshold?: number; // Minimum points for "success" classification
   useOdds: boolean; // Whether to incorporate odds data
   useAdvancedStats: boolean; // Whether to use advanced player stats
+  seed?: number; // Fixed seed for reproducible runs; unseeded runs use Math.random
 }
 
 export interface GameweekFixture {
   gameweek: number;
   playerId: number;
+  fixtureId?: number; // source fixture, used for dependency tracking
   hasFixture: boolean;
   odds?: MatchOdds;
   fdr: number;
   isHome: boolean;
 }
 
-// Individual simulation result for one run
-interface SimulationRun {
-  totalPoints: number;
-  playerPoints: { [playerId: number]: number };
-  gameweekPoints: { [gameweek: number]: number };
-  haulsCount: number;
-  blanksCount: number;
+// Deterministic part of every player-fixture draw, laid out for the batched squad kernel
+interface SquadSimulationPlan {
+  expected: Float64Array; // expected points per player-fixture
+  volatility: Float64Array; // standard deviation per player-fixture
+}
+
+// Single-player plan with fixtures grouped into gameweek columns (double gameweeks share a column)
+interface PlayerSimulationPlan extends SquadSimulationPlan {
+  gameweeks: number[];
+  columnStart: Int32Array; // fixtures of gameweeks[g] are entries columnStart[g]..columnStart[g + 1] - 1
 }
 
 export class SimulationEngine {
@@ -43,16 +51,16 @@ export class SimulationEngine {
     fixtures: GameweekFixture[],
     config: SimulationConfig
   ): Promise<SimulationSummary> {
-    const runs: SimulationRun[] = [];
-
-    // Run Monte Carlo simulations
-    for (let i = 0; i < config.runs; i++) {
-      const run = this.runSingleSimulation(players, fixtures, config);
-      runs.push(run);
-    }
-
-    // Analyze results
-    return this.analyzeSimulationResults(runs, config);
+    const plan = this.buildSquadPlan(players, this.indexFixturesByPlayer(fixtures), config);
+    const random = config.seed !== undefined ? new SeededRandom(config.seed) : null;
+    const { totals } = await this.runShards(config.runs, random, shard => ({
+      kind: 'squad',
+      expected: plan.expected,
+      volatility: plan.volatility,
+      ...shard
+    }));
+
+    return this.analyzeSimulationResults(totals, config);
   }
 
   // Simulate individual player over specified gameweeks
@@ -61,119 +69,167 @@ export class SimulationEngine {
     fixtures: GameweekFixture[],
     config: SimulationConfig
   ): Promise<PlayerSimOutcome> {
-    const playerFixtures = fixtures.filter(f => f.playerId === player.id);
-    const runs: number[] = [];
+    const plan = this.buildPlayerPlan(player, fixtures, config);
+    const runCount = config.runs;
+    const gameweekCount = plan.gameweeks.length;
+    // Keyed by player so a seeded result does not depend on which other players were simulated first
+    const random = config.seed !== undefined ? SeededRandom.derive(config.seed, player.id) : null;
+    // Column-major run x gameweek matrix: samples[g * runs + r]
+    const { totals, samples = new Float64Array(0) } = await this.runShards(runCount, random, shard => ({
+      kind: 'gameweeks',
+      expected: plan.expected,
+      volatility: plan.volatility,
+      columnStart: plan.columnStart,
+      ...shard
+    }), gameweekCount);
+
     let haulsCount = 0;
     let blankCount = 0;
-    let bestGW = 0;
-    let worstGW = 999;
-    let bestPoints = 0;
-    let worstPoints = 999;
-
-    // Monte Carlo runs for this player
-    for (let i = 0; i < config.runs; i++) {
-      const totalPoints = this.simulatePlayerPoints(player, playerFixtures, config);
-      runs.push(totalPoints);
-
-      if (totalPoints >= 10) haulsCount++;
-      if (totalPoints <= 2) blankCount++;
-
-      // Track best/worst gameweeks (simplified - assume one fixture per GW)
-      playerFixtures.forEach(fixture => {
-        const gwPoints = this.simulateGameweekPoints(player, fixture, config);
-        if (gwPoints > bestPoints) {
-          bestPoints = gwPoints;
-          bestGW = fixture.gameweek;
-        }
-        if (gwPoints < worstPoints) {
-          worstPoints = gwPoints;
-          worstGW = fixture.gameweek;
-        }
-      });
+    for (let run = 0; run < runCount; run++) {
+      if (totals[run] >= 10) haulsCount++;
+      if (totals[run] <= 2) blankCount++;
     }
 
+    const gameweekDistribution = plan.gameweeks.map((gameweek, g) =>
+      this.summariseGameweek(gameweek, samples.subarray(g * runCount, (g + 1) * runCount))
+    );
+    let bestGW = 0;
+    let worstGW = 0;
+    gameweekDistribution.forEach((entry, g) => {
+      if (entry.meanPoints > gameweekDistribution[bestGW].meanPoints) bestGW = g;
+      if (entry.meanPoints < gameweekDistribution[worstGW].meanPoints) worstGW = g;
+    });
+
     // Calculate statistics
-    runs.sort((a, b) => a - b);
-    const mean = runs.reduce((sum, val) => sum + val, 0) / runs.length;
-    const variance = runs.reduce((sum, val) => sum + Math.pow(val - mean, 2), 0) / runs.length;
+    totals.sort();
+    const mean = totals.reduce((sum, val) => sum + val, 0) / runCount;
+    const variance = totals.reduce((sum, val) => sum + Math.pow(val - mean, 2), 0) / runCount;
     const stdDev = Math.sqrt(variance);
 
     return {
       playerId: player.id,
       gameweeksSimulated: config.gameweeksToSimulate.length,
       meanPoints: Math.round(mean * 10) / 10,
-      p10: runs[Math.floor(runs.length * 0.1)],
-      p50: runs[Math.floor(runs.length * 0.5)],
-      p90: runs[Math.floor(runs.length * 0.9)],
+      p10: this.percentileOfSorted(totals, 0.1),
+      p50: this.percentileOfSorted(totals, 0.5),
+      p90: this.percentileOfSorted(totals, 0.9),
       standardDeviation: Math.round(stdDev * 10) / 10,
-      haulsCount: Math.round(haulsCount / config.runs * 100),
-      blankCount: Math.round(blankCount / config.runs * 100),
-      bestGameweek: bestGW || config.gameweeksToSimulate[0],
-      worstGameweek: worstGW !== 999 ? worstGW : config.gameweeksToSimulate[0],
-      confidence: Math.min(100, Math.max(50, 100 - stdDev * 5)) // Lower std dev = higher confidence
+      haulsCount: Math.round(haulsCount / runCount * 100),
+      blankCount: Math.round(blankCount / runCount * 100),
+      bestGameweek: gameweekCount ? plan.gameweeks[bestGW] : config.gameweeksToSimulate[0],
+      worstGameweek: gameweekCount ? plan.gameweeks[worstGW] : config.gameweeksToSimulate[0],
+      confidence: Math.min(100, Math.max(50, 100 - stdDev * 5)), // Lower std dev = higher confidence
+      gameweekDistribution
     };
   }
 
-  private runSingleSimulation(
+  // Fixed-size shards go to the worker pool (or run inline) and are stitched back together in run order
+  private async runShards(
+    runs: number,
+    random: SeededRandom | null,
+    toTask: (shard: ReturnType<typeof shardRuns>[number]) => SimulationTask,
+    gameweekCount = 0
+  ) {
+    const pool = SimulationWorkerPool.getInstance();
+    const results = await Promise.all(shardRuns(runs, random).map(shard => pool.execute(toTask(shard))));
+    return mergeShardResults(results, gameweekCount);
+  }
+
+  // Group fixtures by player once, each list ordered by gameweek
+  private indexFixturesByPlayer(fixtures: GameweekFixture[]): Map<number, GameweekFixture[]> {
+    const byPlayer = new Map<number, GameweekFixture[]>();
+    for (const fixture of fixtures) {
+      const list = byPlayer.get(fixture.playerId);
+      if (list) {
+        list.push(fixture);
+      } else {
+        byPlayer.set(fixture.playerId, [fixture]);
+      }
+    }
+    byPlayer.forEach(list => list.sort((a, b) => a.gameweek - b.gameweek));
+    return byPlayer;
+  }
+
+  private buildSquadPlan(
     players: ProcessedPlayer[],
-    fixtures: GameweekFixture[],
+    fixturesByPlayer: Map<number, GameweekFixture[]>,
     config: SimulationConfig
-  ): SimulationRun {
-    let totalPoints = 0;
-    const playerPoints: { [playerId: number]: number } = {};
-    const gameweekPoints: { [gameweek: number]: number } = {};
-    let haulsCount = 0;
-    let blanksCount = 0;
+  ): SquadSimulationPlan {
+    const expected: number[] = [];
+    const volatility: number[] = [];
 
-    // Simulate each player
     players.forEach(player => {
-      const playerFixtures = fixtures.filter(f => f.playerId === player.id);
-      const points = this.simulatePlayerPoints(player, playerFixtures, config);
-      
-      playerPoints[player.id] = points;
-      totalPoints += points;
-
-      if (points >= 10) haulsCount++;
-      if (points <= 2) blanksCount++;
+      const playerVolatility = player.volatility || this.getDefaultVolatility(player);
+      (fixturesByPlayer.get(player.id) ?? []).forEach(fixture => {
+        if (!fixture.hasFixture) return;
+        expected.push(this.getExpectedGameweekPoints(player, fixture, config));
+        volatility.push(playerVolatility);
+      });
     });
 
-    // Calculate gameweek totals
-    config.gameweeksToSimulate.forEach(gw => {
-      gameweekPoints[gw] = players.reduce((sum, player) => {
-        const playerGWFixtures = fixtures.filter(f => f.playerId === player.id && f.gameweek === gw);
-        if (playerGWFixtures.length > 0) {
-          return sum + this.simulateGameweekPoints(player, playerGWFixtures[0], config);
-        }
-        return sum;
-      }, 0);
+    return { expected: Float64Array.from(expected), volatility: Float64Array.from(volatility) };
+  }
+
+  private buildPlayerPlan(
+    player: ProcessedPlayer,
+    fixtures: GameweekFixture[],
+    config: SimulationConfig
+  ): PlayerSimulationPlan {
+    const playerFixtures = this.indexFixturesByPlayer(fixtures).get(player.id) ?? [];
+    const playerVolatility = player.volatility || this.getDefaultVolatility(player);
+    const gameweeks: number[] = [];
+    const columnStart: number[] = [];
+    const expected: number[] = [];
+    const volatility: number[] = [];
+
+    playerFixtures.forEach(fixture => {
+      if (gameweeks[gameweeks.length - 1] !== fixture.gameweek) {
+        gameweeks.push(fixture.gameweek);
+        columnStart.push(expected.length);
+      }
+      // Blank fixtures keep their gameweek column but contribute no draws
+      if (!fixture.hasFixture) return;
+      expected.push(this.getExpectedGameweekPoints(player, fixture, config));
+      volatility.push(playerVolatility);
     });
+    columnStart.push(expected.length);
 
     return {
-      totalPoints,
-      playerPoints,
-      gameweekPoints,
-      haulsCount,
-      blanksCount
+      gameweeks,
+      columnStart: Int32Array.from(columnStart),
+      expected: Float64Array.from(expected),
+      volatility: Float64Array.from(volatility)
     };
   }
 
-  private simulatePlayerPoints(
-    player: ProcessedPlayer,
-    fixtures: GameweekFixture[],
-    config: SimulationConfig
-  ): number {
-    return fixtures.reduce((total, fixture) => {
-      return total + this.simulateGameweekPoints(player, fixture, config);
-    }, 0);
+  private summariseGameweek(gameweek: number, samples: Float64Array): PlayerGameweekDistribution {
+    let sum = 0;
+    let blanks = 0;
+    for (let i = 0; i < samples.length; i++) {
+      sum += samples[i];
+      if (samples[i] <= 2) blanks++;
+    }
+    samples.sort();
+
+    return {
+      gameweek,
+      meanPoints: Math.round((sum / samples.length) * 10) / 10,
+      p10: this.percentileOfSorted(samples, 0.1),
+      p50: this.percentileOfSorted(samples, 0.5),
+      p90: this.percentileOfSorted(samples, 0.9),
+      blankProbability: Math.round((blanks / samples.length) * 100)
+    };
+  }
+
+  private percentileOfSorted(sorted: Float64Array, quantile: number): number {
+    return Math.round(sorted[Math.floor(sorted.length * quantile)] * 10) / 10;
   }
 
-  private simulateGameweekPoints(
+  private getExpectedGameweekPoints(
     player: ProcessedPlayer,
     fixture: GameweekFixture,
     config: SimulationConfig
   ): number {
-    if (!fixture.hasFixture) return 0;
-
     // Base expected points from historical data
     let basePoints = this.getHistoricalExpectedPoints(player);
     
@@ -191,11 +247,7 @@ export class SimulationEngine {
       basePoints *= this.getAdvancedStatsAdjustment(player, player.advancedStats);
     }
 
-    // Add volatility using player's historical variance
-    const volatility = player.volatility || this.getDefaultVolatility(player);
-    const randomness = this.generateNormalRandom() * volatility;
-
-    return Math.max(0, Math.round((basePoints + randomness) * 10) / 10);
+    return basePoints;
   }
 
   private getHistoricalExpectedPoints(player: ProcessedPlayer): number {
@@ -280,28 +332,31 @@ export class SimulationEngine {
     }
   }
 
-  // Box-Muller transformation for normal random numbers
-  private generateNormalRandom(): number {
-    const u = Math.random();
-    const v = Math.random();
-    return Math.sqrt(-2.0 * Math.log(u)) * Math.cos(2.0 * Math.PI * v);
-  }
-
-  private analyzeSimulationResults(runs: SimulationRun[], config: SimulationConfig): SimulationSummary {
+  private analyzeSimulationResults(totals: Float64Array, config: SimulationConfig): SimulationSummary {
     // Sort runs by total points
-    runs.sort((a, b) => a.totalPoints - b.totalPoints);
-
-    const totalPoints = runs.map(r => r.totalPoints);
-    const mean = totalPoints.reduce((sum, val) => sum + val, 0) / totalPoints.length;
-    const variance = totalPoints.reduce((sum, val) => sum + Math.pow(val - mean, 2), 0) / totalPoints.length;
+    totals.sort();
 
-    const p10Index = Math.floor(runs.length * 0.1);
-    const p90Index = Math.floor(runs.length * 0.9);
+    const runCount = totals.length;
+    let sum = 0;
+    for (let i = 0; i < runCount; i++) sum += totals[i];
+    const mean = sum / runCount;
 
     const target = config.targetThreshold || mean;
-    const successCount = runs.filter(r => r.totalPoints >= target).length;
-    const boomCount = runs.filter(r => r.totalPoints >= mean * 1.2).length;
-    const bustCount = runs.filter(r => r.totalPoints <= mean * 0.8).length;
+    let squaredDeviation = 0;
+    let successCount = 0;
+    let boomCount = 0;
+    let bustCount = 0;
+    for (let i = 0; i < runCount; i++) {
+      const value = totals[i];
+      squaredDeviation += (value - mean) * (value - mean);
+      if (value >= target) successCount++;
+      if (value >= mean * 1.2) boomCount++;
+      if (value <= mean * 0.8) bustCount++;
+    }
+    const variance = squaredDeviation / runCount;
+
+    const p10Index = Math.floor(runCount * 0.1);
+    const p90Index = Math.floor(runCount * 0.9);
 
     const stdDev = Math.sqrt(variance);
     const confidenceInterval: [number, number] = [
@@ -312,7 +367,7 @@ export class SimulationEngine {
     // Recommendation strength based on consistency and upside
     let recommendationStrength: 'strong' | 'moderate' | 'weak';
     const consistencyScore = 1 - (stdDev / mean); // Higher = more consistent
-    const upsideScore = (runs[p90Index].totalPoints - mean) / mean; // Higher = more upside
+    const upsideScore = (totals[p90Index] - mean) / mean; // Higher = more upside
 
     if (consistencyScore > 0.7 && upsideScore > 0.2) {
       recommendationStrength = 'strong';
@@ -328,12 +383,12 @@ export class SimulationEngine {
       gameweeksAnalyzed: config.gameweeksToSimulate,
       
       meanTotalPoints: Math.round(mean * 10) / 10,
-      p10TotalPoints: runs[p10Index].totalPoints,
-      p90TotalPoints: runs[p90Index].totalPoints,
+      p10TotalPoints: totals[p10Index],
+      p90TotalPoints: totals[p90Index],
       
-      successRate: Math.round((successCount / runs.length) * 100),
-      boomRate: Math.round((boomCount / runs.length) * 100),
-      bustRate: Math.round((bustCount / runs.length) * 100),
+      successRate: Math.round((successCount / runCount) * 100),
+      boomRate: Math.round((boomCount / runCount) * 100),
+      bustRate: Math.round((bustCount / runCount) * 100),
       
       variance: Math.round(variance * 10) / 10,
       confidenceInterval,
@@ -0,0 +1,263 @@
+/**
+ * Allocation-light Monte Carlo kernels shared by the simulation engines and
+ * the worker pool. Everything here is plain data in, typed arrays out, so a
+ * task can be posted to a worker thread and its results transferred back
+ * without copying.
+ */
+
+import { SeededRandom, defaultRandom, type RandomSource } from "./seededRandom";
+
+// Fixed shard size keeps seeded results identical whether shards run inline or on any number of workers
+export const RUNS_PER_SHARD = 2500;
+
+export interface MatchEvent {
+  probability: number;
+  points: number;
+  bonusMultiplier?: number;
+}
+
+export interface MatchSetup {
+  minutesProbability: number;
+  events: MatchEvent[];
+}
+
+export type RandomState = [number, number, number, number];
+
+export type SimulationTask =
+  | { kind: 'matches'; setups: MatchSetup[]; runs: number; states: Array<RandomState | null> }
+  | { kind: 'squad'; expected: Float64Array; volatility: Float64Array; runs: number; state: RandomState | null }
+  | {
+      kind: 'gameweeks';
+      expected: Float64Array;
+      volatility: Float64Array;
+      columnStart: Int32Array;
+      runs: number;
+      state: RandomState | null;
+    };
+
+export interface SimulationTaskResult {
+  totals: Float64Array; // one value per run ('matches': runs per setup, setup after setup)
+  samples?: Float64Array; // 'gameweeks' only: column-major run x gameweek matrix
+}
+
+export function randomFromState(state: RandomState | null): RandomSource {
+  if (!state) return defaultRandom;
+  const random = new SeededRandom(0);
+  random.setState(state);
+  return random;
+}
+
+/**
+ * Split ``runs`` into fixed-size shards, each with its own substream of
+ * ``random`` (or unseeded when ``random`` is null).
+ */
+export function shardRuns(runs: number, random: SeededRandom | null): Array<{ runs: number; state: RandomState | null }> {
+  const shards: Array<{ runs: number; state: RandomState | null }> = [];
+  for (let start = 0; start < runs; start += RUNS_PER_SHARD) {
+    shards.push({ runs: Math.min(RUNS_PER_SHARD, runs - start), state: random ? random.split().getState() : null });
+  }
+  return shards;
+}
+
+// One match: minutes gate, independent events, then a bonus roll that depends on the event haul
+export function simulateMatch(setup: MatchSetup, random: RandomSource): number {
+  if (random.next() > setup.minutesProbability) {
+    return 0; // Player doesn't play
+  }
+
+  let totalPoints = 0;
+  let bonusPoints = 0;
+
+  for (const event of setup.events) {
+    if (random.next() < event.probability) {
+      totalPoints += event.points;
+      if (event.bonusMultiplier && event.bonusMultiplier > 0) {
+        bonusPoints += event.points * event.bonusMultiplier;
+      }
+    }
+  }
+
+  const bonusProb = Math.min(0.4, bonusPoints / 15);
+  if (random.next() < bonusProb) {
+    totalPoints += bonusPoints > 10 ? 3 : bonusPoints > 6 ? 2 : 1;
+  }
+
+  return Math.max(0, totalPoints);
+}
+
+export interface PointsDistribution {
+  points: Float64Array; // ascending support
+  probabilities: Float64Array; // P(points[i]), summing to 1
+}
+
+/**
+ * Exact points distribution of simulateMatch. Events are independent
+ * Bernoullis, so their joint (points, bonus haul) distribution is built by
+ * convolving one event at a time; the bonus roll and minutes gate are then
+ * applied per state. States are merged on the exact pair, and bonus hauls are
+ * summed in event order, so tier boundaries match the sampler bit for bit.
+ */
+export function matchDistribution(setup: MatchSetup): PointsDistribution {
+  let states = new Map<string, { total: number; bonus: number; probability: number }>();
+  states.set('0:0', { total: 0, bonus: 0, probability: 1 });
+
+  for (const event of setup.events) {
+    const hit = Math.min(1, Math.max(0, event.probability));
+    const bonusGain = event.bonusMultiplier && event.bonusMultiplier > 0 ? event.points * event.bonusMultiplier : 0;
+    const next = new Map<string, { total: number; bonus: number; probability: number }>();
+    const add = (total: number, bonus: number, probability: number) => {
+      if (probability <= 0) return;
+      const key = `${total}:${bonus}`;
+      const state = next.get(key);
+      if (state) state.probability += probability;
+      else next.set(key, { total, bonus, probability });
+    };
+    states.forEach(state => {
+      add(state.total + event.points, state.bonus + bonusGain, state.probability * hit);
+      add(state.total, state.bonus, state.probability * (1 - hit));
+    });
+    states = next;
+  }
+
+  const plays = Math.min(1, Math.max(0, setup.minutesProbability));
+  const pmf = new Map<number, number>([[0, 1 - plays]]);
+  const addPoints = (points: number, probability: number) => {
+    const value = Math.max(0, points);
+    pmf.set(value, (pmf.get(value) ?? 0) + probability);
+  };
+  states.forEach(({ total, bonus, probability }) => {
+    const bonusProb = Math.min(0.4, bonus / 15);
+    if (bonusProb > 0) {
+      addPoints(total + (bonus > 10 ? 3 : bonus > 6 ? 2 : 1), plays * probability * bonusProb);
+    }
+    addPoints(total, plays * probability * (1 - Math.max(0, bonusProb)));
+  });
+
+  const support = Array.from(pmf.keys()).filter(points => pmf.get(points)! > 0).sort((a, b) => a - b);
+  return {
+    points: Float64Array.from(support),
+    probabilities: Float64Array.from(support, points => pmf.get(points)!)
+  };
+}
+
+export function simulateMatches(setup: MatchSetup, runs: number, random: RandomSource): Float64Array {
+  const totals = new Float64Array(runs);
+  for (let run = 0; run < runs; run++) {
+    totals[run] = simulateMatch(setup, random);
+  }
+  return totals;
+}
+
+// Box-Muller over a whole buffer, using both the cosine and sine outputs of each pair
+export function fillNormalRandom(buffer: Float64Array, random: RandomSource): void {
+  for (let i = 0; i < buffer.length; i += 2) {
+    const radius = Math.sqrt(-2.0 * Math.log(1 - random.next()));
+    const angle = 2.0 * Math.PI * random.next();
+    buffer[i] = radius * Math.cos(angle);
+    if (i + 1 < buffer.length) {
+      buffer[i + 1] = radius * Math.sin(angle);
+    }
+  }
+}
+
+// Add volatility using player's historical variance
+export function samplePoints(expected: number, volatility: number, normal: number): number {
+  return Math.max(0, Math.round((expected + normal * volatility) * 10) / 10);
+}
+
+export function simulateSquadTotals(
+  expected: Float64Array,
+  volatility: Float64Array,
+  runs: number,
+  random: RandomSource
+): Float64Array {
+  const entries = expected.length;
+  const totals = new Float64Array(runs);
+  const noise = new Float64Array(entries);
+
+  // Only the noise is random, so each run is one pass over the pre-computed plan
+  for (let run = 0; run < runs; run++) {
+    fillNormalRandom(noise, random);
+    let total = 0;
+    for (let k = 0; k < entries; k++) {
+      total += samplePoints(expected[k], volatility[k], noise[k]);
+    }
+    totals[run] = total;
+  }
+  return totals;
+}
+
+export function simulateGameweekMatrix(
+  expected: Float64Array,
+  volatility: Float64Array,
+  columnStart: Int32Array,
+  runs: number,
+  random: RandomSource
+): { totals: Float64Array; samples: Float64Array } {
+  const gameweekCount = columnStart.length - 1;
+  const samples = new Float64Array(gameweekCount * runs);
+  const totals = new Float64Array(runs);
+  const noise = new Float64Array(expected.length);
+
+  // One set of draws per run feeds the gameweek columns and the run total alike
+  for (let run = 0; run < runs; run++) {
+    fillNormalRandom(noise, random);
+    let total = 0;
+    for (let g = 0; g < gameweekCount; g++) {
+      let gameweekPoints = 0;
+      for (let k = columnStart[g]; k < columnStart[g + 1]; k++) {
+        gameweekPoints += samplePoints(expected[k], volatility[k], noise[k]);
+      }
+      samples[g * runs + run] = gameweekPoints;
+      total += gameweekPoints;
+    }
+    totals[run] = total;
+  }
+  return { totals, samples };
+}
+
+export function runSimulationTask(task: SimulationTask): SimulationTaskResult {
+  switch (task.kind) {
+    case 'matches': {
+      const totals = new Float64Array(task.setups.length * task.runs);
+      task.setups.forEach((setup, index) => {
+        totals.set(simulateMatches(setup, task.runs, randomFromState(task.states[index])), index * task.runs);
+      });
+      return { totals };
+    }
+    case 'squad':
+      return { totals: simulateSquadTotals(task.expected, task.volatility, task.runs, randomFromState(task.state)) };
+    case 'gameweeks':
+      return simulateGameweekMatrix(task.expected, task.volatility, task.columnStart, task.runs, randomFromState(task.state));
+  }
+}
+
+// Rough cost of a task in random draws, used to decide whether it is worth a worker
+export function taskWorkSize(task: SimulationTask): number {
+  switch (task.kind) {
+    case 'matches':
+      return task.setups.reduce((sum, setup) => sum + (setup.events.length + 2) * task.runs, 0);
+    case 'squad':
+    case 'gameweeks':
+      return task.expected.length * task.runs;
+  }
+}
+
+/** Concatenate per-shard results back into one run-ordered result. */
+export function mergeShardResults(results: SimulationTaskResult[], gameweekCount = 0): SimulationTaskResult {
+  const runs = results.reduce((sum, result) => sum + result.totals.length, 0);
+  const totals = new Float64Array(runs);
+  const samples = gameweekCount ? new Float64Array(gameweekCount * runs) : undefined;
+  let offset = 0;
+  for (const result of results) {
+    const shardRunCount = result.totals.length;
+    totals.set(result.totals, offset);
+    if (samples && result.samples) {
+      for (let g = 0; g < gameweekCount; g++) {
+        samples.set(result.samples.subarray(g * shardRunCount, (g + 1) * shardRunCount), g * runs + offset);
+      }
+    }
+    offset += shardRunCount;
+  }
+  return samples ? { totals, samples } : { totals };
+}
@@ -59,7 +59,7 @@ describe('SimulationService', () => {
     const service = SimulationService.getInstance();
     const summary = await service.simulateAndPersist(player, fixtures);
 
-    expect(engineStub.simulatePlayer).toHaveBeenCalledWith(player, fixtures, undefined, undefined);
+    expect(engineStub.simulatePlayer).toHaveBeenCalledWith(player, fixtures, undefined, undefined, undefined, { persist: false });
     expect(repositoryStub.upsertPlayerSimulation).toHaveBeenCalledWith(expect.objectContaining({
       playerId: 1,
       meanPoints: 6,
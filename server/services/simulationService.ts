@@ -1,6 +1,7 @@
 import { ProcessedPlayer, PlayerSimulation } from "@shared/schema";
 import { MonteCarloEngine } from "./monteCarloEngine";
 import { DataRepository } from "./repositories/dataRepository";
+import { toPlayerSimulation } from "./simulationCache";
 
 export class SimulationService {
   private static instance: SimulationService;
@@ -22,27 +23,12 @@ export class SimulationService {
   async simulateAndPersist(
     player: ProcessedPlayer,
     fixtures: any[],
-    context: { advancedStats?: any; odds?: any[] } = {}
+    context: { advancedStats?: any; odds?: any[]; seed?: number } = {}
   ): Promise<PlayerSimulation> {
-    const result = await this.engine.simulatePlayer(player, fixtures, context.advancedStats, context.odds);
+    // This service owns the player_simulations write, so the engine's cache only keeps the result in memory
+    const result = await this.engine.simulatePlayer(player, fixtures, context.advancedStats, context.odds, context.seed, { persist: false });
 
-    const simulation: PlayerSimulation = {
-      playerId: player.id,
-      generatedAt: new Date().toISOString(),
-      runs: result.runs,
-      meanPoints: result.expectedPoints,
-      medianPoints: result.median,
-      p10: result.percentiles.p10,
-      p25: result.percentiles.p25,
-      p75: result.percentiles.p75,
-      p90: result.percentiles.p90,
-      standardDeviation: result.standardDeviation,
-      haulProbability: result.haulingProbability,
-      floorProbability: result.floorProbability,
-      ceilingProbability: result.ceilingProbability,
-      captainEV: result.captainEV,
-      coefficientOfVariation: result.coefficientOfVariation,
-    };
+    const simulation: PlayerSimulation = toPlayerSimulation(result);
 
     await this.repository.upsertPlayerSimulation(simulation);
     return simulation;
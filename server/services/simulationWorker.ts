@@ -0,0 +1,24 @@
+/**
+ * worker_threads entry for SimulationWorkerPool: runs one simulation task per
+ * message and transfers the result buffers back to the main thread.
+ */
+
+import { parentPort } from "worker_threads";
+import { runSimulationTask, type SimulationTask } from "./simulationKernels";
+
+if (!parentPort) {
+  throw new Error('simulationWorker must be started as a worker thread');
+}
+
+const port = parentPort;
+
+port.on('message', (message: { id: number; task: SimulationTask }) => {
+  try {
+    const result = runSimulationTask(message.task);
+    const transfer: ArrayBuffer[] = [result.totals.buffer as ArrayBuffer];
+    if (result.samples) transfer.push(result.samples.buffer as ArrayBuffer);
+    port.postMessage({ id: message.id, result }, transfer);
+  } catch (error) {
+    port.postMessage({ id: message.id, error: error instanceof Error ? error.message : String(error) });
+  }
+});
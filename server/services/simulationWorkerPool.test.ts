@@ -0,0 +1,89 @@
+import { describe, expect, it } from "vitest";
+import { SeededRandom } from "./seededRandom";
+import { mergeShardResults, runSimulationTask, shardRuns, type RandomState, type SimulationTask } from "./simulationKernels";
+import { SimulationQueueFullError, SimulationWorkerPool } from "./simulationWorkerPool";
+
+const squadTask = (runs: number, state: RandomState | null): SimulationTask => ({
+  kind: 'squad',
+  expected: Float64Array.from([4, 6, 2.5]),
+  volatility: Float64Array.from([2, 3, 1]),
+  runs,
+  state
+});
+
+// A worker that accepts tasks but never answers, so dispatched tasks stay busy
+const stalledWorker = new URL('data:text/javascript,setInterval(() => {}, 1000)');
+// A worker that answers each task with empty totals after a short delay
+const echoWorker = new URL('data:text/javascript,' + encodeURIComponent(
+  "import { parentPort } from 'node:worker_threads';" +
+  "parentPort.on('message', ({ id }) => setTimeout(() => parentPort.postMessage({ id, result: { totals: new Float64Array(0) } }), 5));"
+));
+
+describe('SimulationWorkerPool', () => {
+  it('runs tasks inline when disabled and matches the kernel exactly', async () => {
+    const pool = new SimulationWorkerPool({ size: 0 });
+    const state = new SeededRandom(5).getState();
+
+    const result = await pool.execute(squadTask(300, state));
+
+    expect(Array.from(result.totals)).toEqual(Array.from(runSimulationTask(squadTask(300, state)).totals));
+    expect(pool.getStats()).toMatchObject({ enabled: false, inline: 1, dispatched: 0 });
+  });
+
+  it('holds producers until a queue slot frees up, then rejects them instead of running inline', async () => {
+    const pool = new SimulationWorkerPool({ size: 1, maxQueue: 1, minWorkSize: 0, maxWaitMs: 20, workerUrl: stalledWorker });
+    const busy = pool.submit(squadTask(10, null)).catch(error => error);
+    const queued = pool.submit(squadTask(10, null)).catch(error => error);
+
+    await expect(pool.execute(squadTask(10, null))).rejects.toBeInstanceOf(SimulationQueueFullError);
+    expect(pool.getStats()).toMatchObject({ busy: 1, queued: 1, waiting: 0, queueFull: 1, rejected: 1, inline: 0 });
+
+    await pool.shutdown();
+    expect(await busy).toBeInstanceOf(Error);
+    expect(await queued).toBeInstanceOf(Error);
+  });
+
+  it('admits waiting producers in order as the worker drains the queue', async () => {
+    const pool = new SimulationWorkerPool({ size: 1, maxQueue: 1, minWorkSize: 0, maxWaitMs: 5000, workerUrl: echoWorker });
+    const order: number[] = [];
+    const tasks = [0, 1, 2, 3].map(index => pool.execute(squadTask(10, null)).then(() => order.push(index)));
+
+    expect(pool.getStats()).toMatchObject({ queued: 1 });
+    await Promise.all(tasks);
+
+    expect(order).toEqual([0, 1, 2, 3]);
+    expect(pool.getStats()).toMatchObject({ completed: 4, queueFull: 2, rejected: 0, inline: 0, waiting: 0 });
+    await pool.shutdown();
+  });
+});
+
+describe('shardRuns / mergeShardResults', () => {
+  it('gives the same seeded totals however the shards are scheduled', () => {
+    const shards = shardRuns(6000, new SeededRandom(11));
+    expect(shards.map(shard => shard.runs)).toEqual([2500, 2500, 1000]);
+
+    const results = shards.map(shard => runSimulationTask(squadTask(shard.runs, shard.state)));
+    const inOrder = mergeShardResults(results);
+    // Shards finishing in a different order are still merged by position
+    const reversed = shards.map((shard, index) => ({ shard, index })).reverse()
+      .map(({ shard }) => runSimulationTask(squadTask(shard.runs, shard.state))).reverse();
+
+    expect(Array.from(mergeShardResults(reversed).totals)).toEqual(Array.from(inOrder.totals));
+    expect(inOrder.totals).toHaveLength(6000);
+  });
+
+  it('stitches gameweek columns back into one run-major matrix', () => {
+    const task = (runs: number, state: RandomState | null): SimulationTask => ({
+      kind: 'gameweeks',
+      expected: Float64Array.from([5, 3]),
+      volatility: Float64Array.from([1e-9, 1e-9]),
+      columnStart: Int32Array.from([0, 1, 2]),
+      runs,
+      state
+    });
+    const merged = mergeShardResults(shardRuns(3000, null).map(shard => runSimulationTask(task(shard.runs, shard.state))), 2);
+
+    expect(merged.samples!.subarray(0, 3000).every(value => value === 5)).toBe(true);
+    expect(merged.samples!.subarray(3000).every(value => value === 3)).toBe(true);
+  });
+});
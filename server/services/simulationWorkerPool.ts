@@ -0,0 +1,278 @@
+/**
+ * worker_threads pool for Monte Carlo work, so long simulations do not stall
+ * the HTTP event loop.
+ *
+ * Tasks below SIMULATION_WORKER_MIN_SAMPLES random draws run inline, where dispatch
+ * would cost more than it saves. Larger tasks queue for one of
+ * SIMULATION_WORKERS threads; once SIMULATION_QUEUE_LIMIT tasks are waiting,
+ * producers wait for a queue slot, and a producer still waiting after
+ * SIMULATION_QUEUE_WAIT_MS is rejected with SimulationQueueFullError so the
+ * route can answer 503. Large tasks never fall back to the main thread under
+ * load. A pool whose workers cannot start (e.g. under a test runner without a
+ * TS loader) disables itself and everything runs inline.
+ */
+
+import { Worker } from "worker_threads";
+import { existsSync } from "fs";
+import os from "os";
+import { fileURLToPath } from "url";
+import { runSimulationTask, taskWorkSize, type SimulationTask, type SimulationTaskResult } from "./simulationKernels";
+
+export class SimulationQueueFullError extends Error {
+  constructor(limit: number) {
+    super(`Simulation queue is full (${limit} tasks waiting)`);
+    this.name = 'SimulationQueueFullError';
+  }
+}
+
+export interface SimulationWorkerPoolConfig {
+  size?: number;
+  maxQueue?: number;
+  minWorkSize?: number;
+  maxWaitMs?: number; // how long a producer may wait for a queue slot
+  workerUrl?: URL;
+}
+
+export interface SimulationWorkerPoolStats {
+  enabled: boolean;
+  workers: number;
+  busy: number;
+  queued: number;
+  maxQueue: number;
+  waiting: number;
+  dispatched: number;
+  completed: number;
+  inline: number;
+  queueFull: number; // producers that found the queue full and had to wait
+  rejected: number; // producers that gave up waiting
+  failed: number;
+}
+
+interface QueuedTask {
+  id: number;
+  task: SimulationTask;
+  resolve: (result: SimulationTaskResult) => void;
+  reject: (error: Error) => void;
+}
+
+interface SlotWaiter {
+  admit: () => void;
+  reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+  worker: Worker;
+  current: QueuedTask | null;
+  completed: number;
+}
+
+function envNumber(name: string, fallback: number): number {
+  const value = Number(process.env[name]);
+  return process.env[name] !== undefined && Number.isFinite(value) ? value : fallback;
+}
+
+// Source runs (tsx/vitest) load the .ts sibling; the bundled server ships the worker under dist/services/
+function resolveWorkerUrl(): URL | null {
+  const candidates = ['./simulationWorker.js', './simulationWorker.ts', './services/simulationWorker.js'];
+  for (const candidate of candidates) {
+    const url = new URL(candidate, import.meta.url);
+    if (existsSync(fileURLToPath(url))) return url;
+  }
+  return null;
+}
+
+export class SimulationWorkerPool {
+  private static instance: SimulationWorkerPool;
+  private readonly size: number;
+  private readonly maxQueue: number;
+  private readonly minWorkSize: number;
+  private readonly maxWaitMs: number;
+  private readonly workerUrl: URL | null;
+  private readonly workers: PoolWorker[] = [];
+  private readonly queue: QueuedTask[] = [];
+  private readonly waiters: SlotWaiter[] = [];
+  private admitted = 0; // waiters let in whose task is not queued yet
+  private disabledReason: string | null = null;
+  private nextId = 1;
+  private readonly counters = { dispatched: 0, completed: 0, inline: 0, queueFull: 0, rejected: 0, failed: 0 };
+
+  constructor(config: SimulationWorkerPoolConfig = {}) {
+    const defaultSize = Math.max(1, Math.min(4, os.availableParallelism() - 1));
+    this.size = Math.max(0, Math.floor(config.size ?? envNumber('SIMULATION_WORKERS', defaultSize)));
+    this.maxQueue = Math.max(1, config.maxQueue ?? envNumber('SIMULATION_QUEUE_LIMIT', 64));
+    this.minWorkSize = config.minWorkSize ?? envNumber('SIMULATION_WORKER_MIN_SAMPLES', 20_000);
+    this.maxWaitMs = Math.max(0, config.maxWaitMs ?? envNumber('SIMULATION_QUEUE_WAIT_MS', 15_000));
+    this.workerUrl = config.workerUrl ?? resolveWorkerUrl();
+    if (this.size === 0) this.disabledReason = 'disabled by SIMULATION_WORKERS=0';
+    else if (!this.workerUrl) this.disabledReason = 'simulation worker script not found';
+  }
+
+  public static getInstance(): SimulationWorkerPool {
+    if (!SimulationWorkerPool.instance) {
+      SimulationWorkerPool.instance = new SimulationWorkerPool();
+    }
+    return SimulationWorkerPool.instance;
+  }
+
+  /**
+   * Run ``task`` on a worker when it is big enough, otherwise inline. Results are identical either way.
+   * Rejects with SimulationQueueFullError when no queue slot frees up within the wait limit; only a
+   * disabled pool sends large tasks inline.
+   */
+  async execute(task: SimulationTask): Promise<SimulationTaskResult> {
+    if (!this.disabledReason && taskWorkSize(task) >= this.minWorkSize) {
+      try {
+        return await this.submit(task);
+      } catch (error) {
+        // The pool turned out not to work here (workers cannot start); anything else is the caller's to handle
+        if (error instanceof SimulationQueueFullError || !this.disabledReason) throw error;
+      }
+    }
+    this.counters.inline++;
+    return runSimulationTask(task);
+  }
+
+  async submit(task: SimulationTask): Promise<SimulationTaskResult> {
+    // New producers line up behind the ones already waiting
+    const full = this.queue.length + this.admitted >= this.maxQueue || this.waiters.length > 0;
+    if (full && !this.disabledReason) {
+      this.counters.queueFull++;
+      await this.waitForSlot();
+      this.admitted--;
+    }
+    if (this.disabledReason) {
+      throw new Error(`Simulation worker pool unavailable: ${this.disabledReason}`);
+    }
+    return new Promise<SimulationTaskResult>((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, task, resolve, reject });
+      this.pump();
+    });
+  }
+
+  getStats(): SimulationWorkerPoolStats {
+    return {
+      enabled: !this.disabledReason,
+      workers: this.workers.length,
+      busy: this.workers.filter(slot => slot.current).length,
+      queued: this.queue.length,
+      maxQueue: this.maxQueue,
+      waiting: this.waiters.length,
+      ...this.counters
+    };
+  }
+
+  async shutdown(): Promise<void> {
+    this.disabledReason = 'shut down';
+    const error = new Error('Simulation worker pool shut down');
+    this.waiters.splice(0).forEach(waiter => waiter.reject(error));
+    this.queue.splice(0).forEach(task => task.reject(error));
+    await Promise.all(this.workers.splice(0).map(slot => {
+      slot.current?.reject(error);
+      slot.current = null;
+      return slot.worker.terminate();
+    }));
+  }
+
+  private pump(): void {
+    while (this.queue.length > 0) {
+      let slot = this.workers.find(candidate => !candidate.current);
+      if (!slot && this.workers.length < this.size) {
+        slot = this.spawn();
+      }
+      if (!slot) return;
+
+      const next = this.queue.shift()!;
+      this.waiters.shift()?.admit(); // the queue has room for one more
+      slot.current = next;
+      slot.worker.ref(); // a pending task keeps the process alive; idle workers do not
+      this.counters.dispatched++;
+      slot.worker.postMessage({ id: next.id, task: next.task });
+    }
+  }
+
+  // Resolves once the first queued task has left the queue for this producer, in arrival order
+  private waitForSlot(): Promise<void> {
+    return new Promise<void>((resolve, reject) => {
+      const waiter: SlotWaiter = {
+        admit: () => {
+          clearTimeout(timer);
+          this.admitted++;
+          resolve();
+        },
+        reject: error => {
+          clearTimeout(timer);
+          reject(error);
+        }
+      };
+      const timer = setTimeout(() => {
+        this.waiters.splice(this.waiters.indexOf(waiter), 1);
+        this.counters.rejected++;
+        reject(new SimulationQueueFullError(this.maxQueue));
+      }, this.maxWaitMs);
+      this.waiters.push(waiter);
+    });
+  }
+
+  private spawn(): PoolWorker {
+    const worker = new Worker(this.workerUrl!);
+    worker.unref();
+    const slot: PoolWorker = { worker, current: null, completed: 0 };
+
+    worker.on('message', (message: { id: number; result?: SimulationTaskResult; error?: string }) => {
+      const task = slot.current;
+      slot.current = null;
+      worker.unref();
+      if (task && task.id === message.id) {
+        if (message.result) {
+          slot.completed++;
+          this.counters.completed++;
+          task.resolve(message.result);
+        } else {
+          this.counters.failed++;
+          task.reject(new Error(message.error ?? 'Simulation worker error'));
+        }
+      }
+      this.pump();
+    });
+
+    const onFailure = (error: Error) => {
+      this.removeWorker(slot);
+      if (slot.current) {
+        this.counters.failed++;
+        slot.current.reject(error);
+        slot.current = null;
+      }
+      // A worker that never finished a task means the environment cannot run workers at all
+      if (slot.completed === 0) {
+        this.disable(error.message);
+      } else {
+        this.pump();
+      }
+    };
+    worker.on('error', onFailure);
+    worker.on('exit', code => {
+      if (code !== 0 && this.workers.includes(slot)) {
+        onFailure(new Error(`Simulation worker exited with code ${code}`));
+      }
+    });
+
+    this.workers.push(slot);
+    return slot;
+  }
+
+  private removeWorker(slot: PoolWorker): void {
+    const index = this.workers.indexOf(slot);
+    if (index >= 0) this.workers.splice(index, 1);
+  }
+
+  private disable(reason: string): void {
+    if (!this.disabledReason) {
+      console.warn(`Simulation worker pool disabled (${reason}); simulations will run inline`);
+    }
+    this.disabledReason = reason;
+    // Waiters re-check the pool once admitted and run inline
+    this.waiters.splice(0).forEach(waiter => waiter.admit());
+    const pending = this.queue.splice(0);
+    pending.forEach(task => task.reject(new Error(`Simulation worker pool unavailable: ${reason}`)));
+  }
+}
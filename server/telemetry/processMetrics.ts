@@ -0,0 +1,66 @@
+import { monitorEventLoopDelay, type IntervalHistogram } from "perf_hooks";
+
+export interface EventLoopLagSnapshot {
+  meanMs: number;
+  p50Ms: number;
+  p99Ms: number;
+  maxMs: number;
+}
+
+export interface ProcessMetricsSnapshot {
+  uptimeS: number;
+  rssBytes: number;
+  heapUsedBytes: number;
+  heapTotalBytes: number;
+  externalBytes: number;
+  arrayBuffersBytes: number;
+  eventLoopLag: EventLoopLagSnapshot;
+}
+
+const NS_PER_MS = 1e6;
+const LAG_RESOLUTION_MS = 10;
+
+// The histogram records the full timer interval, so the sampling resolution is subtracted to leave pure lag.
+const lagMs = (nanoseconds: number): number =>
+  Math.max(0, Math.round((nanoseconds / NS_PER_MS - LAG_RESOLUTION_MS) * 100) / 100);
+
+/**
+ * Memory usage and event-loop lag for soak runs. Lag figures cover the window
+ * since the previous snapshot, so a sampler polling at a fixed interval sees
+ * per-interval stalls rather than a lifetime average.
+ */
+export class ProcessMetrics {
+  private histogram: IntervalHistogram | null = null;
+
+  start(): void {
+    if (this.histogram) return;
+    this.histogram = monitorEventLoopDelay({ resolution: LAG_RESOLUTION_MS });
+    this.histogram.enable();
+  }
+
+  snapshot(): ProcessMetricsSnapshot {
+    this.start();
+    const histogram = this.histogram!;
+    const memory = process.memoryUsage();
+    const hasSamples = histogram.count > 0;
+    const eventLoopLag: EventLoopLagSnapshot = {
+      meanMs: hasSamples ? lagMs(histogram.mean) : 0,
+      p50Ms: hasSamples ? lagMs(histogram.percentile(50)) : 0,
+      p99Ms: hasSamples ? lagMs(histogram.percentile(99)) : 0,
+      maxMs: hasSamples ? lagMs(histogram.max) : 0
+    };
+    histogram.reset();
+
+    return {
+      uptimeS: Math.round(process.uptime()),
+      rssBytes: memory.rss,
+      heapUsedBytes: memory.heapUsed,
+      heapTotalBytes: memory.heapTotal,
+      externalBytes: memory.external,
+      arrayBuffersBytes: memory.arrayBuffers,
+      eventLoopLag
+    };
+  }
+}
+
+export const processMetrics = new ProcessMetrics();
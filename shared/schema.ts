@@ -10,6 +10,8 @@ export interface FPLPlayer {
   total_points: number;
   first_name: string;
   second_name: string;
+  status?: string; // a=available, d=doubtful, i=injured, s=suspended, u=unavailable
+  chance_of_playing_next_round?: number | null;
 }
 
 export interface FPLTeam {
@@ -130,6 +132,16 @@ export interface PlayerSimOutcome {
   haulProbability?: number; // Probability of 10+ haul
   captainEV?: number; // Expected value when captained
   coefficientOfVariation?: number; // Risk metric (std dev / mean)
+  gameweekDistribution?: PlayerGameweekDistribution[]; // Per-gameweek outcomes from the same simulation runs
+}
+
+export interface PlayerGameweekDistribution {
+  gameweek: number;
+  meanPoints: number;
+  p10: number;
+  p50: number;
+  p90: number;
+  blankProbability: number; // % of runs returning 2 points or fewer
 }
 
 export interface PlayerSimulation {
@@ -148,6 +160,15 @@ export interface PlayerSimulation {
   ceilingProbability: number;
   captainEV: number;
   coefficientOfVariation?: number;
+  inputHash?: string; // fingerprint of the simulation inputs that produced this result
+  distribution?: SimulatedDistribution;
+}
+
+// Points distribution behind a player simulation (exact PMF, or the empirical one of sampled runs)
+export interface SimulatedDistribution {
+  method: 'exact' | 'sampled';
+  points: number[];
+  probabilities: number[];
 }
 
 export type PlayerArchetype = 'template' | 'balanced' | 'differential' | 'boom-bust';
@@ -466,6 +487,7 @@ export interface AICopilotResponse {
     requestId?: string;
     nlpMs?: number;
     llmMs?: number;
+    cacheHit?: boolean;
   };
 }
 
@@ -734,7 +756,15 @@ export const analyzeTeamResponseSchema = z.object({
         floorProbability: z.number().optional(),
         haulProbability: z.number().optional(),
         captainEV: z.number().optional(),
-        coefficientOfVariation: z.number().optional()
+        coefficientOfVariation: z.number().optional(),
+        gameweekDistribution: z.array(z.object({
+          gameweek: z.number(),
+          meanPoints: z.number(),
+          p10: z.number(),
+          p50: z.number(),
+          p90: z.number(),
+          blankProbability: z.number()
+        })).optional()
       }).optional(),
       coefficientOfVariation: z.number().optional(),
       archetype: z.enum(['template', 'balanced', 'differential', 'boom-bust']).optional(),